@@ -0,0 +1,36 @@
+from enum import Enum, auto
+from typing import Any
+
+import pytest
+
+from todolist.bot.tg.fsm.memory_storage import MemoryStorage
+
+pytest.importorskip('pytest_benchmark')
+
+CHATS = 1000
+
+
+class State(Enum):
+    CATEGORY_SELECT = auto()
+    CATEGORY_CHOSEN = auto()
+
+
+def create_goal_dialogs(storage: MemoryStorage) -> None:
+    """Повторяет обращения runbot к хранилищу при создании цели в CHATS чатах"""
+    for chat_id in range(CHATS):
+        storage.set_state(chat_id, State.CATEGORY_SELECT)
+        storage.set_data(chat_id, {'category_id': None, 'goal_title': None})
+        storage.get_state(chat_id)
+        storage.update_data(chat_id, category_id=chat_id)
+        storage.set_state(chat_id, State.CATEGORY_CHOSEN)
+        storage.update_data(chat_id, goal_title='Goal')
+        storage.get_data(chat_id)
+        storage.reset(chat_id)
+
+
+class TestMemoryStorage:
+
+    def test_create_goal_dialog(self, benchmark: Any) -> None:
+        storage = MemoryStorage()
+        benchmark(create_goal_dialogs, storage)
+        assert not storage.data
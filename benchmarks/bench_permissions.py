@@ -0,0 +1,29 @@
+from typing import Any
+
+import pytest
+from django.test import RequestFactory
+
+from todolist.core.models import User
+from todolist.goals.models import Board, Goal
+from todolist.goals.permissions import BoardPermissions, GoalPermissions
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.django_db()
+class TestPermissions:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, bench_user: User) -> None:  # noqa: PT004
+        self.goal: Goal = Goal.objects.select_related('category').filter(user=bench_user).first()
+        self.board: Board = self.goal.category.board
+        self.request = RequestFactory().get('/')
+        self.request.user = bench_user
+
+    @pytest.mark.parametrize('method', ['GET', 'PATCH'])
+    def test_goal_permissions(self, benchmark: Any, method: str) -> None:
+        self.request.method = method
+        assert benchmark(GoalPermissions().has_object_permission, self.request, None, self.goal)
+
+    def test_board_permissions(self, benchmark: Any) -> None:
+        assert benchmark(BoardPermissions().has_object_permission, self.request, None, self.board)
@@ -0,0 +1,36 @@
+from typing import Any
+
+import pytest
+
+from benchmarks.conftest import PAGE_SIZE
+from todolist.goals.fast import get_fast_serializer
+from todolist.goals.models import Board, Goal, GoalCategory
+from todolist.goals.serializers import BoardSerializer, GoalCategorySerializer, GoalSerializer
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.django_db()
+class TestSerializers:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, volume: int) -> None:  # noqa: PT004
+        self.goals: list[Goal] = list(Goal.objects.order_by('id')[:PAGE_SIZE])
+
+    def test_goal_serializer(self, benchmark: Any) -> None:
+        data = benchmark(lambda: GoalSerializer(self.goals, many=True).data)
+        assert len(data) == PAGE_SIZE
+
+    def test_goal_fast_serializer(self, benchmark: Any) -> None:
+        fast = get_fast_serializer(GoalSerializer)
+        rows: list[dict] = list(Goal.objects.order_by('id').values(*fast.paths)[:PAGE_SIZE])
+        assert len(benchmark(fast.serialize, rows)) == PAGE_SIZE
+
+    def test_category_serializer(self, benchmark: Any) -> None:
+        categories = list(GoalCategory.objects.select_related('user').order_by('id')[:PAGE_SIZE])
+        data = benchmark(lambda: GoalCategorySerializer(categories, many=True).data)
+        assert len(data) == len(categories)
+
+    def test_board_serializer(self, benchmark: Any) -> None:
+        board: Board = Board.objects.prefetch_related('participants__user').order_by('id').first()
+        assert benchmark(lambda: BoardSerializer(board).data)['participants']
@@ -0,0 +1,43 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from benchmarks.conftest import PAGE_SIZE
+from todolist.core.models import User
+from todolist.goals.models import Goal
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.django_db()
+class TestGoalViews:
+    """Запрос целиком: middleware, фильтры, пагинация, сериализация и рендеринг"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, bench_user: User) -> None:  # noqa: PT004
+        self.client = APIClient()
+        self.client.force_login(bench_user)
+        self.goal: Goal = Goal.objects.filter(user=bench_user).first()
+
+    @pytest.mark.parametrize('params', [{'limit': PAGE_SIZE}, {'limit': PAGE_SIZE, 'search': 'a'}],
+                             ids=['page', 'search'])
+    def test_goal_list(self, benchmark: Any, params: dict) -> None:
+        response = benchmark(self.client.get, reverse('list-goals'), params)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_goal_detail(self, benchmark: Any) -> None:
+        response = benchmark(self.client.get, reverse('retrieve-update-destroy-goal', args=[self.goal.id]))
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize('include', ['', 'users'], ids=['profiles', 'sideload'])
+    def test_comment_list(self, benchmark: Any, include: str) -> None:
+        params: dict = {'limit': PAGE_SIZE, 'include': include}
+        response = benchmark(self.client.get, reverse('list-comment'), params)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_board_list(self, benchmark: Any) -> None:
+        response = benchmark(self.client.get, reverse('board-list'))
+        assert response.status_code == status.HTTP_200_OK
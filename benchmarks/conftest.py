@@ -0,0 +1,34 @@
+"""Микробенчмарки на pytest-benchmark. Файлы называются bench_*.py, чтобы обычный прогон
+тестов их не собирал:
+
+    pytest benchmarks -o python_files='bench_*.py' --benchmark-storage=benchmarks/baselines \
+        --benchmark-save=baseline
+    pytest benchmarks -o python_files='bench_*.py' --benchmark-storage=benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+
+Объем данных задается переменными BENCH_BOARDS и BENCH_GOALS_PER_BOARD
+(по умолчанию 100 досок по 100 целей, для полного объема 10000 и 100).
+"""
+import os
+from typing import Any
+
+import pytest
+
+from benchmarks.seed import BENCH_USERNAME, seed_volume
+from todolist.core.models import User
+
+PAGE_SIZE = 100
+
+
+@pytest.fixture(scope='session')
+def volume(django_db_setup: Any, django_db_blocker: Any) -> int:
+    with django_db_blocker.unblock():
+        return seed_volume(
+            boards=int(os.environ.get('BENCH_BOARDS', 100)),
+            goals_per_board=int(os.environ.get('BENCH_GOALS_PER_BOARD', 100)),
+        )
+
+
+@pytest.fixture()
+def bench_user(volume: int, db: Any) -> User:
+    return User.objects.get(username=BENCH_USERNAME.format(0))
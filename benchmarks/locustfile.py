@@ -0,0 +1,78 @@
+"""Нагрузочный тест основных сценариев досок и целей.
+
+База наполняется заранее (python -m benchmarks.seed), затем против запущенного сервера:
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 --users 200 --spawn-rate 20 \
+        --run-time 5m --headless --csv benchmarks/baselines/locust
+
+Файлы *_stats.csv предыдущего прогона служат базой для сравнения.
+BENCH_USERS - число пользователей bench-N, созданных при наполнении.
+"""
+import os
+import random
+
+from locust import HttpUser, between, task
+
+from benchmarks.seed import BENCH_PASSWORD, BENCH_USERNAME
+
+BENCH_USERS = int(os.environ.get('BENCH_USERS', 1000))
+
+
+class TodolistUser(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self) -> None:
+        self.client.post('/core/login', json={
+            'username': BENCH_USERNAME.format(random.randrange(BENCH_USERS)),
+            'password': BENCH_PASSWORD,
+        })
+        self.client.headers['X-CSRFToken'] = self.client.cookies.get('csrftoken', '')
+        self.goal_ids: list[int] = []
+        self.category_ids: list[int] = []
+        self.board_ids: list[int] = []
+
+    @task(10)
+    def goal_list(self) -> None:
+        response = self.client.get('/goals/goal/list', params={'limit': 50, 'offset': random.choice((0, 0, 50))},
+                                   name='/goals/goal/list')
+        if response.ok:
+            self.goal_ids = [goal['id'] for goal in response.json()['results']]
+
+    @task(5)
+    def goal_detail(self) -> None:
+        if self.goal_ids:
+            self.client.get(f'/goals/goal/{random.choice(self.goal_ids)}', name='/goals/goal/[id]')
+
+    @task(3)
+    def goal_comments(self) -> None:
+        if self.goal_ids:
+            self.client.get('/goals/goal_comment/list', params={'goal': random.choice(self.goal_ids)},
+                            name='/goals/goal_comment/list')
+
+    @task(5)
+    def board_list(self) -> None:
+        response = self.client.get('/goals/board/list')
+        if response.ok:
+            self.board_ids = [board['id'] for board in response.json()]
+
+    @task(3)
+    def board_detail(self) -> None:
+        if self.board_ids:
+            self.client.get(f'/goals/board/{random.choice(self.board_ids)}', name='/goals/board/[id]')
+
+    @task(3)
+    def category_list(self) -> None:
+        response = self.client.get('/goals/goal_category/list')
+        if response.ok:
+            self.category_ids = [category['id'] for category in response.json()]
+
+    @task(1)
+    def create_and_update_goal(self) -> None:
+        if not self.category_ids:
+            return
+        response = self.client.post('/goals/goal/create', json={
+            'title': 'Load test goal',
+            'category': random.choice(self.category_ids),
+        })
+        if response.ok:
+            self.client.patch(f'/goals/goal/{response.json()["id"]}', json={'status': 2},
+                              name='/goals/goal/[id]')
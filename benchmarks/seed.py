@@ -0,0 +1,84 @@
+"""Наполнение базы для бенчмарков и нагрузочного теста.
+
+Объекты строятся фабриками из tests/factories.py через .build_batch() без сохранения
+и записываются bulk_create пачками по батчу досок, поэтому в памяти не держится
+весь объем. Все пользователи получают пароль BENCH_PASSWORD, хэш вычисляется один раз.
+
+Запуск на пустой базе (10 тыс. досок и 1 млн целей):
+    python -m benchmarks.seed --boards 10000 --goals-per-board 100
+"""
+import argparse
+import os
+from typing import Iterator
+
+from django.contrib.auth.hashers import make_password
+
+BENCH_PASSWORD = 'benchmark'
+BENCH_USERNAME = 'bench-{}'
+
+
+def _chunks(total: int, size: int) -> Iterator[range]:
+    for start in range(0, total, size):
+        yield range(start, min(start + size, total))
+
+
+def seed_volume(boards: int = 100, goals_per_board: int = 100, comments_per_board: int = 10,
+                boards_per_user: int = 10, batch_boards: int = 1000) -> int:
+    """Создает доски с владельцем и читателем, категорией, целями и комментариями.
+    Если данные уже есть (pytest --reuse-db), ничего не делает. Возвращает число пользователей"""
+    # Модели и фабрики импортируются после django.setup(): модуль запускается как скрипт и импортируется locustfile
+    from tests.factories import (
+        BoardFactory, BoardParticipantFactory, GoalCategoryFactory, GoalCommentFactory, GoalFactory, UserFactory,
+    )
+    from todolist.core.models import User
+    from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+    users_count: int = max(boards // boards_per_user, 2)
+    if User.objects.filter(username=BENCH_USERNAME.format(0)).exists():
+        return User.objects.filter(username__startswith=BENCH_USERNAME.format('')).count()
+
+    password: str = make_password(BENCH_PASSWORD)
+    users: list[User] = User.objects.bulk_create(
+        [UserFactory.build(username=BENCH_USERNAME.format(i), password=password) for i in range(users_count)],
+        batch_size=5000,
+    )
+
+    for chunk in _chunks(boards, batch_boards):
+        board_objects: list[Board] = Board.objects.bulk_create(BoardFactory.build_batch(len(chunk)))
+        owners: list[User] = [users[i % users_count] for i in chunk]
+        BoardParticipant.objects.bulk_create([
+            participant
+            for board, owner, i in zip(board_objects, owners, chunk)
+            for participant in (
+                BoardParticipantFactory.build(board=board, user=owner, role=BoardParticipant.Role.owner),
+                BoardParticipantFactory.build(board=board, user=users[(i + 1) % users_count],
+                                              role=BoardParticipant.Role.reader),
+            )
+        ])
+        categories: list[GoalCategory] = GoalCategory.objects.bulk_create([
+            GoalCategoryFactory.build(board=board, user=owner) for board, owner in zip(board_objects, owners)
+        ])
+        for category, owner in zip(categories, owners):
+            goals: list[Goal] = Goal.objects.bulk_create(
+                GoalFactory.build_batch(goals_per_board, category=category, user=owner), batch_size=5000,
+            )
+            if comments_per_board:
+                GoalComment.objects.bulk_create(
+                    GoalCommentFactory.build_batch(comments_per_board, goal=goals[0], user=owner),
+                )
+    return users_count
+
+
+if __name__ == '__main__':
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    django.setup()
+
+    parser = argparse.ArgumentParser(description='Seed the database for benchmarks and load tests')
+    parser.add_argument('--boards', type=int, default=10000)
+    parser.add_argument('--goals-per-board', type=int, default=100)
+    parser.add_argument('--comments-per-board', type=int, default=10)
+    arguments = parser.parse_args()
+    users: int = seed_volume(arguments.boards, arguments.goals_per_board, arguments.comments_per_board)
+    print(f'{users} users with password "{BENCH_PASSWORD}": {BENCH_USERNAME.format(0)} ... {BENCH_USERNAME.format(users - 1)}')
@@ -0,0 +1,2 @@
+# Фабрики нужны и тестам, и бенчмаркам: pytest_plugins разрешен только в conftest.py корня проекта
+pytest_plugins = 'tests.factories'
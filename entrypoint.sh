@@ -1,4 +1,9 @@
 #!/bin/bash
+# Снимки метрик прошлого запуска: их pid могут достаться новым процессам, и /metrics сложит их со свежими
+if [[ -n "$METRICS_DIR" ]]; then
+mkdir -p "$METRICS_DIR"
+rm -f "$METRICS_DIR"/*.json
+fi
 python manage.py migrate --check
 status=$?
 if [[ $status != 0 ]]; then
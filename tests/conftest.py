@@ -1,9 +1,8 @@
 import pytest
+from django.core.cache import cache
 from objects import objects
 from rest_framework.test import APIClient
 
-pytest_plugins = 'tests.factories'
-
 
 @pytest.fixture()
 def client() -> APIClient:
@@ -13,4 +12,21 @@ def client() -> APIClient:
 @pytest.fixture()
 def auth_client(client: APIClient, user: {objects}) -> APIClient:
     client.force_login(user)
-    return client
\ No newline at end of file
+    return client
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings: {objects}) -> None:
+    """Стойкость хэша в тестах не нужна, а MD5 в сотни раз быстрее PBKDF2 при создании пользователей"""
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    """Счетчики лимитов и кэш списков не должны переходить из теста в тест"""
+    cache.clear()
+
+
+@pytest.fixture()
+def replicas(settings: {objects}) -> list[str]:
+    settings.DATABASE_REPLICAS = ['replica_1', 'replica_2']
+    return settings.DATABASE_REPLICAS
@@ -0,0 +1,35 @@
+import threading
+from typing import Any
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from todolist.core.hashers import PooledPBKDF2PasswordHasher
+
+
+@pytest.mark.django_db()
+class TestPooledPBKDF2PasswordHasher:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings: Any) -> None:  # noqa: PT004
+        settings.PASSWORD_HASHERS = ['todolist.core.hashers.PooledPBKDF2PasswordHasher']
+        settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+
+    def test_hashing_runs_in_pool(self, monkeypatch: Any) -> None:
+        monkeypatch.setattr(PBKDF2PasswordHasher, 'encode', lambda *args: threading.current_thread().name)
+        assert PooledPBKDF2PasswordHasher().encode('password', 'salt').startswith('password-hashing')
+
+    def test_configured_iterations(self) -> None:
+        assert make_password('password').startswith('pbkdf2_sha256$1000$')
+
+    def test_rehash_on_login(self, client: APIClient, user_factory: Any, settings: Any) -> None:
+        user = user_factory.create(password='Secret-password-1')
+        settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+
+        response = client.post(reverse('login-view'), data={'username': user.username, 'password': 'Secret-password-1'})
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith('pbkdf2_sha256$2000$')
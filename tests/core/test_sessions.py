@@ -0,0 +1,57 @@
+from datetime import timedelta
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from social_core.backends.oauth import BaseOAuth2
+from social_core.backends.vk import VKOAuth2
+
+from todolist.core.models import User
+
+
+@pytest.mark.django_db()
+class TestSessions:
+
+    def test_cached_db_engine_only_with_shared_cache(self) -> None:
+        engine: str = 'cached_db' if settings.REDIS_URL else 'db'
+        assert settings.SESSION_ENGINE == f'django.contrib.sessions.backends.{engine}'
+
+    def test_clear_expired_sessions(self) -> None:
+        for _ in range(5):
+            SessionStore().create()
+        Session.objects.update(expire_date=timezone.now() - timedelta(hours=1))
+        alive = SessionStore()
+        alive.create()
+
+        call_command('clear_expired_sessions', batch_size=2, pause=0)
+
+        assert list(Session.objects.values_list('session_key', flat=True)) == [alive.session_key]
+
+    def test_vk_oauth_flow(self, client: APIClient, monkeypatch: Any) -> None:
+        monkeypatch.setattr(BaseOAuth2, 'request_access_token', lambda *args, **kwargs: {
+            'access_token': 'token', 'user_id': 42, 'email': 'vk@example.com',
+        })
+        monkeypatch.setattr(VKOAuth2, 'user_data', lambda *args, **kwargs: {
+            'id': 42, 'first_name': 'Ivan', 'last_name': 'Petrov', 'screen_name': 'ivan',
+        })
+
+        response = client.get(reverse('social:begin', args=['vk-oauth2']))
+        assert response.status_code == status.HTTP_302_FOUND
+        state: str = parse_qs(urlparse(response['Location']).query)['state'][0]
+
+        # Состояние OAuth хранится в сессии: после сброса кэша оно должно читаться из базы
+        cache.clear()
+        response = client.get(reverse('social:complete', args=['vk-oauth2']), {'code': 'code', 'state': state})
+        assert response.status_code == status.HTTP_302_FOUND
+
+        user: User = User.objects.get(username='ivan')
+        assert client.get(reverse('profile-view')).json()['id'] == user.id
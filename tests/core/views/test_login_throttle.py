@@ -0,0 +1,114 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from todolist.core.checks import check_shared_cache
+
+WRONG_PASSWORD = 'Wrong-password-1'
+
+
+@pytest.mark.django_db()
+class TestLoginThrottle:
+    url = reverse('login-view')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings: Any) -> None:  # noqa: PT004
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'login_username': '3/min', 'login_ip': '5/min',
+            },
+        }
+
+    def test_username_limit_checked_before_authenticate(self, client: APIClient, user_factory: Any,
+                                                        monkeypatch: Any) -> None:
+        user = user_factory.create(password='Secret-password-1')
+        for _ in range(3):
+            response = client.post(self.url, data={'username': user.username, 'password': WRONG_PASSWORD})
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        monkeypatch.setattr('todolist.core.serializers.authenticate', pytest.fail)
+        response = client.post(self.url, data={'username': user.username.upper(), 'password': 'Secret-password-1'})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert 0 < int(response['Retry-After']) <= 60
+
+    def test_ip_limit(self, client: APIClient) -> None:
+        for number in range(5):
+            client.post(self.url, data={'username': f'user{number}', 'password': WRONG_PASSWORD})
+
+        response = client.post(self.url, data={'username': 'another', 'password': WRONG_PASSWORD})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        response = client.post(self.url, data={'username': 'another', 'password': WRONG_PASSWORD},
+                               HTTP_X_FORWARDED_FOR='10.0.0.1')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_previous_window_is_weighted(self, client: APIClient, monkeypatch: Any) -> None:
+        now = 60.0 * 16_667 + 20  # 20 секунд от начала минутного окна
+        monkeypatch.setattr('todolist.core.throttling.SlidingWindowRateThrottle.timer', lambda self: now)
+        for _ in range(3):
+            client.post(self.url, data={'username': 'user', 'password': WRONG_PASSWORD})
+
+        # Через минуту две трети предыдущего окна еще в скользящем: 3 * 2/3 = 2 < 3
+        now += 60
+        assert client.post(self.url, data={'username': 'user', 'password': WRONG_PASSWORD}).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post(self.url, data={'username': 'user', 'password': WRONG_PASSWORD}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    @pytest.mark.parametrize(('previous', 'current', 'elapsed', 'retry_after'), [
+        # Три запроса в предыдущем окне и один в текущем: 3 * (1 - (5 + 15) / 60) + 1 < 3
+        (3, 1, 5, 15),
+        # Лимит уменьшили до 3, а в текущем окне уже 6 запросов: 30 секунд до конца окна
+        # и еще 30, пока вес этих запросов в роли предыдущего окна не упадет до половины
+        (0, 6, 30, 60),
+    ])
+    def test_retry_after_is_enough(self, client: APIClient, settings: Any, monkeypatch: Any, previous: int,
+                                   current: int, elapsed: int, retry_after: int) -> None:
+        def set_username_rate(value: str) -> None:
+            settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+                **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'login_username': value, 'login_ip': '100/min',
+            }}
+
+        def login() -> Any:
+            return client.post(self.url, data={'username': 'user', 'password': WRONG_PASSWORD})
+
+        window_start = 60.0 * 16_667
+        now = window_start - 30
+        monkeypatch.setattr('todolist.core.throttling.SlidingWindowRateThrottle.timer', lambda self: now)
+        set_username_rate('10/min')
+        for _ in range(previous):
+            login()
+        now = window_start + elapsed
+        for _ in range(current):
+            login()
+        set_username_rate('3/min')
+
+        response = login()
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) == retry_after
+        now += retry_after - 1
+        assert login().status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        now += 1.01
+        assert login().status_code == status.HTTP_403_FORBIDDEN
+
+    def test_authenticated_client_is_limited_by_body_username(self, client: APIClient, user_factory: Any) -> None:
+        client.force_login(user_factory.create())
+        for _ in range(3):
+            client.post(self.url, data={'username': 'victim', 'password': WRONG_PASSWORD})
+
+        response = client.post(self.url, data={'username': 'victim', 'password': WRONG_PASSWORD})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_list_body_is_rejected_by_serializer(self, client: APIClient) -> None:
+        response = client.post(self.url, data=['username'], format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_process_local_cache_is_reported(self, settings: Any) -> None:
+        settings.DEBUG = False
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        assert [warning.id for warning in check_shared_cache(None)] == ['core.W001']
+
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        assert check_shared_cache(None) == []
@@ -65,6 +65,7 @@ class GoalCategoryFactory(DatesFactoryMixin):
 class GoalFactory(DatesFactoryMixin):
     user = factory.SubFactory(UserFactory)
     category = factory.SubFactory(GoalCategoryFactory)
+    board = factory.SelfAttribute('category.board')
     title = factory.Faker('sentence')
 
     class Meta:
@@ -75,6 +76,7 @@ class GoalFactory(DatesFactoryMixin):
 class GoalCommentFactory(DatesFactoryMixin):
     user = factory.SubFactory(UserFactory)
     goal = factory.SubFactory(GoalFactory)
+    board = factory.SelfAttribute('goal.board')
     text = factory.Faker('text')
 
     class Meta:
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.archive import archive_boards, archive_goals
+from todolist.goals.models import Board, BoardArchive, Goal, GoalArchive, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db()
+class TestArchiveGoals(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any,
+              goal_comment_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=self.board, user=user)
+        self.goal: Goal = goal_factory.create(category=self.category, user=user, status=Goal.Status.archived)
+        self.comment: GoalComment = goal_comment_factory.create(goal=self.goal, user=user)
+        self.active_goal: Goal = goal_factory.create(category=self.category, user=user)
+
+    def test_retention_is_respected(self) -> None:
+        assert archive_goals(timezone.now() - timedelta(days=1)) == 0
+        assert Goal.objects.filter(id=self.goal.id).exists()
+
+    def test_archived_goal_moved_with_comments(self) -> None:
+        assert archive_goals(timezone.now() + timedelta(seconds=1)) == 1
+
+        assert not Goal.objects.filter(id=self.goal.id).exists()
+        assert not GoalComment.objects.filter(id=self.comment.id).exists()
+        assert Goal.objects.filter(id=self.active_goal.id).exists()
+        archive: GoalArchive = GoalArchive.objects.get()
+        assert (archive.goal_id, archive.board_id, archive.title) == (self.goal.id, self.board.id, self.goal.title)
+
+    def test_restore(self, auth_client: APIClient) -> None:
+        archive_goals(timezone.now() + timedelta(seconds=1))
+
+        response = auth_client.get(reverse('list-archived-goals'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['goal_id'] for goal in response.json()] == [self.goal.id]
+
+        response = auth_client.post(reverse('restore-goal', args=[self.goal.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['status'] == Goal.Status.to_do
+
+        restored: Goal = Goal.objects.get(id=self.goal.id)
+        assert restored.created == self.goal.created
+        assert GoalComment.objects.get(id=self.comment.id).text == self.comment.text
+        assert not GoalArchive.objects.exists()
+
+    def test_conditional_get_after_restore(self, auth_client: APIClient) -> None:
+        hour_ago = timezone.now() - timedelta(hours=1)
+        Goal.objects.filter(id=self.goal.id).update(updated=hour_ago - timedelta(days=1))
+        Goal.objects.filter(id=self.active_goal.id).update(updated=hour_ago)
+        archive_goals(timezone.now())
+        last_modified: str = auth_client.get(reverse('list-goals'))['Last-Modified']
+
+        auth_client.post(reverse('restore-goal', args=[self.goal.id]))
+        response = auth_client.get(reverse('list-goals'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_200_OK
+        assert {goal['id'] for goal in response.json()} == {self.goal.id, self.active_goal.id}
+
+    def test_restore_requires_board_participant(self, client: APIClient, user_factory: Any) -> None:
+        archive_goals(timezone.now() + timedelta(seconds=1))
+
+        client.force_login(user_factory.create())
+        response = client.post(reverse('restore-goal', args=[self.goal.id]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert GoalArchive.objects.exists()
+
+
+@pytest.mark.django_db()
+class TestArchiveBoards(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any,
+              auth_client: APIClient, user: Any) -> None:  # noqa: PT004
+        self.board: Board = board_factory.create(with_owner=user)
+        self.category: GoalCategory = goal_category_factory.create(board=self.board, user=user)
+        self.goal: Goal = goal_factory.create(category=self.category, user=user, status=Goal.Status.in_progress)
+        self.archived_goal: Goal = goal_factory.create(category=self.category, user=user, status=Goal.Status.archived)
+        response = auth_client.delete(reverse('retrieve-update-destroy-board', args=[self.board.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_board_waits_for_goals(self) -> None:
+        assert archive_boards(timezone.now() + timedelta(seconds=1)) == 0
+
+    def test_archive_and_restore(self, auth_client: APIClient) -> None:
+        deleted_at = Board.objects.get(id=self.board.id).updated
+        before = timezone.now() + timedelta(seconds=1)
+        assert archive_goals(before) == 2
+        assert archive_boards(before) == 1
+        assert not Board.objects.filter(id=self.board.id).exists()
+        assert BoardArchive.objects.filter(board_id=self.board.id).exists()
+
+        response = auth_client.post(reverse('restore-board', args=[self.board.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['title'] == self.board.title
+
+        assert not Board.objects.get(id=self.board.id).is_deleted
+        assert Board.objects.get(id=self.board.id).updated > deleted_at
+        assert not GoalCategory.objects.get(id=self.category.id).is_deleted
+        # Цель возвращается с прежним статусом, а архивированная до удаления доски остается в архиве
+        assert Goal.objects.get(id=self.goal.id).status == Goal.Status.in_progress
+        assert Goal.objects.get(id=self.goal.id).board_deleted_status is None
+        assert not Goal.objects.filter(id=self.archived_goal.id).exists()
+        assert not BoardArchive.objects.exists()
+        assert list(GoalArchive.objects.values_list('goal_id', flat=True)) == [self.archived_goal.id]
@@ -0,0 +1,139 @@
+import asyncio
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.checks import check_events_broker
+from todolist.goals.events import MemoryBroker, board_channel, get_broker
+from todolist.goals.models import BoardParticipant
+
+
+class TestMemoryBroker:
+
+    def test_fanout_only_to_board_subscribers(self) -> None:
+        async def scenario() -> None:
+            broker = MemoryBroker()
+            first = broker.subscribe(board_channel(1))
+            second = broker.subscribe(board_channel(1))
+            other = broker.subscribe(board_channel(2))
+
+            broker.publish(board_channel(1), {'id': 1})
+
+            assert await asyncio.wait_for(first.get(), 1) == {'id': 1}
+            assert await asyncio.wait_for(second.get(), 1) == {'id': 1}
+            await asyncio.sleep(0)
+            assert other.queue.empty()
+
+        asyncio.run(scenario())
+
+    def test_unsubscribed_client_gets_nothing(self) -> None:
+        async def scenario() -> None:
+            broker = MemoryBroker()
+            subscription = broker.subscribe(board_channel(1))
+            broker.unsubscribe(board_channel(1), subscription)
+
+            broker.publish(board_channel(1), {'id': 1})
+            await asyncio.sleep(0)
+            assert subscription.queue.empty()
+
+        asyncio.run(scenario())
+
+
+class TestRedisBroker:
+
+    def test_messages_from_redis_reach_local_subscribers(self, settings: Any) -> None:
+        pytest.importorskip('redis')
+        from todolist.goals.events import RedisBroker
+
+        settings.REDIS_URL = 'redis://localhost:6379/0'
+
+        async def scenario() -> None:
+            broker = RedisBroker()
+            subscription = broker.subscribe(board_channel(1))
+            # Соединение с Redis в тесте не нужно: сообщения передаются в dispatch напрямую
+            broker._listener.cancel()
+
+            broker.dispatch({'type': 'psubscribe', 'channel': b'board:*', 'data': 1})
+            broker.dispatch({'type': 'pmessage', 'channel': b'board:1', 'data': b'{"id": 1}'})
+
+            assert await asyncio.wait_for(subscription.get(), 1) == {'id': 1}
+
+        asyncio.run(scenario())
+
+    def test_memory_broker_in_production_is_reported(self, settings: Any) -> None:
+        settings.DEBUG = False
+        settings.GOALS_EVENTS_BROKER = 'todolist.goals.events.MemoryBroker'
+        assert [warning.id for warning in check_events_broker(None)] == ['goals.W001']
+
+        settings.GOALS_EVENTS_BROKER = 'todolist.goals.events.RedisBroker'
+        assert check_events_broker(None) == []
+
+
+@pytest.mark.django_db()
+class TestViewsPublishEvents(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=self.board, user=user)
+        self.loop = asyncio.new_event_loop()
+        self.subscription = self.loop.run_until_complete(self._subscribe())
+        yield
+        get_broker().unsubscribe(board_channel(self.board.id), self.subscription)
+        self.loop.close()
+
+    async def _subscribe(self) -> Any:
+        return get_broker().subscribe(board_channel(self.board.id))
+
+    def _next_event(self) -> dict:
+        return self.loop.run_until_complete(asyncio.wait_for(self.subscription.get(), 1))
+
+    def test_goal_create_publishes_event(self, auth_client: APIClient,
+                                         django_capture_on_commit_callbacks: Any) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse('create-goal'), data={
+                'title': 'New goal',
+                'category': self.category.id,
+            })
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert self._next_event() == {
+            'board': self.board.id,
+            'entity': 'goal',
+            'action': 'created',
+            'id': response.json()['id'],
+        }
+
+    def test_board_update_publishes_event(self, auth_client: APIClient,
+                                          django_capture_on_commit_callbacks: Any) -> None:
+        assert self.board.participants.get().role == BoardParticipant.Role.owner
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.patch(
+                reverse('retrieve-update-destroy-board', args=[self.board.id]), {'title': 'Renamed'}
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        assert self._next_event() == {
+            'board': self.board.id,
+            'entity': 'board',
+            'action': 'updated',
+            'id': self.board.id,
+        }
+
+    def test_broker_failure_does_not_fail_write(self, auth_client: APIClient, monkeypatch: Any,
+                                                django_capture_on_commit_callbacks: Any) -> None:
+        def publish(*args: Any) -> None:
+            raise ConnectionError('Redis is down')
+
+        monkeypatch.setattr(get_broker(), 'publish', publish)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(reverse('create-goal'), data={
+                'title': 'New goal',
+                'category': self.category.id,
+            })
+        assert response.status_code == status.HTTP_201_CREATED
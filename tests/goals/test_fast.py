@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.fast import get_fast_serializer
+from todolist.goals.models import Goal
+from todolist.goals.serializers import GoalSerializer
+from todolist.renderers import FastJSONRenderer
+
+
+class TestFastJSONRenderer:
+
+    @pytest.mark.parametrize('data', [
+        [{'title': 'Цель   "quoted" \n\t\x01', 'status': 1, 'description': None, 'done': False}],
+        {'count': 0, 'next': None, 'results': []},
+        {'created': datetime(2023, 2, 8, 16, 10, 1, 123456, tzinfo=timezone.utc)},
+    ], ids=['escaping', 'paginated', 'datetime'])
+    def test_same_bytes_as_json_renderer(self, data: Any) -> None:
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.django_db()
+class TestFastSerialization(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any,
+              goal_comment_factory: Any, user: Any) -> None:  # noqa: PT004
+        board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=board, user=user, title='Категория')
+        self.goals: list[Goal] = [
+            goal_factory.create(category=self.category, user=user, title='Ünïcode  ', description=None),
+            goal_factory.create(category=self.category, user=user, priority=Goal.Priority.critical,
+                                due_date=datetime(999, 1, 1, tzinfo=timezone.utc)),
+            goal_factory.create(category=self.category, user=user, due_date=datetime.now(tz=timezone.utc)),
+        ]
+        for goal in self.goals:
+            goal_comment_factory.create(goal=goal, user=user)
+
+    def test_goal_rows_match_serializer(self) -> None:
+        queryset = Goal.objects.order_by('id')
+        fast = get_fast_serializer(GoalSerializer)
+
+        assert fast.serialize(queryset.values(*fast.paths)) == GoalSerializer(queryset, many=True).data
+
+    @pytest.mark.parametrize('url_name, params', [
+        ('list-goals', {}),
+        ('list-goals', {'limit': 2, 'offset': 1}),
+        ('list-categories', {}),
+        ('list-comment', {}),
+    ])
+    def test_same_bytes_as_default_path(self, auth_client: APIClient, settings: Any,
+                                        url_name: str, params: dict) -> None:
+        url: str = reverse(url_name)
+        settings.GOALS_FAST_SERIALIZATION = False
+        expected = auth_client.get(url, params)
+        assert expected.status_code == status.HTTP_200_OK
+
+        settings.GOALS_FAST_SERIALIZATION = True
+        response = auth_client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
@@ -0,0 +1,59 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.cache import get_board_versions
+from todolist.goals.models import Goal, GoalComment
+
+
+@pytest.mark.django_db()
+class TestGoalBoard(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.board = board_factory.create(with_owner=user)
+        self.other_board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=self.board, user=user)
+        self.other_category = goal_category_factory.create(board=self.other_board, user=user)
+
+    def test_board_follows_category(self, auth_client: APIClient, user: Any) -> None:
+        goal: Goal = Goal.objects.create(title='Goal', category=self.category, user=user)
+        comment: GoalComment = GoalComment.objects.create(goal=goal, user=user, text='Comment')
+        assert (goal.board_id, comment.board_id) == (self.board.id, self.board.id)
+
+        response = auth_client.patch(reverse('retrieve-update-destroy-goal', args=[goal.id]),
+                                     {'category': self.other_category.id})
+        assert response.status_code == status.HTTP_200_OK
+        assert 'board' not in response.json()
+        assert Goal.objects.get(id=goal.id).board_id == self.other_board.id
+        assert GoalComment.objects.get(id=comment.id).board_id == self.other_board.id
+
+    def test_move_invalidates_both_boards(self, user: Any, django_capture_on_commit_callbacks: Any,
+                                          django_assert_num_queries: Any) -> None:
+        goal: Goal = Goal.objects.create(title='Goal', category=self.category, user=user)
+        versions: dict[int, int] = get_board_versions([self.board.id, self.other_board.id])
+
+        goal = Goal.objects.get(id=goal.id)
+        goal.category = self.other_category
+        with django_capture_on_commit_callbacks(execute=True):
+            goal.save()
+        new_versions: dict[int, int] = get_board_versions([self.board.id, self.other_board.id])
+        assert all(new_versions[board_id] != version for board_id, version in versions.items())
+
+        # Сохранение без категории не читает прежние значения
+        goal.title = 'Renamed'
+        with django_assert_num_queries(1):
+            goal.save(update_fields=('title', 'updated'))
+
+    def test_visibility_by_board(self, client: APIClient, goal_factory: Any, goal_comment_factory: Any,
+                                 user: Any, user_factory: Any) -> None:
+        goal: Goal = goal_factory.create(category=self.category, user=user)
+        goal_comment_factory.create(goal=goal, user=user)
+
+        client.force_login(user_factory.create())
+        assert client.get(reverse('list-goals')).json() == []
+        assert client.get(reverse('list-comment'), {'goal': goal.id}).json() == []
@@ -0,0 +1,38 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from todolist.goals import partitioning
+
+
+def table_indexes() -> set[tuple[str, str]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT tablename, indexname FROM pg_indexes WHERE tablename IN (%s, %s)',
+            [partitioning.GOAL_TABLE, partitioning.COMMENT_TABLE],
+        )
+        return set(cursor.fetchall())
+
+
+@pytest.mark.django_db()
+class TestPartitioning:
+
+    @pytest.fixture(autouse=True)
+    def postgres_only(self) -> None:  # noqa: PT004
+        if connection.vendor != 'postgresql':
+            pytest.skip('Partitioning is supported on PostgreSQL only')
+
+    def test_enable_and_disable_keep_indexes(self) -> None:
+        indexes: set[tuple[str, str]] = table_indexes()
+        assert ('goals_goal', 'goal_active_priority_due_idx') in indexes
+        assert ('goals_goalcomment', 'comment_board_created_idx') in indexes
+
+        call_command('goals_partitions', 'enable')
+        with connection.cursor() as cursor:
+            assert partitioning.is_partitioned(cursor, partitioning.GOAL_TABLE)
+        assert table_indexes() == indexes
+
+        call_command('goals_partitions', 'disable')
+        with connection.cursor() as cursor:
+            assert not partitioning.is_partitioned(cursor, partitioning.GOAL_TABLE)
+        assert table_indexes() == indexes
@@ -0,0 +1,74 @@
+import random
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+
+from todolist.goals.models import Goal
+from todolist.goals.ranks import move_goal, rank_between, spread_ranks
+
+
+class TestRanks:
+
+    @pytest.mark.parametrize(('before', 'after'), [
+        (None, None), (None, 'i'), ('i', None), ('a', 'b'), ('a', 'a1'), ('az', 'b'), ('zz', None), (None, '01'),
+    ])
+    def test_rank_between(self, before: str | None, after: str | None) -> None:
+        rank: str = rank_between(before, after)
+        assert (before or '') < rank
+        assert after is None or rank < after
+        assert not rank.endswith('0')
+
+    def test_repeated_inserts_keep_order(self) -> None:
+        ranks: list[str] = []
+        generator = random.Random(1)
+        for _ in range(500):
+            position: int = generator.randint(0, len(ranks))
+            before: str | None = ranks[position - 1] if position else None
+            after: str | None = ranks[position] if position < len(ranks) else None
+            ranks.insert(position, rank_between(before, after))
+        assert ranks == sorted(ranks)
+        assert len(set(ranks)) == len(ranks)
+
+    def test_invalid_bounds(self) -> None:
+        with pytest.raises(ValueError):
+            rank_between('b', 'a')
+
+    @pytest.mark.parametrize('count', [0, 1, 35, 36, 1000])
+    def test_spread_ranks(self, count: int) -> None:
+        ranks: list[str] = spread_ranks(count)
+        assert len(ranks) == count
+        assert ranks == sorted(set(ranks))
+        assert all(rank and not rank.endswith('0') for rank in ranks)
+
+
+@pytest.mark.django_db()
+class TestRebalance:
+
+    def test_rebalance_keeps_order_and_fills_missing_ranks(self, board_factory: Any, goal_category_factory: Any,
+                                                            goal_factory: Any, user: Any) -> None:
+        category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        goals: list[Goal] = goal_factory.create_batch(3, category=category, user=user)
+        Goal.objects.filter(id=goals[0].id).update(rank='zzzzzzzzzzzzzzzzz')
+        Goal.objects.filter(id=goals[1].id).update(rank='')
+
+        call_command('rebalance_goal_ranks', pause=0)
+
+        ranks: list[tuple[int, str]] = list(
+            Goal.objects.filter(category=category).order_by('rank').values_list('id', 'rank')
+        )
+        assert [goal_id for goal_id, _ in ranks] == [goals[1].id, goals[2].id, goals[0].id]
+        assert all(len(rank) == 1 for _, rank in ranks)
+
+    def test_move_among_unranked_goals(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any,
+                                       user: Any) -> None:
+        category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        a, b, c, d = goal_factory.create_batch(4, category=category, user=user)
+        Goal.objects.filter(category=category).update(rank='')
+        a.rank = c.rank = ''
+
+        move_goal(c, after=a)
+
+        assert list(Goal.objects.filter(category=category).order_by('rank').values_list('id', flat=True)) == [
+            a.id, c.id, b.id, d.id,
+        ]
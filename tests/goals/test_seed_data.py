@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from todolist.core.models import User
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+@pytest.mark.django_db()
+class TestSeedData:
+
+    def test_generated_volume(self) -> None:
+        call_command('seed_data', users=20, boards=10, goals=300, comments=50, random_seed=1, batch_size=64)
+
+        assert (User.objects.count(), Board.objects.count(), Goal.objects.count(), GoalComment.objects.count()) == (
+            20, 10, 300, 50,
+        )
+        assert BoardParticipant.objects.filter(role=BoardParticipant.Role.owner).count() == 10
+        assert User.objects.first().check_password('seed')
+        # Последовательности id сдвинуты: следующие объекты создаются обычным ORM
+        assert Board.objects.create(title='New').id == Board.objects.order_by('id').values_list('id', flat=True)[9] + 1
+
+    def test_comment_stats(self) -> None:
+        call_command('seed_data', users=5, boards=3, goals=40, comments=60, random_seed=2, batch_size=16)
+
+        assert Goal.objects.aggregate(total=Sum('comments_count'))['total'] == 60
+        for goal in Goal.objects.filter(comments_count__gt=0):
+            last: GoalComment = GoalComment.objects.filter(goal_id=goal.id).order_by('-created', '-id').first()
+            assert (goal.comments_count, goal.last_comment_id) == (goal.comments.count(), last.id)
+
+    def test_state_matches_application(self) -> None:
+        """COPY обходит сигналы: ключи порядка и архив удаленных категорий и досок команда задает сама"""
+        call_command('seed_data', users=20, boards=80, goals=400, comments=50, random_seed=3, batch_size=64)
+
+        assert Board.objects.filter(is_deleted=True).exists()
+        assert not Goal.objects.filter(rank='').exists()
+        for category_id in Goal.objects.values_list('category_id', flat=True).distinct():
+            ranks: list[str] = list(
+                Goal.objects.filter(category_id=category_id).order_by('id').values_list('rank', flat=True)
+            )
+            assert ranks == sorted(set(ranks))
+
+        assert not GoalCategory.objects.filter(board__is_deleted=True, is_deleted=False).exists()
+        assert not Goal.objects.filter(category__is_deleted=True).exclude(status=Goal.Status.archived).exists()
+        assert Goal.objects.filter(board__is_deleted=True, board_deleted_status__isnull=False).exists()
+        assert not Goal.objects.filter(board__is_deleted=False, board_deleted_status__isnull=False).exists()
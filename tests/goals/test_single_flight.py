@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.cache import single_flight
+from todolist.goals.models import BoardParticipant, Goal
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_computation(self) -> None:
+        calls: list[int] = []
+        release = threading.Event()
+
+        def compute() -> list[int]:
+            calls.append(1)
+            release.wait(5)
+            return [1, 2, 3]
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(single_flight, 'flight:test', compute, 5) for _ in range(5)]
+            # Остальные потоки успевают встать в ожидание до завершения лидера
+            threading.Timer(0.2, release.set).start()
+            results = [future.result() for future in futures]
+
+        assert calls == [1]
+        assert results == [[1, 2, 3]] * 5
+
+    def test_followers_compute_themselves_when_leader_fails(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail() -> None:
+            started.set()
+            release.wait(5)
+            raise RuntimeError
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight, 'flight:test', fail, 5)
+            started.wait(5)
+            follower = executor.submit(single_flight, 'flight:test', lambda: 'own', 5)
+            release.set()
+            with pytest.raises(RuntimeError):
+                leader.result()
+            assert follower.result() == 'own'
+
+    def test_waits_for_other_process(self) -> None:
+        cache.add('flight:test:lock', 1)
+        threading.Timer(0.1, cache.set, args=('flight:test:result', 'shared')).start()
+
+        assert single_flight('flight:test', pytest.fail, 5) == 'shared'
+
+    def test_computes_when_other_process_is_too_slow(self) -> None:
+        cache.add('flight:test:lock', 1)
+
+        assert single_flight('flight:test', lambda: 'own', 0.2) == 'own'
+
+
+@pytest.mark.django_db()
+class TestGoalListSingleFlight(BaseTestCase):
+
+    def test_participants_of_same_boards_share_result(self, settings: Any, client: APIClient,
+                                                      auth_client: APIClient, user: Any, user_factory: Any,
+                                                      board_factory: Any, goal_category_factory: Any,
+                                                      goal_factory: Any) -> None:
+        settings.GOALS_LIST_CACHE_TIMEOUT = 60
+        board = board_factory.create(with_owner=user)
+        goal: Goal = goal_factory.create(category=goal_category_factory.create(board=board, user=user), title='Old')
+        another_user = user_factory.create()
+        BoardParticipant.objects.create(board=board, user=another_user, role=BoardParticipant.Role.reader)
+        client.force_login(another_user)
+
+        assert auth_client.get(reverse('list-goals')).json()[0]['title'] == 'Old'
+        # Без инвалидации: второй участник получает уже вычисленный ответ, а не новый запрос к базе
+        Goal.objects.filter(id=goal.id).update(title='New')
+        response = client.get(reverse('list-goals'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]['title'] == 'Old'
@@ -0,0 +1,125 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestGoalListConditionalGet(BaseTestCase):
+    url = reverse('list-goals')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=board, user=user)
+        self.goal: Goal = goal_factory.create(category=self.category, user=user)
+
+    def test_etag_is_set(self, auth_client: APIClient) -> None:
+        response = auth_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag']
+        assert response['Last-Modified']
+
+    def test_not_modified(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_new_goal_invalidates_etag(self, auth_client: APIClient, goal_factory: Any, user: Any) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+        goal_factory.create(category=self.category, user=user)
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 2
+
+    def test_archived_goal_invalidates_etag(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+        Goal.objects.filter(id=self.goal.id).update(status=Goal.Status.archived)
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+    def test_query_params_change_etag(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+
+        response = auth_client.get(self.url, {'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db()
+class TestGoalDetailConditionalGet(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        board = board_factory.create(with_owner=user)
+        category = goal_category_factory.create(board=board, user=user)
+        self.goal: Goal = goal_factory.create(category=category, user=user)
+        self.url = reverse('retrieve-update-destroy-goal', args=[self.goal.id])
+
+    def test_not_modified(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_invalidates_etag(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url)['ETag']
+        self.goal.title = 'Updated'
+        self.goal.save(update_fields=('title', 'updated'))
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['title'] == 'Updated'
+
+
+@pytest.mark.django_db()
+class TestBoardConditionalGet(BaseTestCase):
+
+    @pytest.mark.parametrize('url_name', ['board-list', 'retrieve-update-destroy-board'])
+    def test_rename_invalidates_etag(self, auth_client: APIClient, board_factory: Any, user: Any,
+                                     django_capture_on_commit_callbacks: Any, url_name: str) -> None:
+        board = board_factory.create(with_owner=user)
+        url: str = reverse(url_name, args=[board.id] if url_name != 'board-list' else [])
+        etag: str = auth_client.get(url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.patch(
+                reverse('retrieve-update-destroy-board', args=[board.id]),
+                data={'title': 'Renamed', 'participants': []},
+                format='json',
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Renamed' in response.content.decode()
+
+
+@pytest.mark.django_db()
+class TestAuthorConditionalGet(BaseTestCase):
+
+    def test_profile_change_invalidates_category_etag(self, auth_client: APIClient, board_factory: Any,
+                                                      goal_category_factory: Any, user: Any,
+                                                      django_capture_on_commit_callbacks: Any) -> None:
+        category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        urls: list[str] = [reverse('list-categories'), reverse('retrieve-update-destroy-category', args=[category.id])]
+        etags: list[str] = [auth_client.get(url)['ETag'] for url in urls]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.patch(reverse('profile-view'), data={'first_name': 'Renamed'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        for url, etag in zip(urls, etags):
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'Renamed' in response.content.decode()
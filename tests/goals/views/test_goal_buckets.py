@@ -0,0 +1,63 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.buckets import Bucket, goal_bucket, week_end
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestGoalBuckets(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        now = timezone.now()
+        this_week = now + (week_end(now) - now) / 2
+        self.overdue: Goal = goal_factory.create(category=self.category, user=user, due_date=now - timedelta(days=1))
+        self.this_week: Goal = goal_factory.create(category=self.category, user=user, due_date=this_week,
+                                                   status=Goal.Status.in_progress)
+        self.no_due_date: Goal = goal_factory.create(category=self.category, user=user, due_date=None)
+        self.later: Goal = goal_factory.create(category=self.category, user=user, due_date=now + timedelta(days=8))
+        # Выполненные и архивные цели не попадают ни в одну группу
+        goal_factory.create(category=self.category, user=user, due_date=now - timedelta(days=1),
+                            status=Goal.Status.done)
+        goal_factory.create(category=self.category, user=user, due_date=None, status=Goal.Status.archived)
+
+    @pytest.mark.parametrize(('bucket', 'attr'), [
+        (Bucket.overdue, 'overdue'), (Bucket.due_this_week, 'this_week'), (Bucket.no_due_date, 'no_due_date'),
+    ])
+    def test_bucket_list(self, auth_client: APIClient, bucket: str, attr: str) -> None:
+        response = auth_client.get(reverse('list-goals-bucket', args=[bucket]))
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.json()] == [getattr(self, attr).id]
+
+        response = auth_client.get(reverse('list-goals'), {'bucket': bucket})
+        assert [goal['id'] for goal in response.json()] == [getattr(self, attr).id]
+        assert goal_bucket(getattr(self, attr)) == bucket
+
+    def test_unknown_bucket(self, auth_client: APIClient) -> None:
+        response = auth_client.get(reverse('list-goals-bucket', args=['someday']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_counts(self, auth_client: APIClient, settings: Any, goal_factory: Any, user: Any,
+                    django_capture_on_commit_callbacks: Any) -> None:
+        settings.GOALS_BUCKET_COUNTS_TIMEOUT = 60
+        url = reverse('goal-bucket-counts')
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {Bucket.overdue: 1, Bucket.due_this_week: 1, Bucket.no_due_date: 1}
+
+        # Новая цель меняет версию доски, поэтому закэшированные счетчики не используются
+        with django_capture_on_commit_callbacks(execute=True):
+            goal_factory.create(category=self.category, user=user, due_date=None)
+        assert auth_client.get(url).json()[Bucket.no_due_date] == 2
+
+    def test_counts_require_auth(self, client: APIClient) -> None:
+        assert client.get(reverse('goal-bucket-counts')).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,76 @@
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal, GoalComment
+from todolist.goals.serializers import COMMENT_PREVIEW_LENGTH
+
+
+@pytest.mark.django_db()
+class TestGoalCommentStats(BaseTestCase):
+    url = reverse('list-goals')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        self.goal: Goal = goal_factory.create(category=category, user=user, title='A')
+        self.empty_goal: Goal = goal_factory.create(category=category, user=user, title='B')
+
+    def comment(self, auth_client: APIClient, text: str) -> dict:
+        response = auth_client.post(reverse('create-comment'), {'goal': self.goal.id, 'text': text})
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()
+
+    def test_not_included_by_default(self, auth_client: APIClient) -> None:
+        goal: dict = auth_client.get(self.url).json()[0]
+        assert 'comments_count' not in goal
+        assert 'last_comment' not in goal
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    def test_counts_and_preview(self, auth_client: APIClient, settings: Any, user: Any, fast: bool) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        self.comment(auth_client, 'first')
+        last: dict = self.comment(auth_client, 'x' * 500)
+
+        goal, empty_goal = auth_client.get(self.url, {'include': 'comments'}).json()
+        assert set(goal) == {
+            'id', 'created', 'updated', 'title', 'description', 'status', 'priority', 'due_date', 'rank',
+            'category', 'user', 'comments_count', 'last_comment',
+        }
+        assert goal['comments_count'] == 2
+        assert goal['last_comment']['id'] == last['id']
+        assert goal['last_comment']['user'] == user.id
+        assert len(goal['last_comment']['text']) == COMMENT_PREVIEW_LENGTH
+        assert (empty_goal['comments_count'], empty_goal['last_comment']) == (0, None)
+
+    def test_delete_updates_stats(self, auth_client: APIClient) -> None:
+        first: dict = self.comment(auth_client, 'first')
+        last: dict = self.comment(auth_client, 'last')
+
+        auth_client.delete(reverse('retrieve-update-destroy-comment', args=[last['id']]))
+        goal: Goal = Goal.objects.get(id=self.goal.id)
+        assert (goal.comments_count, goal.last_comment_id) == (1, first['id'])
+
+    def test_query_count_does_not_grow(self, auth_client: APIClient, goal_factory: Any, user: Any) -> None:
+        self.comment(auth_client, 'first')
+        with CaptureQueriesContext(connection) as before:
+            auth_client.get(self.url, {'include': 'comments'})
+
+        for goal in goal_factory.create_batch(5, category=self.goal.category, user=user):
+            GoalComment.objects.create(goal=goal, user=user, text='comment')
+        with CaptureQueriesContext(connection) as after:
+            response = auth_client.get(self.url, {'include': 'comments'})
+        assert len(response.json()) == 7
+        assert len(after) == len(before)
+
+    def test_etag_changes_with_comments(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(self.url, {'include': 'comments'})['ETag']
+        self.comment(auth_client, 'first')
+        response = auth_client.get(self.url, {'include': 'comments'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
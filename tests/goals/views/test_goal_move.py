@@ -0,0 +1,61 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestGoalMoveView(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        self.goals: list[Goal] = goal_factory.create_batch(4, category=self.category, user=user)
+
+    def _ordered_ids(self, client: APIClient) -> list[int]:
+        response = client.get(reverse('list-goals'), data={'category': self.category.id, 'ordering': 'rank'})
+        assert response.status_code == status.HTTP_200_OK
+        return [goal['id'] for goal in response.json()]
+
+    def test_new_goals_are_appended(self, auth_client: APIClient) -> None:
+        assert self._ordered_ids(auth_client) == [goal.id for goal in self.goals]
+
+    @pytest.mark.parametrize(('moved', 'after', 'expected'), [
+        (3, 0, [0, 3, 1, 2]),
+        (0, 2, [1, 2, 0, 3]),
+        (2, None, [2, 0, 1, 3]),
+        (0, 3, [1, 2, 3, 0]),
+    ])
+    def test_move(self, auth_client: APIClient, moved: int, after: int | None, expected: list[int]) -> None:
+        goal: Goal = self.goals[moved]
+        response = auth_client.post(reverse('move-goal', args=[goal.id]),
+                                    data={'after': self.goals[after].id if after is not None else None})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['rank'] == Goal.objects.get(id=goal.id).rank
+
+        assert self._ordered_ids(auth_client) == [self.goals[index].id for index in expected]
+
+    def test_move_changes_etag(self, auth_client: APIClient) -> None:
+        etag: str = auth_client.get(reverse('list-goals'), data={'ordering': 'rank'})['ETag']
+        auth_client.post(reverse('move-goal', args=[self.goals[3].id]), data={'after': None})
+
+        response = auth_client.get(reverse('list-goals'), data={'ordering': 'rank'}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_after_must_be_in_same_category(self, auth_client: APIClient, goal_factory: Any, user: Any) -> None:
+        other: Goal = goal_factory.create(user=user)
+        response = auth_client.post(reverse('move-goal', args=[self.goals[0].id]), data={'after': other.id})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = auth_client.post(reverse('move-goal', args=[self.goals[0].id]), data={'after': self.goals[0].id})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_stranger_cannot_move(self, client: APIClient, user_factory: Any) -> None:
+        client.force_login(user_factory.create())
+        response = client.post(reverse('move-goal', args=[self.goals[0].id]), data={'after': None})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestGoalOrdering(BaseTestCase):
+    url = reverse('list-goals')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        now = datetime(2023, 3, 1, tzinfo=timezone.utc)
+        self.goals: list[Goal] = [
+            goal_factory.create(category=category, user=user, title=f'Goal {number}', priority=priority,
+                                status=goal_status, due_date=None if days is None else now + timedelta(days=days))
+            for number, (priority, goal_status, days) in enumerate([
+                (Goal.Priority.high, Goal.Status.to_do, 3),
+                (Goal.Priority.critical, Goal.Status.in_progress, None),
+                (Goal.Priority.high, Goal.Status.to_do, None),
+                (Goal.Priority.critical, Goal.Status.done, 1),
+                (Goal.Priority.low, Goal.Status.to_do, 3),
+                (Goal.Priority.high, Goal.Status.in_progress, -2),
+            ])
+        ]
+
+    def test_priority_desc_then_due_date(self, auth_client: APIClient) -> None:
+        response = auth_client.get(self.url, {'ordering': '-priority,due_date'})
+        assert response.status_code == status.HTTP_200_OK
+        # Без дедлайна - в конце группы приоритета, при равенстве - по id
+        assert [goal['id'] for goal in response.json()] == [
+            self.goals[index].id for index in (3, 1, 5, 0, 2, 4)
+        ]
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    @pytest.mark.parametrize('ordering', ['-priority,due_date', 'due_date', '-due_date', 'status,-priority', 'title'])
+    def test_keyset_pages_match_full_list(self, auth_client: APIClient, settings: Any, ordering: str,
+                                          fast: bool) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        expected: list[int] = [goal['id'] for goal in auth_client.get(self.url, {'ordering': ordering}).json()]
+
+        ids: list[int] = []
+        response = auth_client.get(self.url, {'ordering': ordering, 'page_size': 2})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            page: dict = response.json()
+            assert len(page['results']) <= 2
+            ids += [goal['id'] for goal in page['results']]
+            if not page['next']:
+                break
+            response = auth_client.get(page['next'])
+
+        assert ids == expected
+
+    def test_invalid_cursor(self, auth_client: APIClient) -> None:
+        response = auth_client.get(self.url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,70 @@
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import BoardParticipant, Goal
+
+
+@pytest.mark.django_db()
+class TestGoalListCache(BaseTestCase):
+    url = reverse('list-goals')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings: Any, board_factory: Any, goal_category_factory: Any, goal_factory: Any,
+              user: Any, django_capture_on_commit_callbacks: Any) -> None:  # noqa: PT004
+        settings.GOALS_LIST_CACHE_TIMEOUT = 60
+        cache.clear()
+        self.capture = django_capture_on_commit_callbacks
+        self.board = board_factory.create(with_owner=user)
+        self.category = goal_category_factory.create(board=self.board, user=user)
+        self.goal: Goal = goal_factory.create(category=self.category, user=user, title='Old')
+
+    def _titles(self, client: APIClient) -> list[str]:
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        return [goal['title'] for goal in response.json()]
+
+    def test_response_is_cached(self, auth_client: APIClient) -> None:
+        assert self._titles(auth_client) == ['Old']
+        Goal.objects.filter(id=self.goal.id).update(title='New')
+
+        assert self._titles(auth_client) == ['Old']
+
+    def test_save_invalidates_cache(self, auth_client: APIClient) -> None:
+        assert self._titles(auth_client) == ['Old']
+
+        with self.capture(execute=True):
+            self.goal.title = 'New'
+            self.goal.save()
+
+        assert self._titles(auth_client) == ['New']
+
+    def test_category_destroy_invalidates_cache(self, auth_client: APIClient) -> None:
+        assert self._titles(auth_client) == ['Old']
+
+        with self.capture(execute=True):
+            response = auth_client.delete(reverse('retrieve-update-destroy-category', args=[self.category.id]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        assert self._titles(auth_client) == []
+
+    def test_cache_is_per_user(self, client: APIClient, auth_client: APIClient, user_factory: Any) -> None:
+        assert self._titles(auth_client) == ['Old']
+
+        client.force_login(user_factory.create())
+        assert self._titles(client) == []
+
+    def test_new_participant_sees_board_goals(self, client: APIClient, user_factory: Any) -> None:
+        another_user = user_factory.create()
+        client.force_login(another_user)
+        assert self._titles(client) == []
+
+        with self.capture(execute=True):
+            BoardParticipant.objects.create(board=self.board, user=another_user, role=BoardParticipant.Role.reader)
+
+        assert self._titles(client) == ['Old']
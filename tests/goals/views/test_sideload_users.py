@@ -0,0 +1,50 @@
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestSideloadUsers(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, goal_comment_factory: Any,
+              user: Any, user_factory: Any) -> None:  # noqa: PT004
+        board = board_factory.create(with_owner=user)
+        category = goal_category_factory.create(board=board, user=user)
+        self.goal: Goal = goal_factory.create(category=category, user=user)
+        self.authors: list = [user, *user_factory.create_batch(2)]
+        for index in range(9):
+            goal_comment_factory.create(goal=self.goal, user=self.authors[index % 3])
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    def test_comments(self, auth_client: APIClient, settings: Any, django_assert_max_num_queries: Any,
+                      fast: bool) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        # Без REDIS_URL сессия читается из базы: на один запрос больше, чем с cached_db
+        with django_assert_max_num_queries(7):
+            response = auth_client.get(reverse('list-comment'), {'goal': self.goal.id, 'include': 'users'})
+        assert response.status_code == status.HTTP_200_OK
+
+        data: dict = response.json()
+        assert len(data['results']) == 9
+        assert 'user' not in data['results'][0]
+        assert {row['user_id'] for row in data['results']} == {author.id for author in self.authors}
+        assert set(data['users']) == {str(author.id) for author in self.authors}
+        assert data['users'][str(self.authors[1].id)]['username'] == self.authors[1].username
+
+    def test_paginated_categories(self, auth_client: APIClient, user: Any) -> None:
+        response = auth_client.get(reverse('list-categories'), {'include': 'users', 'limit': 10})
+        data: dict = response.json()
+        assert data['count'] == 1
+        assert data['results'][0]['user_id'] == user.id
+        assert list(data['users']) == [str(user.id)]
+
+    def test_default_shape(self, auth_client: APIClient) -> None:
+        comments: list = auth_client.get(reverse('list-comment'), {'goal': self.goal.id}).json()
+        assert 'username' in comments[0]['user']
@@ -0,0 +1,73 @@
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.goals.models import Goal
+
+
+@pytest.mark.django_db()
+class TestSparseFields(BaseTestCase):
+    url = reverse('list-goals')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        self.goals: list[Goal] = goal_factory.create_batch(5, category=self.category, user=user,
+                                                           description='long text ' * 100)
+
+    @staticmethod
+    def goal_selects(queries: CaptureQueriesContext) -> list[str]:
+        return [query['sql'] for query in queries if query['sql'].startswith('SELECT "goals_goal"."id"')]
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    @pytest.mark.parametrize('params', [{'fields': 'id,title'}, {'omit': 'description'}])
+    def test_description_not_read(self, auth_client: APIClient, settings: Any, fast: bool, params: dict) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+
+        goal: dict = response.json()[0]
+        assert 'description' not in goal
+        assert 'title' in goal
+        if 'fields' in params:
+            assert set(goal) == {'id', 'title'}
+        selects: list[str] = self.goal_selects(queries)
+        assert selects
+        assert all('"description"' not in sql for sql in selects)
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    def test_keyset_cursor_with_sparse_fields(self, auth_client: APIClient, settings: Any, fast: bool) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        params: dict = {'fields': 'title', 'ordering': '-priority', 'page_size': 2}
+        titles: list[str] = []
+        response = auth_client.get(self.url, params)
+        while True:
+            titles += [goal['title'] for goal in response.json()['results']]
+            if not response.json()['next']:
+                break
+            response = auth_client.get(response.json()['next'])
+        assert sorted(titles) == sorted(goal.title for goal in self.goals)
+
+    def test_unknown_field(self, auth_client: APIClient) -> None:
+        response = auth_client.get(self.url, {'fields': 'title,secret'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'fields': 'Unknown fields: secret'}
+
+    def test_other_endpoints(self, auth_client: APIClient) -> None:
+        categories: list = auth_client.get(reverse('list-categories'), {'fields': 'id,title'}).json()
+        assert set(categories[0]) == {'id', 'title'}
+        boards: list = auth_client.get(reverse('board-list'), {'omit': 'created,updated'}).json()
+        assert 'created' not in boards[0]
+
+        url: str = reverse('retrieve-update-destroy-goal', args=[self.goals[0].id])
+        assert auth_client.get(url, {'fields': 'title'}).json() == {'title': self.goals[0].title}
+        # Сокращается только чтение: ответ на изменение содержит все поля
+        response = auth_client.patch(f'{url}?fields=title', {'title': 'New title'})
+        assert response.json()['description'] == self.goals[0].description
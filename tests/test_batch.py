@@ -0,0 +1,111 @@
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.test_db import canceled_query
+from tests.utils import BaseTestCase
+from todolist.db import PRIMARY_PIN_COOKIE
+from todolist.goals.models import Board, Goal
+from todolist.goals.views import GoalListView
+from todolist.metrics import REQUESTS_TOTAL, STATEMENT_TIMEOUTS_TOTAL, registry
+
+
+@pytest.mark.django_db()
+class TestBatchView(BaseTestCase):
+    url = reverse('batch')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, goal_comment_factory: Any,
+              user: Any) -> None:  # noqa: PT004
+        self.board: Board = board_factory.create(with_owner=user)
+        category = goal_category_factory.create(board=self.board, user=user)
+        self.goals: list[Goal] = goal_factory.create_batch(3, category=category, user=user)
+        goal_comment_factory.create(goal=self.goals[0], user=user)
+
+    def test_board_page(self, auth_client: APIClient, django_assert_max_num_queries: Any) -> None:
+        requests: list[dict] = [
+            {'path': reverse('retrieve-update-destroy-board', args=[self.board.id])},
+            {'path': f'{reverse("list-categories")}?board={self.board.id}'},
+            {'path': f'{reverse("list-goals")}?ordering=title'},
+            *({'path': reverse('retrieve-update-destroy-goal', args=[goal.id])} for goal in self.goals),
+            {'path': f'{reverse("list-comment")}?goal={self.goals[0].id}'},
+            {'path': reverse('profile-view')},
+        ]
+        response = auth_client.post(self.url, {'requests': requests}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        responses: list[dict] = response.json()['responses']
+        assert [item['status'] for item in responses] == [status.HTTP_200_OK] * len(requests)
+        assert responses[0]['body']['title'] == self.board.title
+        assert len(responses[2]['body']) == 3
+        assert responses[3]['body']['id'] == self.goals[0].id
+        assert 'ETag' in responses[3]['headers']
+        assert len(responses[-2]['body']) == 1
+
+    def test_roles_loaded_once(self, auth_client: APIClient) -> None:
+        """Проверки доступа к объектам разных подзапросов не обращаются к базе повторно"""
+        def count_participant_queries(goals: list[Goal]) -> int:
+            with CaptureQueriesContext(connection) as queries:
+                auth_client.post(self.url, {'requests': [
+                    {'path': reverse('retrieve-update-destroy-goal', args=[goal.id])} for goal in goals
+                ]}, format='json')
+            return sum('goals_boardparticipant' in query['sql'] for query in queries)
+
+        assert count_participant_queries(self.goals[:1]) == count_participant_queries(self.goals)
+
+    def test_conditional_sub_request(self, auth_client: APIClient) -> None:
+        path: str = reverse('retrieve-update-destroy-goal', args=[self.goals[0].id])
+        first: dict = auth_client.post(self.url, {'requests': [{'path': path}]}, format='json').json()
+        etag: str = first['responses'][0]['headers']['ETag']
+
+        response = auth_client.post(
+            self.url, {'requests': [{'path': path, 'headers': {'If-None-Match': etag}}]}, format='json',
+        )
+        sub_response: dict = response.json()['responses'][0]
+        assert (sub_response['status'], sub_response['headers']['ETag'], sub_response['body']) == (304, etag, None)
+
+    def test_errors(self, auth_client: APIClient, client: APIClient, user_factory: Any) -> None:
+        responses: list[dict] = auth_client.post(self.url, {'requests': [
+            {'path': '/goals/unknown'},
+            {'path': reverse('retrieve-update-destroy-goal', args=[0])},
+        ]}, format='json').json()['responses']
+        assert [item['status'] for item in responses] == [status.HTTP_404_NOT_FOUND] * 2
+
+        for body in ({'requests': [{'path': '/admin/'}]}, {'requests': [{'path': '/goals/goal/list', 'method': 'POST'}]},
+                     {'requests': [{'path': '/goals/goal/list'}] * 21}):
+            assert auth_client.post(self.url, body, format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+        client.force_login(user_factory.create())
+        responses = client.post(self.url, {'requests': [
+            {'path': reverse('retrieve-update-destroy-goal', args=[self.goals[0].id])},
+        ]}, format='json').json()['responses']
+        assert responses[0]['status'] == status.HTTP_403_FORBIDDEN
+        assert APIClient().post(self.url, {}, format='json').status_code == status.HTTP_403_FORBIDDEN
+
+    def test_sub_requests_are_measured_and_limited(self, settings: Any, auth_client: APIClient,
+                                                   monkeypatch: Any) -> None:
+        def list_goals(*args: Any, **kwargs: Any) -> None:
+            raise canceled_query()
+
+        settings.METRICS_ENABLED = True
+        monkeypatch.setattr(GoalListView, 'list', list_goals)
+        registry.counters.clear()
+
+        responses: list[dict] = auth_client.post(self.url, {'requests': [
+            {'path': reverse('list-goals')},
+            {'path': reverse('retrieve-update-destroy-board', args=[self.board.id])},
+        ]}, format='json').json()['responses']
+        assert [item['status'] for item in responses] == [status.HTTP_503_SERVICE_UNAVAILABLE, status.HTTP_200_OK]
+        assert registry.counters[(STATEMENT_TIMEOUTS_TOTAL, (('view', 'list-goals'),))] == 1
+        assert registry.counters[(REQUESTS_TOTAL, (('view', 'list-goals'), ('method', 'GET'), ('status', '503')))] == 1
+        assert registry.counters[(REQUESTS_TOTAL, (('view', 'batch'), ('method', 'POST'), ('status', '200')))] == 1
+
+    def test_read_only_batch_does_not_pin_client(self, replicas: list[str], auth_client: APIClient) -> None:
+        response = auth_client.post(self.url, {'requests': [{'path': reverse('list-goals')}]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert PRIMARY_PIN_COOKIE not in response.cookies
@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import OperationalError, connection, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.db import (
+    PRIMARY_PIN_COOKIE, QUERY_CANCELED, ReplicaMiddleware, is_client_pinned_to_primary, is_statement_timeout,
+    pin_client_to_primary, pin_to_primary, read_from_replica, statement_timeout,
+)
+from todolist.goals.models import Goal
+from todolist.goals.views import GoalListView
+from todolist.metrics import STATEMENT_TIMEOUTS_TOTAL, registry
+
+
+def read_alias(request: Any = None) -> HttpResponse:
+    return HttpResponse(router.db_for_read(Goal))
+
+
+class TestReplicaRouter:
+
+    def test_reads_outside_of_block_go_to_primary(self, replicas: list[str]) -> None:
+        assert router.db_for_read(Goal) == 'default'
+        with read_from_replica():
+            assert router.db_for_read(Goal) in replicas
+            assert router.db_for_write(Goal) == 'default'
+
+    def test_without_replicas_everything_goes_to_primary(self) -> None:
+        with read_from_replica():
+            assert router.db_for_read(Goal) == 'default'
+
+    def test_pinned_user_reads_from_primary(self, replicas: list[str]) -> None:
+        pin_to_primary(1)
+        with read_from_replica(1):
+            assert router.db_for_read(Goal) == 'default'
+        with read_from_replica(2):
+            assert router.db_for_read(Goal) in replicas
+
+    def test_migrations_are_not_applied_to_replicas(self, replicas: list[str]) -> None:
+        assert router.allow_migrate('replica_1', 'goals') is False
+        assert router.allow_migrate('default', 'goals') is True
+
+    @pytest.mark.django_db()
+    def test_reads_in_transaction_go_to_primary(self, replicas: list[str]) -> None:
+        with read_from_replica(), transaction.atomic():
+            assert router.db_for_read(Goal) == 'default'
+
+
+class TestReplicaMiddleware(BaseTestCase):
+
+    def test_safe_requests_read_from_replica(self, replicas: list[str]) -> None:
+        # Без базы: тестовая транзакция сама по себе направляет чтения в основную базу
+        request = RequestFactory().get('/goals/goal/list')
+        request.user = SimpleNamespace(id=1)
+        assert ReplicaMiddleware(read_alias)(request).content.decode() in replicas
+
+        pinned = HttpResponse()
+        pin_client_to_primary(pinned)
+        request.COOKIES[PRIMARY_PIN_COOKIE] = pinned.cookies[PRIMARY_PIN_COOKIE].value
+        assert ReplicaMiddleware(read_alias)(request).content.decode() == 'default'
+
+        request = RequestFactory().post('/goals/goal/create')
+        request.user = AnonymousUser()
+        assert ReplicaMiddleware(read_alias)(request).content.decode() == 'default'
+
+    @pytest.mark.django_db()
+    def test_write_pins_client_to_primary(self, replicas: list[str], auth_client: APIClient, user: Any,
+                                        board_factory: Any, goal_category_factory: Any) -> None:
+        board = board_factory.create(with_owner=user)
+        category = goal_category_factory.create(board=board, user=user)
+
+        response = auth_client.post(reverse('create-goal'), data={'title': 'New', 'category': category.id})
+        assert response.status_code == status.HTTP_201_CREATED
+        # Отметка приходит с клиентом, а не из кэша: ее видит любой процесс gunicorn
+        cache.clear()
+        request = RequestFactory().get(reverse('list-goals'))
+        request.COOKIES = {name: morsel.value for name, morsel in auth_client.cookies.items()}
+        assert is_client_pinned_to_primary(request)
+
+
+class DriverError(Exception):
+    pgcode = QUERY_CANCELED
+
+
+def canceled_query() -> OperationalError:
+    """Ошибка, которую Django поднимает вместо psycopg2.errors.QueryCanceled"""
+    error = OperationalError('canceling statement due to statement timeout')
+    error.__cause__ = DriverError()
+    return error
+
+
+@pytest.mark.django_db()
+class TestStatementTimeout(BaseTestCase):
+
+    def test_timeout_is_detected_by_sqlstate(self) -> None:
+        assert is_statement_timeout(canceled_query())
+        assert not is_statement_timeout(OperationalError('server closed the connection'))
+
+    def test_timeout_is_set_only_on_postgres(self) -> None:
+        with statement_timeout(100):
+            assert Goal.objects.count() == 0
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SHOW statement_timeout')
+                assert cursor.fetchone()[0] == '0'
+
+    def test_inner_block_timeout_applies_until_exit(self) -> None:
+        def current() -> str:
+            with connection.cursor() as cursor:
+                cursor.execute('SHOW statement_timeout')
+                return cursor.fetchone()[0]
+
+        if connection.vendor != 'postgresql':
+            pytest.skip('statement_timeout is set only on Postgres')
+        with statement_timeout(5000):
+            assert current() == '5s'
+            with statement_timeout(200):
+                assert current() == '200ms'
+            assert current() == '5s'
+        assert current() == '0'
+
+    def test_canceled_query_returns_503(self, auth_client: APIClient, monkeypatch: Any) -> None:
+        def list_goals(*args: Any, **kwargs: Any) -> None:
+            raise canceled_query()
+
+        monkeypatch.setattr(GoalListView, 'list', list_goals)
+        registry.counters.clear()
+
+        response = auth_client.get(reverse('list-goals'), data={'search': 'plan'})
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert registry.counters[(STATEMENT_TIMEOUTS_TOTAL, (('view', 'list-goals'),))] == 1
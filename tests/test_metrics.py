@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.metrics import DB_QUERIES, REQUEST_DURATION, SERIALIZER_DURATION, Registry, collect, registry, render
+
+
+class TestRegistry:
+
+    def test_render_histogram(self) -> None:
+        source = Registry()
+        for value in (0.001, 0.3, 20):
+            source.observe('latency', (('view', 'list-goals'),), value)
+
+        text: str = render(source)
+        assert '# TYPE latency histogram' in text
+        assert 'latency_bucket{view="list-goals",le="0.005"} 1' in text
+        assert 'latency_bucket{view="list-goals",le="0.5"} 2' in text
+        assert 'latency_bucket{view="list-goals",le="+Inf"} 3' in text
+        assert 'latency_count{view="list-goals"} 3' in text
+
+    def test_snapshots_of_processes_are_summed(self, settings: Any, tmp_path: Any) -> None:
+        settings.METRICS_DIR = str(tmp_path)
+        other = Registry()
+        other.inc('requests', (('view', 'list-goals'),), 2)
+        (tmp_path / 'other.json').write_text(json.dumps(other.snapshot()))
+        (tmp_path / 'broken.json').write_text('{')
+
+        merged: Registry = collect()
+        assert merged.counters[('requests', (('view', 'list-goals'),))] == 2
+        assert (tmp_path / f'{os.getpid()}.json').exists()
+
+
+@pytest.mark.django_db()
+class TestMetricsMiddleware(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        board = board_factory.create(with_owner=user)
+        category = goal_category_factory.create(board=board, user=user)
+        goal_factory.create_batch(3, category=category, user=user)
+        registry.histograms.clear()
+        registry.counters.clear()
+
+    def test_request_is_recorded(self, auth_client: APIClient, client: APIClient) -> None:
+        response = auth_client.get(reverse('list-goals'))
+        assert response.status_code == status.HTTP_200_OK
+
+        assert registry.histograms[(REQUEST_DURATION, (('view', 'list-goals'), ('method', 'GET')))].counts
+        assert registry.histograms[(DB_QUERIES, (('view', 'list-goals'),))].sum >= 1
+        assert registry.histograms[(SERIALIZER_DURATION, (('view', 'list-goals'),))].sum > 0
+
+        metrics = client.get(reverse('metrics'))
+        assert metrics.status_code == status.HTTP_200_OK
+        assert f'{REQUEST_DURATION}_count{{view="list-goals",method="GET"}} 1' in metrics.content.decode()
+
+    def test_slow_request_logged_with_slowest_query(self, auth_client: APIClient, settings: Any,
+                                                    caplog: Any) -> None:
+        settings.METRICS_SLOW_REQUEST_QUERIES = 1
+        with caplog.at_level(logging.WARNING, logger='todolist.metrics'):
+            auth_client.get(reverse('list-goals'))
+
+        assert 'Slow request GET /goals/goal/list (list-goals)' in caplog.text
+        assert 'SELECT' in caplog.text
+
+    def test_external_requests_require_token(self, client: APIClient, settings: Any) -> None:
+        assert client.get(reverse('metrics'), HTTP_X_REAL_IP='1.2.3.4').status_code == status.HTTP_403_FORBIDDEN
+
+        settings.METRICS_TOKEN = 'secret'
+        assert client.get(reverse('metrics')).status_code == status.HTTP_403_FORBIDDEN
+        response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == status.HTTP_200_OK
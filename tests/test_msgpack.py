@@ -0,0 +1,49 @@
+import json
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tests.utils import BaseTestCase
+from todolist.renderers import MessagePackRenderer
+
+msgpack = pytest.importorskip('msgpack')
+
+
+def test_non_native_types_match_json() -> None:
+    data: dict = {'amount': Decimal('1.50'), 'items': [1, None, 'строка']}
+    assert msgpack.unpackb(MessagePackRenderer().render(data)) == json.loads(JSONRenderer().render(data))
+
+
+@pytest.mark.django_db()
+class TestMessagePack(BaseTestCase):
+    MSGPACK = 'application/msgpack'
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_factory: Any, goal_category_factory: Any, goal_factory: Any, user: Any) -> None:  # noqa: PT004
+        self.category = goal_category_factory.create(board=board_factory.create(with_owner=user), user=user)
+        goal_factory.create_batch(3, category=self.category, user=user)
+
+    @pytest.mark.parametrize('fast', [False, True], ids=['serializer', 'fast'])
+    def test_same_data_as_json(self, auth_client: APIClient, settings: Any, fast: bool) -> None:
+        settings.GOALS_FAST_SERIALIZATION = fast
+        url: str = reverse('list-goals')
+        response = auth_client.get(url, {'limit': 10}, HTTP_ACCEPT=self.MSGPACK)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == self.MSGPACK
+        assert msgpack.unpackb(response.content) == json.loads(auth_client.get(url, {'limit': 10}).content)
+
+    def test_msgpack_request_body(self, auth_client: APIClient) -> None:
+        response = auth_client.generic(
+            'POST', reverse('create-goal'), msgpack.packb({'title': 'Packed', 'category': self.category.id}),
+            content_type=self.MSGPACK, HTTP_ACCEPT=self.MSGPACK,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert msgpack.unpackb(response.content)['title'] == 'Packed'
+
+        response = auth_client.generic('POST', reverse('create-goal'), b'\xc1', content_type=self.MSGPACK)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,142 @@
+"""Пакетный эндпоинт: несколько GET-запросов к API за один HTTP-запрос.
+
+Подзапросы выполняются в том же процессе без middleware: сессия и пользователь берутся
+из внешнего запроса, а роли пользователя в досках (todolist.goals.permissions.get_board_roles)
+загружаются один раз и общие для всех подзапросов. Изменяющие запросы в пакет не входят:
+у них остаются собственные CSRF-проверка, ограничения частоты и транзакция.
+
+То, что для обычных запросов делают middleware, пакет повторяет для каждого подзапроса сам:
+метрики по имени маршрута подзапроса, его statement_timeout и 503 при прерванном SQL.
+Пакет из одних GET-запросов читает с реплик и не закрепляет клиента за основной базой.
+"""
+import json
+from contextlib import nullcontext
+from functools import partial
+from typing import Any
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import OperationalError
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.urls import Resolver404, ResolverMatch, resolve
+from rest_framework import permissions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from todolist.db import (
+    SAFE_METHODS, is_client_pinned_to_primary, read_from_replica, skip_primary_pin, statement_timeout,
+    statement_timeout_response, view_statement_timeout,
+)
+from todolist.goals.permissions import get_board_roles
+from todolist.metrics import MetricsMiddleware
+
+BATCH_PATH_PREFIXES = ('/goals/', '/core/')
+# Заголовки, которые подзапрос может задать сам, например для условного GET
+BATCH_REQUEST_HEADERS = ('If-None-Match', 'If-Modified-Since', 'Accept-Language')
+BATCH_RESPONSE_HEADERS = ('ETag', 'Last-Modified')
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET'], default='GET')
+    path = serializers.CharField()
+    headers = serializers.DictField(child=serializers.CharField(), required=False, default=dict)
+
+    def validate_path(self, value: str) -> str:
+        if not urlsplit(value).path.startswith(BATCH_PATH_PREFIXES):
+            raise serializers.ValidationError(f'Path must start with one of {", ".join(BATCH_PATH_PREFIXES)}')
+        return value
+
+    def validate_headers(self, value: dict) -> dict:
+        if unknown := set(value) - set(BATCH_REQUEST_HEADERS):
+            raise serializers.ValidationError(f'Unsupported headers: {", ".join(sorted(unknown))}')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=SubRequestSerializer(), allow_empty=False)
+
+    def validate_requests(self, value: list) -> list:
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f'No more than {settings.BATCH_MAX_REQUESTS} requests')
+        return value
+
+
+def build_sub_request(request: HttpRequest, method: str, path: str, headers: dict[str, str]) -> HttpRequest:
+    url = urlsplit(path)
+    sub_request = HttpRequest()
+    sub_request.method = method
+    sub_request.path = sub_request.path_info = url.path
+    sub_request.GET = QueryDict(url.query)
+    sub_request.META = {
+        key: value for key, value in request.META.items()
+        if not key.startswith('HTTP_IF_') and key not in ('CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    sub_request.META['QUERY_STRING'] = url.query
+    sub_request.META['REQUEST_METHOD'] = method
+    for name, value in headers.items():
+        sub_request.META[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    sub_request.COOKIES = request.COOKIES
+    # Уже разобранные сессия и пользователь внешнего запроса
+    sub_request.session = request.session
+    sub_request.user = request.user
+    sub_request.board_roles = get_board_roles(request)
+    return sub_request
+
+
+def _response_body(response: HttpResponse) -> Any:
+    if getattr(response, 'data', None) is not None:
+        return response.data
+    if not response.content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(response.content)
+    return response.content.decode(response.charset)
+
+
+def _dispatch(sub_request: HttpRequest, match: ResolverMatch) -> HttpResponse:
+    try:
+        with statement_timeout(view_statement_timeout(match.view_name)):
+            response: HttpResponse = match.func(sub_request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+    except OperationalError as error:
+        response = statement_timeout_response(sub_request, error)
+        if response is None:
+            raise
+    return response
+
+
+def run_sub_request(request: HttpRequest, method: str, path: str, headers: dict[str, str]) -> dict:
+    sub_request: HttpRequest = build_sub_request(request, method, path, headers)
+    try:
+        match = resolve(sub_request.path_info)
+    except Resolver404:
+        return {'status': 404, 'headers': {}, 'body': None}
+    sub_request.resolver_match = match
+    response: HttpResponse = MetricsMiddleware.measure(sub_request, partial(_dispatch, match=match))
+    return {
+        'status': response.status_code,
+        'headers': {name: response[name] for name in BATCH_RESPONSE_HEADERS if response.has_header(name)},
+        'body': _response_body(response),
+    }
+
+
+class BatchView(APIView):
+    """POST /batch {"requests": [{"path": "/goals/board/1", "headers": {...}}, ...]}
+    -> {"responses": [{"status", "headers", "body"}, ...]} в порядке запросов"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args: Any, **kwargs: Any) -> Response:
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items: list[dict] = serializer.validated_data['requests']
+        reads = nullcontext()
+        if all(item['method'] in SAFE_METHODS for item in items):
+            # Пакет только читает: как обычный GET, хотя и пришел методом POST
+            skip_primary_pin(request._request)
+            reads = read_from_replica(pinned=is_client_pinned_to_primary(request._request))
+        with reads:
+            responses: list[dict] = [
+                run_sub_request(request._request, item['method'], item['path'], item['headers']) for item in items
+            ]
+        return Response({'responses': responses})
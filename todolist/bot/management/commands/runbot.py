@@ -1,11 +1,14 @@
 import logging
 import os
+from collections import Counter
 from datetime import datetime
 from enum import Enum, auto
 from typing import Any
 
 from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import OperationalError
+from django.utils import timezone
 from pydantic import BaseModel
 
 from todolist.bot.models import TgUser
@@ -13,7 +16,10 @@ from todolist.bot.tg.client import TgClient
 from todolist.bot.tg.fsm.memory_storage import MemoryStorage
 
 from todolist.bot.tg.dc import Message
+from todolist.db import is_statement_timeout, pin_to_primary, read_from_replica, statement_timeout
+from todolist.goals.buckets import Bucket, goal_bucket
 from todolist.goals.models import Goal, GoalCategory, BoardParticipant
+from todolist.metrics import STATEMENT_TIMEOUTS_TOTAL, registry
 
 logger = logging.getLogger(__name__)
 
@@ -62,24 +68,26 @@ class Command(BaseCommand):
 
     def handle_goals_list(self, msg: Message, tg_user: TgUser) -> None:
         """Ручка для получения и вывода списка целей"""
-        resp_goals: list[str] = [
-            f'№{goal.id} {goal.title}'
-            for goal in Goal.objects.filter(user_id=tg_user.user_id,
-                                            status__in=(1, 2, 3)
-                                            ).order_by('created')
-        ]
-        if resp_goals:
-            self.tg_client.send_message(msg.chat.id, '\n'.join(resp_goals))
+        with read_from_replica(tg_user.user_id):
+            goals: list[Goal] = list(Goal.objects.active().filter(user_id=tg_user.user_id).order_by('created'))
+        if goals:
+            now = timezone.now()
+            buckets = Counter(goal_bucket(goal, now) for goal in goals)
+            header: str = (f'[overdue: {buckets[Bucket.overdue]}, due this week: {buckets[Bucket.due_this_week]}, '
+                           f'no due date: {buckets[Bucket.no_due_date]}]')
+            resp_goals: list[str] = [f'№{goal.id} {goal.title}' for goal in goals]
+            self.tg_client.send_message(msg.chat.id, '\n'.join([header, *resp_goals]))
         else:
             self.tg_client.send_message(msg.chat.id, '[You have no goals]')
 
     def handle_goal_categories_list(self, msg: Message, tg_user: TgUser) -> None:
         """Ручка для получения и вывода списка категорий целей"""
-        resp_categories: list[str] = [
-            f'#{category.id} {category.title}'
-            for category in GoalCategory.objects.filter(
-                board__participants__user_id=tg_user.user_id, is_deleted=False)
-        ]
+        with read_from_replica(tg_user.user_id):
+            resp_categories: list[str] = [
+                f'#{category.id} {category.title}'
+                for category in GoalCategory.objects.filter(
+                    board__participants__user_id=tg_user.user_id, is_deleted=False)
+            ]
         if resp_categories:
             self.tg_client.send_message(msg.chat.id, 'Select category\n' + '\n'.join(resp_categories))
         else:
@@ -114,6 +122,7 @@ class Command(BaseCommand):
                 user_id=tg_user.user_id,
                 due_date=datetime.now()
             )
+            pin_to_primary(tg_user.user_id)
             self.tg_client.send_message(msg.chat.id, '[new goal created]')
         else:
             self.tg_client.send_message(msg.chat.id, '[something went wrong]')
@@ -170,4 +179,14 @@ class Command(BaseCommand):
             res = self.tg_client.get_updates(offset=offset)
             for item in res.result:
                 offset = item.update_id + 1
-                self.handle_message(msg=item.message)
\ No newline at end of file
+                try:
+                    # У бота свое ограничение времени SQL-запросов, отдельное от view
+                    with statement_timeout(settings.BOT_STATEMENT_TIMEOUT):
+                        self.handle_message(msg=item.message)
+                except OperationalError as error:
+                    if not is_statement_timeout(error):
+                        raise
+                    registry.inc(STATEMENT_TIMEOUTS_TOTAL, (('view', 'bot'),))
+                    registry.flush()
+                    logger.warning('Statement timeout in bot: %s', error)
+                    self.tg_client.send_message(item.message.chat.id, '[request took too long, try again later]')
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todolist.core'
+
+    def ready(self) -> None:
+        from todolist.core import checks  # noqa: F401
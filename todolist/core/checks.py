@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_shared_cache(app_configs: Any, **kwargs: Any) -> list[Warning]:
+    """Счетчики ограничения частоты входа и смены пароля хранятся в кэше по умолчанию"""
+    if settings.DEBUG or settings.CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache':
+        return []
+    return [Warning(
+        'Throttle counters are kept per process: every gunicorn worker allows the full rate',
+        hint='Set REDIS_URL so that the default cache is shared between processes',
+        id='core.W001',
+    )]
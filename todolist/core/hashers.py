@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_THREADS, thread_name_prefix='password-hashing',
+            )
+        return _executor
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 с настраиваемым числом итераций, вычисляемый в отдельном пуле потоков.
+
+    hashlib.pbkdf2_hmac отпускает GIL, поэтому пока один поток считает хэш, остальные потоки
+    процесса обслуживают запросы, а размер пула ограничивает число одновременно считаемых
+    хэшей при всплеске логинов. Алгоритм тот же, что у PBKDF2PasswordHasher: старые хэши
+    проверяются, а при смене PASSWORD_PBKDF2_ITERATIONS пересчитываются при следующем входе"""
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+    def encode(self, password: str, salt: str, iterations: int | None = None) -> str:
+        if not settings.PASSWORD_HASHING_THREADS:
+            return super().encode(password, salt, iterations)
+        return get_hashing_executor().submit(super().encode, password, salt, iterations).result()
@@ -0,0 +1,36 @@
+import time
+from importlib import import_module
+from typing import Any
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """Удаляет истекшие сессии из базы пачками. В отличие от clearsessions не выполняет один
+    DELETE по всей таблице и не держит долгих блокировок. Рассчитана на запуск по расписанию (cron)"""
+    help = 'Delete expired sessions in batches'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.1, help='Пауза между пачками в секундах')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        store_class = import_module(settings.SESSION_ENGINE).SessionStore
+        if not issubclass(store_class, DBSessionStore):
+            self.stdout.write(f'{settings.SESSION_ENGINE} does not keep sessions in the database')
+            return
+
+        model = store_class.get_model_class()
+        now = timezone.now()
+        deleted: int = 0
+        # expire_date проиндексирован, каждая пачка - короткий запрос по индексу и DELETE по ключам
+        while keys := list(
+            model.objects.filter(expire_date__lt=now).values_list('session_key', flat=True)[:options['batch_size']]
+        ):
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+            time.sleep(options['pause'])
+
+        self.stdout.write(f'deleted sessions: {deleted}')
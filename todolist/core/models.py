@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 class User(AbstractUser):
-    pass
+    # Профиль встроен в ответы категорий и комментариев: его изменение должно менять их ETag
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления', auto_now=True)
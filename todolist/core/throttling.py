@@ -0,0 +1,107 @@
+import hashlib
+from collections.abc import Mapping
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Ограничение частоты скользящим окном по двум счетчикам в кэше.
+
+    В отличие от SimpleRateThrottle, который хранит в кэше список времен всех запросов,
+    здесь на ключ приходится два целых числа: счетчики текущего и предыдущего окна.
+    Число запросов за последние duration секунд оценивается как
+    previous * (доля предыдущего окна, попадающая в скользящее) + current.
+    Проверка стоит одного get_many, разрешенный запрос - еще одного add/incr.
+
+    Счетчики общие для процессов только в общем кэше (REDIS_URL): с locmem каждый воркер gunicorn
+    считает запросы сам, и фактический лимит умножается на число воркеров (предупреждение core.W001)"""
+
+    def get_rate(self) -> str | None:
+        # Ставки читаются при каждом запросе, а не при импорте, чтобы их можно было менять в настройках
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except (AttributeError, KeyError):
+            raise ImproperlyConfigured(f'No default throttle rate set for "{self.scope}" scope')
+
+    def allow_request(self, request: Request, view: Any) -> bool:
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window: int = int(self.now // self.duration)
+        self.elapsed: float = self.now - window * self.duration
+        current_key, previous_key = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+        counts: dict = self.cache.get_many([current_key, previous_key])
+        self.previous_count: int = counts.get(previous_key, 0)
+        self.current_count: int = counts.get(current_key, 0)
+        estimate: float = self.previous_count * (1 - self.elapsed / self.duration) + self.current_count
+        if estimate >= self.num_requests:
+            return self.throttle_failure()
+
+        # Счетчик живет два окна: в следующем окне он становится предыдущим
+        if not self.cache.add(current_key, 1, timeout=2 * self.duration):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, timeout=2 * self.duration)
+        return True
+
+    def wait(self) -> float:
+        """Через сколько секунд оценка опустится ниже лимита.
+
+        Пока счетчик текущего окна меньше лимита, оценку снижает убывающий вес предыдущего окна.
+        Иначе ждать нужно и после конца окна: текущий счетчик становится предыдущим, и его вес
+        должен упасть до limit / current (счетчик больше лимита, если лимит уменьшили в настройках)"""
+        excess: int = self.current_count - self.num_requests
+        if excess < 0:
+            return max(0.0, self.duration * (self.previous_count + excess) / self.previous_count - self.elapsed)
+        return self.duration - self.elapsed + self.duration * excess / self.current_count
+
+
+class IPRateThrottle(SlidingWindowRateThrottle):
+    """Лимит попыток с одного IP-адреса"""
+
+    def get_cache_key(self, request: Request, view: Any) -> str:
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UsernameRateThrottle(SlidingWindowRateThrottle):
+    """Лимит попыток для одного логина: текущего пользователя или, если use_request_user выключен
+    либо пользователь не вошел, из тела запроса"""
+    use_request_user: bool = True
+
+    def get_cache_key(self, request: Request, view: Any) -> str | None:
+        if self.use_request_user and request.user and request.user.is_authenticated:
+            username: str = request.user.get_username()
+        else:
+            # Тело может быть и JSON-списком: такой запрос отклонит сериализатор, а не throttle
+            data: Any = request.data
+            username = str(data.get('username') or '').strip().lower() if isinstance(data, Mapping) else ''
+        if not username:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': hashlib.md5(username.encode()).hexdigest()}
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = 'login_ip'
+
+
+class LoginUsernameThrottle(UsernameRateThrottle):
+    # Вошедший пользователь может подбирать пароль к чужому логину
+    scope = 'login_username'
+    use_request_user = False
+
+
+class PasswordChangeIPThrottle(IPRateThrottle):
+    scope = 'password_change_ip'
+
+
+class PasswordChangeUserThrottle(UsernameRateThrottle):
+    scope = 'password_change_user'
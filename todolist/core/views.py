@@ -8,6 +8,9 @@ from rest_framework.templatetags.rest_framework import data
 
 from todolist.core.models import User
 from todolist.core.serializers import CreateUserSerializer, LoginSerializer, ProfileSerializer, UpdatePasswordSerializer
+from todolist.core.throttling import (
+    LoginIPThrottle, LoginUsernameThrottle, PasswordChangeIPThrottle, PasswordChangeUserThrottle,
+)
 
 
 class SignupView(generics.CreateAPIView):
@@ -16,6 +19,7 @@ class SignupView(generics.CreateAPIView):
 
 class LoginView(generics.CreateAPIView):
     serializer_class = LoginSerializer
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def create(self, request: {data}, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(data=request.data)
@@ -41,6 +45,7 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
 class UpdatePasswordView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UpdatePasswordSerializer
+    throttle_classes = [PasswordChangeIPThrottle, PasswordChangeUserThrottle]
 
     def get_object(self) -> Any:
         return self.request.user
@@ -0,0 +1,228 @@
+"""Чтение с реплик базы данных с гарантией read-your-writes.
+
+Реплики задаются DB_REPLICA_HOSTS и попадают в settings.DATABASE_REPLICAS. ReplicaMiddleware
+направляет запросы GET/HEAD/OPTIONS на случайную реплику, остальные запросы идут в основную
+базу. После изменяющего запроса клиент на REPLICA_PIN_SECONDS закрепляется за основной
+базой: реплика может отставать, а свои изменения пользователь должен видеть сразу. Отметка
+приходит с клиентом в подписанной cookie: кэш без Redis у каждого процесса gunicorn свой,
+и следующий запрос мог бы попасть в процесс, который о записи не знает. Бот работает
+одним процессом и закрепляет пользователя в кэше (pin_to_primary).
+
+StatementTimeoutMiddleware ограничивает время каждого SQL-запроса view (statement_timeout
+Postgres) и отвечает 503, если запрос был прерван, вместо того чтобы держать процесс gunicorn.
+Подзапросы пакета (todolist.batch) проходят мимо middleware и получают те же ограничения
+и ответы через view_statement_timeout и statement_timeout_response.
+"""
+import logging
+import random
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from todolist.metrics import STATEMENT_TIMEOUTS_TOTAL, registry
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_PIN_COOKIE = 'primary_pin'
+
+_use_replica: ContextVar[bool] = ContextVar('use_replica', default=False)
+# Вложенные блоки statement_timeout (подзапросы пакета внутри запроса /batch): действует последний
+_active_timeouts: ContextVar[tuple] = ContextVar('active_statement_timeouts', default=())
+
+
+def primary_pin_key(user_id: int) -> str:
+    return f'db:primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id: int | None) -> None:
+    """Следующие REPLICA_PIN_SECONDS секунд пользователь читает из основной базы"""
+    if user_id and settings.DATABASE_REPLICAS and settings.REPLICA_PIN_SECONDS:
+        cache.set(primary_pin_key(user_id), 1, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id: int | None) -> bool:
+    return bool(user_id) and cache.get(primary_pin_key(user_id)) is not None
+
+
+def pin_client_to_primary(response: HttpResponse) -> None:
+    """Следующие REPLICA_PIN_SECONDS секунд запросы клиента читают из основной базы"""
+    if settings.DATABASE_REPLICAS and settings.REPLICA_PIN_SECONDS:
+        response.set_signed_cookie(
+            PRIMARY_PIN_COOKIE, '1', salt=PRIMARY_PIN_COOKIE, max_age=settings.REPLICA_PIN_SECONDS,
+            secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+        )
+
+
+def is_client_pinned_to_primary(request: HttpRequest) -> bool:
+    # Срок проверяется по подписи: клиент не продлит закрепление, сохранив cookie
+    return request.get_signed_cookie(
+        PRIMARY_PIN_COOKIE, default=None, salt=PRIMARY_PIN_COOKIE, max_age=settings.REPLICA_PIN_SECONDS,
+    ) is not None
+
+
+def skip_primary_pin(request: HttpRequest) -> None:
+    """Изменяющий метод, который только читает (пакет GET-запросов): клиент не закрепляется
+    за основной базой"""
+    request.skip_primary_pin = True
+
+
+@contextmanager
+def read_from_replica(user_id: int | None = None, pinned: bool = False) -> Iterator[None]:
+    """Чтения внутри блока идут на реплики, если они есть, а клиент (pinned) или пользователь
+    недавно ничего не меняли"""
+    token = _use_replica.set(
+        bool(settings.DATABASE_REPLICAS) and not pinned and not is_pinned_to_primary(user_id)
+    )
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Вне read_from_replica и внутри транзакций все запросы идут в основную базу"""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        if not _use_replica.get() or not settings.DATABASE_REPLICAS:
+            return None
+        # В транзакции читаем то, что в ней же и записали
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # Реплики содержат те же строки, что и основная база
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+class ReplicaMiddleware:
+    """Ставится после AuthenticationMiddleware"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            response: HttpResponse = self.get_response(request)
+            if not getattr(request, 'skip_primary_pin', False):
+                pin_client_to_primary(response)
+            return response
+
+        # Сессия и пользователь читаются из основной базы: реплика может еще не знать о новом входе
+        with read_from_replica(pinned=is_client_pinned_to_primary(request)):
+            return self.get_response(request)
+
+
+# SQLSTATE query_canceled: Postgres прервал запрос по statement_timeout
+QUERY_CANCELED = '57014'
+
+
+def is_statement_timeout(error: BaseException) -> bool:
+    return isinstance(error, OperationalError) and getattr(error.__cause__, 'pgcode', None) == QUERY_CANCELED
+
+
+class StatementTimeout:
+    """Обертка connection.execute_wrapper: перед первым запросом соединения в блоке задает ему
+    statement_timeout. Соединения, которые в блоке не понадобились, не открываются.
+    Во вложенных блоках значение задает только самый внутренний, после его выхода внешний
+    снова задает свое перед следующим запросом"""
+
+    def __init__(self, milliseconds: int) -> None:
+        self.milliseconds = milliseconds
+        self.applied: set[str] = set()
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        connection = context['connection']
+        if (connection.vendor == 'postgresql' and _active_timeouts.get()[-1:] == (self,)
+                and getattr(connection, 'applied_statement_timeout', None) != self.milliseconds):
+            # Напрямую через курсор драйвера, минуя execute_wrapper
+            context['cursor'].cursor.execute('SET statement_timeout = %s', [self.milliseconds])
+            connection.applied_statement_timeout = self.milliseconds
+            self.applied.add(connection.alias)
+        return execute(sql, params, many, context)
+
+    def reset(self) -> None:
+        outer: tuple = _active_timeouts.get()
+        for alias in self.applied:
+            connection = connections[alias]
+            connection.applied_statement_timeout = None
+            if outer:
+                # Сбросит внешний блок, если сам не задаст значение раньше
+                outer[-1].applied.add(alias)
+                continue
+            if connection.connection is None:
+                continue
+            try:
+                with connection.connection.cursor() as cursor:
+                    cursor.execute('SET statement_timeout TO DEFAULT')
+            except connection.Database.Error:
+                # Соединение в прерванной транзакции закроется в конце запроса
+                logger.warning('Could not reset statement_timeout on %s', alias)
+
+
+@contextmanager
+def statement_timeout(milliseconds: int) -> Iterator[None]:
+    """Прерывает SQL-запросы блока дольше milliseconds (0 - без ограничения, только Postgres)"""
+    if not milliseconds:
+        yield
+        return
+    wrapper = StatementTimeout(milliseconds)
+    token = _active_timeouts.set((*_active_timeouts.get(), wrapper))
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            yield
+    finally:
+        _active_timeouts.reset(token)
+        wrapper.reset()
+
+
+def view_statement_timeout(view_name: str) -> int:
+    """Ограничение из DB_STATEMENT_TIMEOUTS по имени маршрута, иначе DB_STATEMENT_TIMEOUT"""
+    return settings.DB_STATEMENT_TIMEOUTS.get(view_name, settings.DB_STATEMENT_TIMEOUT)
+
+
+def statement_timeout_response(request: HttpRequest, exception: Exception) -> HttpResponse | None:
+    """503 вместо прерванного по statement_timeout запроса, для остальных ошибок None"""
+    if not is_statement_timeout(exception):
+        return None
+    view: str = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+    registry.inc(STATEMENT_TIMEOUTS_TOTAL, (('view', view),))
+    logger.warning('Statement timeout in %s %s (%s): %s', request.method, request.get_full_path(), view, exception)
+    return JsonResponse({'detail': 'The request took too long. Try narrowing it down.'}, status=503)
+
+
+class StatementTimeoutMiddleware:
+    """Ограничение берется по имени маршрута (view_statement_timeout)"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with ExitStack() as stack:
+            request.statement_timeout = stack
+            return self.get_response(request)
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        milliseconds: int = view_statement_timeout(request.resolver_match.view_name)
+        request.statement_timeout.enter_context(statement_timeout(milliseconds))
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> HttpResponse | None:
+        return statement_timeout_response(request, exception)
@@ -0,0 +1,125 @@
+import zlib
+from datetime import datetime
+from typing import Any, Iterable
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
+
+from todolist.goals.cache import bump_board_versions
+from todolist.goals.models import Board, BoardArchive, BoardParticipant, Goal, GoalArchive, GoalCategory, GoalComment
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder обрезает время до миллисекунд, в архиве храним его без потерь"""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def pack(objects: Iterable[models.Model]) -> bytes:
+    return zlib.compress(serializers.serialize('json', objects, cls=ArchiveJSONEncoder).encode())
+
+
+def unpack(payload: bytes) -> list:
+    return list(serializers.deserialize('json', zlib.decompress(bytes(payload))))
+
+
+def archive_goals(before: datetime, batch_size: int = 1000) -> int:
+    """Переносит одну пачку архивных целей, не менявшихся с даты before, в GoalArchive"""
+    with transaction.atomic():
+        goals: list[Goal] = list(
+            Goal.objects.select_for_update(skip_locked=True)
+            .filter(status=Goal.Status.archived, updated__lt=before)
+            .order_by('id')[:batch_size]
+        )
+        if not goals:
+            return 0
+
+        comments: dict[int, list[GoalComment]] = {goal.id: [] for goal in goals}
+        for comment in GoalComment.objects.filter(goal_id__in=comments).order_by('id'):
+            comments[comment.goal_id].append(comment)
+
+        GoalArchive.objects.bulk_create([
+            GoalArchive(
+                goal_id=goal.id,
+                board_id=goal.board_id,
+                title=goal.title,
+                board_deleted_status=goal.board_deleted_status,
+                payload=pack([goal, *comments[goal.id]]),
+            )
+            for goal in goals
+        ])
+        # Удаляем без сборщика каскадов и сигналов: строки уже прочитаны, версии досок обновляем сами
+        GoalComment.objects.filter(goal_id__in=comments)._raw_delete(GoalComment.objects.db)
+        Goal.objects.filter(id__in=comments)._raw_delete(Goal.objects.db)
+        bump_board_versions(*{goal.board_id for goal in goals})
+    return len(goals)
+
+
+def archive_boards(before: datetime) -> int:
+    """Переносит удаленные доски, в которых не осталось целей, в BoardArchive"""
+    archived: int = 0
+    boards = Board.objects.filter(is_deleted=True, updated__lt=before).exclude(categories__goals__isnull=False)
+    for board in boards.order_by('id').iterator():
+        with transaction.atomic():
+            participants = list(BoardParticipant.objects.filter(board=board))
+            categories = list(GoalCategory.objects.filter(board=board))
+            BoardArchive.objects.create(board_id=board.id, title=board.title,
+                                        payload=pack([board, *participants, *categories]))
+            # Цели досок к этому моменту уже в архиве, каскадные проверки не нужны
+            GoalCategory.objects.filter(board=board)._raw_delete(GoalCategory.objects.db)
+            BoardParticipant.objects.filter(board=board)._raw_delete(BoardParticipant.objects.db)
+            Board.objects.filter(id=board.id)._raw_delete(Board.objects.db)
+            bump_board_versions(board.id)
+        archived += 1
+    return archived
+
+
+def archived_owner_ids(archive: BoardArchive) -> set[int]:
+    return {
+        item.object.user_id
+        for item in unpack(archive.payload)
+        if isinstance(item.object, BoardParticipant) and item.object.role == BoardParticipant.Role.owner
+    }
+
+
+def restore_goal(archive: GoalArchive, status: int = Goal.Status.to_do) -> Goal:
+    """Возвращает цель с комментариями в горячие таблицы с исходными id и датами создания.
+    Если категории цели больше нет, поднимает GoalCategory.DoesNotExist"""
+    with transaction.atomic():
+        goal, *comments = unpack(archive.payload)
+        if not GoalCategory.objects.filter(id=goal.object.category_id, is_deleted=False).exists():
+            raise GoalCategory.DoesNotExist
+        goal.object.status = status
+        goal.object.board_deleted_status = None
+        # Сохранение raw не обновляет auto_now, а без нового updated Last-Modified списков
+        # остался бы прежним и клиент получил бы 304 без восстановленных строк
+        now = timezone.now()
+        for item in (goal, *comments):
+            item.object.updated = now
+            item.save()
+        archive.delete()
+    return goal.object
+
+
+def restore_board(archive: BoardArchive) -> Board:
+    """Возвращает доску, ее участников, категории и цели, ушедшие в архив вместе с доской,
+    с их статусами до удаления. Цели, архивированные раньше, остаются в архиве"""
+    with transaction.atomic():
+        board, *children = unpack(archive.payload)
+        board.object.is_deleted = False
+        now = timezone.now()
+        for item in (board, *children):
+            if isinstance(item.object, GoalCategory):
+                item.object.is_deleted = False
+            # Как и в restore_goal: иначе Last-Modified доски и ее списков не изменится
+            item.object.updated = now
+            item.save()
+        for goal_archive in GoalArchive.objects.filter(board_id=archive.board_id, board_deleted_status__isnull=False):
+            restore_goal(goal_archive, goal_archive.board_deleted_status)
+        archive.delete()
+    return board.object
@@ -0,0 +1,83 @@
+"""Группы целей по сроку: просроченные, со сроком на этой неделе и без срока.
+
+В группы попадают только незавершенные цели (к выполнению и в процессе), условия
+совпадают с частичным индексом goal_pending_due_date_idx по (status, due_date)."""
+import hashlib
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+from todolist.goals.cache import user_boards_scope
+from todolist.goals.models import Goal
+from todolist.goals.permissions import user_board_ids
+
+PENDING_STATUSES = (Goal.Status.to_do, Goal.Status.in_progress)
+
+
+class Bucket(models.TextChoices):
+    overdue = 'overdue', 'Просроченные'
+    due_this_week = 'due_this_week', 'Срок на этой неделе'
+    no_due_date = 'no_due_date', 'Без срока'
+
+
+def week_end(now: datetime) -> datetime:
+    """Начало следующего понедельника в текущей таймзоне"""
+    local: datetime = timezone.localtime(now)
+    monday: datetime = local.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=local.weekday())
+    return monday + timedelta(days=7)
+
+
+def bucket_condition(bucket: str, now: datetime | None = None) -> Q:
+    now = now or timezone.now()
+    pending = Q(status__in=PENDING_STATUSES)
+    match bucket:
+        case Bucket.overdue:
+            return pending & Q(due_date__lt=now)
+        case Bucket.due_this_week:
+            return pending & Q(due_date__gte=now, due_date__lt=week_end(now))
+        case Bucket.no_due_date:
+            return pending & Q(due_date__isnull=True)
+    raise ValueError(f'Unknown bucket: {bucket}')
+
+
+def goal_bucket(goal: Goal, now: datetime | None = None) -> str | None:
+    """Группа уже загруженной цели, без запроса к базе"""
+    if goal.status not in PENDING_STATUSES:
+        return None
+    if goal.due_date is None:
+        return Bucket.no_due_date
+    now = now or timezone.now()
+    if goal.due_date < now:
+        return Bucket.overdue
+    if goal.due_date < week_end(now):
+        return Bucket.due_this_week
+    return None
+
+
+def bucket_counts(queryset: QuerySet) -> dict[str, int]:
+    """Число целей в каждой группе одним агрегирующим запросом"""
+    now: datetime = timezone.now()
+    return queryset.aggregate(**{
+        bucket: Count('id', filter=bucket_condition(bucket, now)) for bucket in Bucket.values
+    })
+
+
+def get_user_bucket_counts(user_id: int) -> dict[str, int]:
+    """Счетчики групп по доступным пользователю целям. При GOALS_BUCKET_COUNTS_TIMEOUT > 0 кэшируются;
+    ключ зависит от версий досок пользователя, а таймаут ограничивает сдвиг групп со временем"""
+    queryset = Goal.objects.active().filter(board_id__in=user_board_ids(user_id))
+    timeout: int = settings.GOALS_BUCKET_COUNTS_TIMEOUT
+    if not timeout:
+        return bucket_counts(queryset)
+
+    digest: str = hashlib.md5(user_boards_scope(user_id).encode()).hexdigest()
+    key: str = f'goals:buckets:{user_id}:{digest}'
+    counts: dict[str, int] | None = cache.get(key)
+    if counts is None:
+        counts = bucket_counts(queryset)
+        cache.set(key, counts, timeout=timeout)
+    return counts
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from todolist.goals.models import BoardParticipant
+from todolist.metrics import SINGLE_FLIGHT_SHARED_TOTAL, registry
+
+SINGLE_FLIGHT_POLL_SECONDS = 0.05
+
+
+def board_version_key(board_id: int) -> str:
+    return f'goals:board-version:{board_id}'
+
+
+def get_board_versions(board_ids: Iterable[int]) -> dict[int, int]:
+    """Возвращает текущие версии досок. Отсутствующие в кэше версии инициализируются временем,
+    чтобы после вытеснения ключа не совпасть со старыми закэшированными ответами"""
+    keys: dict[str, int] = {board_version_key(board_id): board_id for board_id in board_ids}
+    versions: dict[str, int] = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def _bump(board_ids: tuple[int, ...]) -> None:
+    for board_id in board_ids:
+        try:
+            cache.incr(board_version_key(board_id))
+        except ValueError:
+            cache.add(board_version_key(board_id), time.time_ns(), timeout=None)
+
+
+def bump_board_versions(*board_ids: int) -> None:
+    """Инвалидирует закэшированные списки досок после коммита транзакции"""
+    board_ids = tuple({board_id for board_id in board_ids if board_id is not None})
+    if board_ids:
+        transaction.on_commit(lambda: _bump(board_ids))
+
+
+def user_boards_scope(user_id: int) -> str:
+    """Строка с версиями всех досок пользователя: меняется при любом изменении в них"""
+    board_ids: list[int] = sorted(
+        BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', flat=True)
+    )
+    versions: dict[int, int] = get_board_versions(board_ids)
+    return ':'.join(f'{board_id}={versions[board_id]}' for board_id in board_ids)
+
+
+class Flight:
+    """Вычисление, которое выполняется в процессе прямо сейчас"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.failed: bool = False
+
+
+_flights: dict[str, Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def _wait_for_other_process(key: str, wait: float) -> Any:
+    """Ждет результат процесса, который держит блокировку key. None - не дождались"""
+    deadline: float = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL_SECONDS)
+        result = cache.get(f'{key}:result')
+        if result is not None:
+            return result
+        if cache.get(f'{key}:lock') is None:
+            # Владелец блокировки завершился с ошибкой
+            return cache.get(f'{key}:result')
+    return None
+
+
+def _compute_once(key: str, compute: Callable[[], Any], wait: float) -> Any:
+    """Между процессами: первый взявший блокировку в кэше вычисляет и кладет результат в кэш"""
+    result = cache.get(f'{key}:result')
+    if result is not None:
+        return result
+    if not cache.add(f'{key}:lock', 1, timeout=max(int(wait), 1)):
+        result = _wait_for_other_process(key, wait)
+        if result is not None:
+            registry.inc(SINGLE_FLIGHT_SHARED_TOTAL, (('source', 'cache'),))
+            return result
+        return compute()
+    try:
+        result = compute()
+        cache.set(f'{key}:result', result, timeout=max(int(wait), 1))
+        return result
+    finally:
+        cache.delete(f'{key}:lock')
+
+
+def single_flight(key: str, compute: Callable[[], Any], wait: float) -> Any:
+    """Одновременные вызовы с одинаковым key выполняют compute один раз и получают общий результат.
+    Потоки процесса ждут Event, процессы - блокировку в кэше. Кто прождал дольше wait секунд
+    или чей лидер упал с ошибкой, вычисляет сам. Результат compute не должен изменяться"""
+    with _flights_lock:
+        flight: Flight | None = _flights.get(key)
+        leader: bool = flight is None
+        if leader:
+            flight = _flights[key] = Flight()
+
+    if not leader:
+        if flight.done.wait(wait) and not flight.failed:
+            registry.inc(SINGLE_FLIGHT_SHARED_TOTAL, (('source', 'thread'),))
+            return flight.result
+        return compute()
+
+    try:
+        flight.result = _compute_once(key, compute, wait)
+        return flight.result
+    except BaseException:
+        flight.failed = True
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+class CachedListMixin:
+    """Кэширует сериализованный ответ списка для пользователя.
+    Ключ зависит от параметров запроса и версий всех досок пользователя"""
+
+    def get_list_scope_digest(self) -> str:
+        """Список зависит только от досок пользователя, а не от него самого: участники одних
+        и тех же досок с одинаковыми параметрами получают одинаковый ответ"""
+        scope: str = ':'.join(map(str, (
+            self.request.accepted_media_type,
+            self.request.get_full_path(),
+            user_boards_scope(self.request.user.id),
+        )))
+        return hashlib.md5(scope.encode()).hexdigest()
+
+    def get_list_cache_key(self, digest: str) -> str:
+        return f'goals:list:{self.__class__.__name__}:{self.request.user.id}:{digest}'
+
+    def list(self, request, *args: Any, **kwargs: Any) -> Response:
+        timeout: int = settings.GOALS_LIST_CACHE_TIMEOUT
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        digest: str = self.get_list_scope_digest()
+        key: str = self.get_list_cache_key(digest)
+        data = cache.get(key)
+        if data is None:
+            def compute() -> Any:
+                return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+            if settings.GOALS_SINGLE_FLIGHT_WAIT_SECONDS:
+                data = single_flight(f'goals:flight:{self.__class__.__name__}:{digest}', compute,
+                                     settings.GOALS_SINGLE_FLIGHT_WAIT_SECONDS)
+            else:
+                data = compute()
+            cache.set(key, data, timeout=timeout)
+        return Response(data)
@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import Warning, register
+from django.utils.module_loading import import_string
+
+from todolist.goals.events import MemoryBroker, RedisBroker
+
+
+@register()
+def check_events_broker(app_configs: Any, **kwargs: Any) -> list[Warning]:
+    """MemoryBroker раздает события только внутри процесса, а публикуют их другие процессы"""
+    broker: type = import_string(settings.GOALS_EVENTS_BROKER)
+    if settings.DEBUG or not issubclass(broker, MemoryBroker) or issubclass(broker, RedisBroker):
+        return []
+    return [Warning(
+        'Board events are delivered only within one process',
+        hint='Set REDIS_URL so that GOALS_EVENTS_BROKER defaults to todolist.goals.events.RedisBroker',
+        id='goals.W001',
+    )]
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from threading import Lock
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 1.0
+
+
+class Subscription(ABC):
+    """Абстрактный класс подписки на канал доски"""
+
+    @abstractmethod
+    def put(self, message: dict) -> None:
+        """Метод для передачи сообщения подписчику"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self) -> dict:
+        """Метод ожидания следующего сообщения"""
+        raise NotImplementedError
+
+
+class Broker(ABC):
+    """Абстрактный класс брокера событий досок"""
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict) -> None:
+        """Метод для отправки сообщения всем подписчикам канала"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """Метод для подписки на канал"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def unsubscribe(self, channel: str, subscription: Subscription) -> None:
+        """Метод для отписки от канала"""
+        raise NotImplementedError
+
+
+class MemorySubscription(Subscription):
+    """Подписка внутри процесса: сообщения складываются в очередь event loop'а подписчика"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 100) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put_nowait(self, message: dict) -> None:
+        # Медленный клиент не должен копить события бесконечно: теряем самое старое
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    def put(self, message: dict) -> None:
+        """Публикация идет из потоков sync-вьюх, поэтому передаем сообщение через loop подписчика"""
+        try:
+            self.loop.call_soon_threadsafe(self._put_nowait, message)
+        except RuntimeError:
+            # event loop подписчика уже закрыт
+            pass
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class MemoryBroker(Broker):
+    """Брокер событий внутри одного процесса"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+
+    def publish(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = MemorySubscription(loop=asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel: str, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(channel)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[channel]
+
+
+class RedisBroker(MemoryBroker):
+    """Брокер между процессами через Redis pub/sub: API, бот и процессы SSE публикуют сообщения
+    в Redis. Каждый процесс SSE держит одно соединение, подписанное на каналы всех досок,
+    и раздает сообщения своим подписчикам так же, как MemoryBroker"""
+
+    def __init__(self) -> None:
+        if redis is None:
+            raise ImproperlyConfigured('RedisBroker requires the redis package')
+        super().__init__()
+        self._client = redis.Redis.from_url(settings.REDIS_URL)
+        self._listener: asyncio.Task | None = None
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._client.publish(channel, json.dumps(message))
+
+    def subscribe(self, channel: str) -> Subscription:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return super().subscribe(channel)
+
+    def dispatch(self, message: dict) -> None:
+        """Передает сообщение из Redis локальным подписчикам канала"""
+        if message['type'] == 'pmessage':
+            super().publish(message['channel'].decode(), json.loads(message['data']))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(board_channel('*'))
+                    async for message in pubsub.listen():
+                        self.dispatch(message)
+            except redis.RedisError:
+                # Пока соединения нет, подписчики получают только heartbeat
+                logger.exception('Board events listener lost connection to Redis')
+                await asyncio.sleep(RECONNECT_DELAY)
+
+
+_brokers: dict[str, Broker] = {}
+
+
+def get_broker() -> Broker:
+    """Возвращает брокер, указанный в настройке GOALS_EVENTS_BROKER"""
+    path: str = settings.GOALS_EVENTS_BROKER
+    if path not in _brokers:
+        _brokers[path] = import_string(path)()
+    return _brokers[path]
+
+
+def board_channel(board_id: int) -> str:
+    return f'board:{board_id}'
+
+
+def _publish(channel: str, message: dict) -> None:
+    # Данные уже закоммичены: ошибка брокера не должна превращать успешную запись в 500,
+    # иначе клиент повторит запрос, который уже выполнен. Подписчики пропустят одно событие
+    try:
+        get_broker().publish(channel, message)
+    except Exception:
+        logger.warning('Could not publish board event to %s', channel, exc_info=True)
+
+
+def publish_event(board_id: int, entity: str, action: str, pk: Any) -> None:
+    """Отправляет событие об изменении объекта доски после коммита транзакции"""
+    message: dict = {'board': board_id, 'entity': entity, 'action': action, 'id': pk}
+    transaction.on_commit(lambda: _publish(board_channel(board_id), message))
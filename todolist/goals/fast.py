@@ -0,0 +1,132 @@
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from todolist.metrics import serializer_timer
+
+Converter = Callable[[Any], Any]
+
+FAST_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _datetime_converter(field: serializers.DateTimeField) -> Converter:
+    """То же, что DateTimeField.to_representation, но с заранее вычисленными форматом и таймзоной"""
+    output_format: str | None = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() == ISO_8601:
+        return field.to_representation
+
+    field_timezone: tzinfo | None = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value: datetime) -> str:
+        value = value.astimezone(field_timezone)
+        # isoformat в разы быстрее strftime; годы до 1000 strftime не дополняет нулями
+        if output_format == FAST_DATETIME_FORMAT and value.year >= 1000:
+            return value.isoformat(' ', 'seconds')[:19]
+        return value.strftime(output_format)
+
+    return convert
+
+
+def _converter(field: serializers.Field) -> Converter:
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.ChoiceField):
+        choices: dict = field.choice_strings_to_values
+        return lambda value: choices.get(str(value), value)
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return _identity
+    if isinstance(field, (serializers.CharField, serializers.IntegerField, serializers.BooleanField)):
+        return field.to_representation
+    raise ImproperlyConfigured(f'{field.__class__.__name__} is not supported by FastSerializer')
+
+
+class FastSerializer:
+    """Read-only сериализация строк .values() без создания моделей и вызова to_representation
+    для каждого поля. Набор, порядок и формат полей повторяют исходный сериализатор"""
+
+    def __init__(self, serializer_class: type[serializers.Serializer], fields: frozenset[str] | None = None) -> None:
+        self.paths: list[str] = []
+        serializer: serializers.Serializer = serializer_class()
+        if fields is not None:
+            for name in set(serializer.fields) - fields:
+                serializer.fields.pop(name)
+        self.build_row: Callable[[dict], dict] = self._compile(serializer, prefix='')
+
+    def _add_path(self, path: str) -> str:
+        if path not in self.paths:
+            self.paths.append(path)
+        return path
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> Callable[[dict], dict]:
+        compiled: list[tuple[str, str, Callable, bool]] = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if field.source == '*':
+                raise ImproperlyConfigured(f'{field.field_name}: source="*" is not supported by FastSerializer')
+            path: str = self._add_path(prefix + field.source.replace('.', '__'))
+            if isinstance(field, serializers.BaseSerializer):
+                compiled.append((field.field_name, path, self._compile(field, prefix=f'{path}__'), True))
+            else:
+                compiled.append((field.field_name, path, _converter(field), False))
+
+        def build_row(row: dict) -> dict:
+            ret: dict = {}
+            for name, path, convert, is_nested in compiled:
+                value = row[path]
+                if value is None:
+                    ret[name] = None
+                else:
+                    ret[name] = convert(row) if is_nested else convert(value)
+            return ret
+
+        return build_row
+
+    def serialize(self, rows: Iterable[dict]) -> list[dict]:
+        build_row = self.build_row
+        with serializer_timer():
+            return [build_row(row) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _get_fast_serializer(serializer_class: type[serializers.Serializer], tz: tzinfo,
+                         fields: frozenset[str] | None) -> FastSerializer:
+    return FastSerializer(serializer_class, fields)
+
+
+def get_fast_serializer(serializer_class: type[serializers.Serializer],
+                        fields: frozenset[str] | None = None) -> FastSerializer:
+    """fields - набор полей из ?fields=/?omit=. Наборы задает клиент, поэтому кэш ограничен"""
+    return _get_fast_serializer(serializer_class, timezone.get_current_timezone(), fields)
+
+
+class FastListMixin:
+    """Отдает список через FastSerializer, если включена настройка GOALS_FAST_SERIALIZATION"""
+
+    def get_fast_list_serializer(self) -> FastSerializer:
+        return get_fast_serializer(self.get_serializer_class())
+
+    def list(self, request, *args: Any, **kwargs: Any) -> Response:
+        if not settings.GOALS_FAST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        fast: FastSerializer = self.get_fast_list_serializer()
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*fast.paths)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(queryset))
@@ -1,7 +1,10 @@
 import django_filters
 from django.db import models
+from django.db.models import F, OrderBy
 from django_filters import rest_framework
+from rest_framework import filters
 
+from todolist.goals.buckets import Bucket, bucket_condition
 from todolist.goals.models import Goal
 
 
@@ -18,4 +21,33 @@ class GoalDateFilter(rest_framework.FilterSet):
 
     filter_overrides = {
         models.DateTimeField: {'filter_class': django_filters.IsoDateTimeFilter},
-    }
\ No newline at end of file
+    }
+
+    bucket = django_filters.ChoiceFilter(choices=Bucket.choices, method='filter_bucket')
+
+    def filter_bucket(self, queryset, name: str, value: str):
+        return queryset.filter(bucket_condition(value))
+
+def ordering_expressions(ordering: list[str]) -> list[OrderBy]:
+    """NULL считается больше любого значения, как по умолчанию в Postgres, в любой базе:
+    без дедлайна цели идут последними при сортировке по возрастанию и первыми - по убыванию"""
+    return [
+        F(field[1:]).desc(nulls_first=True) if field.startswith('-') else F(field).asc(nulls_last=True)
+        for field in ordering
+    ]
+
+
+class GoalOrderingFilter(filters.OrderingFilter):
+    """Сортировка с последним полем id: порядок однозначен, что нужно для keyset-пагинации"""
+
+    def get_ordering(self, request, queryset, view) -> list[str]:
+        ordering: list[str] = super().get_ordering(request, queryset, view) or []
+        if ordering and not {'id', '-id'} & set(ordering):
+            ordering = [*ordering, 'id']
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        ordering: list[str] = self.get_ordering(request, queryset, view)
+        if ordering:
+            return queryset.order_by(*ordering_expressions(ordering))
+        return queryset
@@ -0,0 +1,31 @@
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from todolist.goals.archive import archive_boards, archive_goals
+
+
+class Command(BaseCommand):
+    """Переносит архивные цели и удаленные доски старше срока хранения в холодные таблицы.
+    Рассчитана на запуск по расписанию (cron); работает пачками, чтобы не держать долгих блокировок"""
+    help = 'Move archived goals and deleted boards to the archive tables'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--retention-days', type=int, default=settings.GOALS_ARCHIVE_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.1, help='Пауза между пачками в секундах')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        before = timezone.now() - timedelta(days=options['retention_days'])
+
+        goals: int = 0
+        while moved := archive_goals(before, batch_size=options['batch_size']):
+            goals += moved
+            time.sleep(options['pause'])
+        boards: int = archive_boards(before)
+
+        self.stdout.write(f'archived goals: {goals}, boards: {boards}')
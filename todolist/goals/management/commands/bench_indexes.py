@@ -0,0 +1,112 @@
+import random
+import time
+from typing import Any, Callable
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from todolist.core.models import User
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from todolist.goals.permissions import user_board_ids
+
+INDEXED_MODELS = (Board, BoardParticipant, GoalCategory, Goal, GoalComment)
+
+
+class Command(BaseCommand):
+    """Заполняет базу и сравнивает планы и время основных запросов списков
+    с индексами из Meta.indexes и без них. Все изменения откатываются после замера"""
+    help = 'Benchmark list queries with and without the goals partial indexes'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--boards', type=int, default=2000)
+        parser.add_argument('--goals-per-category', type=int, default=50)
+        parser.add_argument('--deleted-share', type=float, default=0.3, help='Доля удаленных досок и архивных целей')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--plans', action='store_true', help='Печатать EXPLAIN ANALYZE')
+
+    def _seed(self, options: dict) -> tuple[User, Goal]:
+        now = timezone.now()
+        deleted_share: float = options['deleted_share']
+        users = User.objects.bulk_create([User(username=f'bench-{time.time_ns()}-{i}') for i in range(50)])
+        boards = Board.objects.bulk_create([
+            Board(title=f'Board {i}', is_deleted=random.random() < deleted_share) for i in range(options['boards'])
+        ])
+        BoardParticipant.objects.bulk_create([
+            BoardParticipant(board=board, user=users[i % len(users)]) for i, board in enumerate(boards)
+        ])
+        categories = GoalCategory.objects.bulk_create([
+            GoalCategory(title=f'Category {i}', user=users[0], board=board, is_deleted=board.is_deleted)
+            for board in boards for i in range(3)
+        ])
+        goals = Goal.objects.bulk_create(
+            [
+                Goal(
+                    title=f'Goal {i}',
+                    category=category,
+                    board_id=category.board_id,
+                    user=users[0],
+                    status=Goal.Status.archived if random.random() < deleted_share else random.randint(1, 3),
+                    due_date=now,
+                )
+                for category in categories for i in range(options['goals_per_category'])
+            ],
+            batch_size=5000,
+        )
+        GoalComment.objects.bulk_create(
+            [GoalComment(goal=goals[0], board_id=goals[0].board_id, user=users[0], text=f'Comment {i}')
+             for i in range(1000)],
+        )
+        for model in INDEXED_MODELS:
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+        return users[0], goals[0]
+
+    @staticmethod
+    def _queries(user: User, goal: Goal) -> dict[str, QuerySet]:
+        return {
+            'boards': Board.objects.filter(participants__user_id=user.id, is_deleted=False).order_by('title')[:100],
+            'categories': GoalCategory.objects.filter(
+                board__participants__user_id=user.id, is_deleted=False,
+            ).order_by('title')[:100],
+            'goals': Goal.objects.active().filter(board_id__in=user_board_ids(user.id)).order_by('title')[:100],
+            'comments': GoalComment.objects.filter(goal_id=goal.id).order_by('-created')[:100],
+        }
+
+    @staticmethod
+    def _median_ms(query: Callable, repeat: int) -> float:
+        timings: list[float] = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2] * 1000
+
+    def _run(self, title: str, queries: dict[str, QuerySet], options: dict) -> dict[str, float]:
+        self.stdout.write(f'--- {title}')
+        result: dict[str, float] = {}
+        for name, queryset in queries.items():
+            result[name] = self._median_ms(lambda: list(queryset.all()), options['repeat'])
+            if options['plans']:
+                explain_options = {'analyze': True} if connection.vendor == 'postgresql' else {}
+                self.stdout.write(f'{name}:\n{queryset.explain(**explain_options)}')
+        return result
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            user, goal = self._seed(options)
+            queries = self._queries(user, goal)
+            after = self._run('with indexes', queries, options)
+
+            # DROP INDEX транзакционный и в Postgres, и в SQLite, поэтому откатится вместе с данными
+            with connection.cursor() as cursor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+            before = self._run('without indexes', queries, options)
+
+            self.stdout.write(f'{"query":<12} {"without, ms":>12} {"with, ms":>10}')
+            for name in queries:
+                self.stdout.write(f'{name:<12} {before[name]:>12.2f} {after[name]:>10.2f}')
+            transaction.set_rollback(True)
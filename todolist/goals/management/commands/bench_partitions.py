@@ -0,0 +1,61 @@
+import time
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from todolist.core.models import User
+from todolist.goals import partitioning
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory
+from todolist.goals.permissions import user_board_ids
+
+
+class Command(BaseCommand):
+    """Заполняет goals_goal через generate_series и замеряет запрос списка активных целей.
+    Запускать до и после "goals_partitions enable"; данные откатываются после замера"""
+    help = 'Benchmark the active goals list query on a large goals table (PostgreSQL)'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--rows', type=int, default=10_000_000)
+        parser.add_argument('--active-share', type=float, default=0.05, help='Доля неархивных целей')
+        parser.add_argument('--boards', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark requires PostgreSQL')
+
+        with transaction.atomic():
+            user = User.objects.create(username=f'bench-{time.time_ns()}')
+            boards = Board.objects.bulk_create([Board(title=f'bench {i}') for i in range(options['boards'])])
+            BoardParticipant.objects.bulk_create([BoardParticipant(board=board, user=user) for board in boards])
+            categories = GoalCategory.objects.bulk_create(
+                [GoalCategory(title='bench', user=user, board=board) for board in boards]
+            )
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'INSERT INTO goals_goal (title, category_id, board_id, user_id, status, priority, created, updated) '
+                    "SELECT 'Goal ' || n, (%s::bigint[])[1 + n %% %s], (%s::bigint[])[1 + n %% %s], %s, "
+                    'CASE WHEN random() < %s THEN 1 + n %% 3 ELSE 4 END, 1 + n %% 4, now(), now() '
+                    'FROM generate_series(1, %s) AS n',
+                    [[category.id for category in categories], len(categories),
+                     [category.board_id for category in categories], len(categories),
+                     user.id, options['active_share'], options['rows']],
+                )
+                cursor.execute('ANALYZE goals_goal')
+                is_partitioned = partitioning.is_partitioned(cursor, partitioning.GOAL_TABLE)
+            self.stdout.write(f'seeded {options["rows"]:,} goals in {time.perf_counter() - started:.1f}s '
+                              f'(partitioned: {is_partitioned})')
+
+            queryset = Goal.objects.active().filter(board_id__in=user_board_ids(user.id)).order_by('title')
+            for name, query in (('count', queryset.count), ('page', lambda: list(queryset[:100]))):
+                timings: list[float] = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    query()
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(f'{name}: best {min(timings) * 1000:.1f} ms, '
+                                  f'median {sorted(timings)[len(timings) // 2] * 1000:.1f} ms')
+            self.stdout.write(queryset[:100].explain(analyze=True, buffers=True))
+            transaction.set_rollback(True)
@@ -0,0 +1,99 @@
+import gzip
+import time
+from typing import Any, Callable
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from todolist.core.models import User
+from todolist.goals.fast import get_fast_serializer
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory
+from todolist.goals.serializers import GoalSerializer
+from todolist.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+
+
+class Command(BaseCommand):
+    """Сравнивает скорость сериализации списка целей через GoalSerializer и FastSerializer,
+    затем время кодирования и размер ответа в JSON, JSON+gzip (как nginx, gzip_comp_level 1)
+    и MessagePack, если он установлен. Данные создаются во временной транзакции и откатываются после замера"""
+    help = 'Benchmark goal list serialization: DRF ModelSerializer vs FastSerializer'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--sizes', default='100,1000,10000', help='Размеры страниц через запятую')
+        parser.add_argument('--repeat', type=int, default=3, help='Количество повторов каждого замера')
+        parser.add_argument('--gzip-level', type=int, default=1, help='Степень сжатия, по умолчанию как в nginx')
+
+    @staticmethod
+    def _seed(size: int) -> None:
+        user = User.objects.create(username=f'bench-{time.time_ns()}')
+        board = Board.objects.create(title='bench')
+        BoardParticipant.objects.create(board=board, user=user)
+        category = GoalCategory.objects.create(title='bench', user=user, board=board)
+        now = timezone.now()
+        Goal.objects.bulk_create(
+            [
+                Goal(
+                    title=f'Цель {i}',
+                    description='Описание ' * (i % 20),
+                    category=category,
+                    board=board,
+                    user=user,
+                    priority=i % 4 + 1,
+                    due_date=now if i % 3 else None,
+                )
+                for i in range(size)
+            ],
+            batch_size=5000,
+        )
+
+    @staticmethod
+    def _measure(func: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+        best, result = float('inf'), b''
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - started)
+        return best, result
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sizes: list[int] = [int(size) for size in options['sizes'].split(',')]
+        fast = get_fast_serializer(GoalSerializer)
+
+        with transaction.atomic():
+            self._seed(max(sizes))
+            self.stdout.write(f'{"rows":>8} {"drf rows/s":>14} {"fast rows/s":>14} {"speedup":>8}')
+            for size in sizes:
+                queryset = Goal.objects.order_by('id')[:size]
+                drf_time, drf_body = self._measure(
+                    lambda: JSONRenderer().render(GoalSerializer(queryset, many=True).data), options['repeat'],
+                )
+                fast_time, fast_body = self._measure(
+                    lambda: FastJSONRenderer().render(fast.serialize(queryset.values(*fast.paths))),
+                    options['repeat'],
+                )
+                if drf_body != fast_body:
+                    self.stderr.write(f'{size}: FastSerializer output differs from GoalSerializer')
+                self.stdout.write(
+                    f'{size:>8} {size / drf_time:>14,.0f} {size / fast_time:>14,.0f} {drf_time / fast_time:>7.1f}x'
+                )
+            self._compare_formats(sizes, fast, options)
+            transaction.set_rollback(True)
+
+    def _compare_formats(self, sizes: list[int], fast: Any, options: dict) -> None:
+        level: int = options['gzip_level']
+        formats: dict[str, Callable[[list], bytes]] = {
+            'json': FastJSONRenderer().render,
+            'json+gzip': lambda data: gzip.compress(FastJSONRenderer().render(data), compresslevel=level),
+        }
+        if msgpack is not None:
+            formats['msgpack'] = MessagePackRenderer().render
+            formats['msgpack+gzip'] = lambda data: gzip.compress(MessagePackRenderer().render(data),
+                                                                 compresslevel=level)
+        self.stdout.write(f'\n{"rows":>8} {"format":<14} {"encode, ms":>11} {"bytes":>12}')
+        for size in sizes:
+            data: list = fast.serialize(Goal.objects.order_by('id')[:size].values(*fast.paths))
+            for name, encode in formats.items():
+                elapsed, body = self._measure(lambda: encode(data), options['repeat'])
+                self.stdout.write(f'{size:>8} {name:<14} {elapsed * 1000:>11.2f} {len(body):>12,}')
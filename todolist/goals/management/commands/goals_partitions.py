@@ -0,0 +1,48 @@
+from datetime import date
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from todolist.goals import partitioning
+
+
+class Command(BaseCommand):
+    """Обслуживание партиций целей и комментариев:
+    - enable/disable -> перевод таблиц на партиционированное хранение и обратно
+    - create -> создание помесячных партиций комментариев заранее
+    - detach -> отсоединение (или удаление) партиций комментариев старше даты
+    - list -> список помесячных партиций"""
+    help = 'Maintain Postgres partitions of goals and comments'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('action', choices=('enable', 'disable', 'create', 'detach', 'list'))
+        parser.add_argument('--months', type=int, default=3, help='create: сколько месяцев создать наперед')
+        parser.add_argument('--before', type=date.fromisoformat, help='detach: дата в формате YYYY-MM-DD')
+        parser.add_argument('--drop', action='store_true', help='detach: удалить отсоединенные партиции')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is supported on PostgreSQL only')
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            action: str = options['action']
+            if action == 'enable':
+                partitioning.partition_tables(cursor)
+            elif action == 'disable':
+                partitioning.unpartition_tables(cursor)
+            elif not partitioning.is_partitioned(cursor, partitioning.COMMENT_TABLE):
+                raise CommandError('Comments table is not partitioned, run "goals_partitions enable" first')
+            elif action == 'create':
+                month: date = date.today().replace(day=1)
+                for _ in range(options['months'] + 1):
+                    self.stdout.write(partitioning.create_comment_partition(cursor, month))
+                    month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            elif action == 'detach':
+                if not options['before']:
+                    raise CommandError('--before is required for detach')
+                for name in partitioning.detach_comment_partitions(cursor, options['before'], options['drop']):
+                    self.stdout.write(name)
+            else:
+                for name, month in partitioning.list_comment_partitions(cursor):
+                    self.stdout.write(f'{name} {month:%Y-%m}')
@@ -0,0 +1,28 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from todolist.goals.ranks import categories_to_rebalance, rebalance_category
+
+
+class Command(BaseCommand):
+    """Укорачивает ключи ручного порядка целей в категориях, где они выросли после частых
+    перемещений, и раздает ключи целям, записанным в обход модели. Рассчитана на запуск по расписанию
+    (cron); каждая категория - отдельная короткая транзакция"""
+    help = 'Rebalance manual ordering ranks of goals'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--max-length', type=int, default=settings.GOALS_RANK_MAX_LENGTH)
+        parser.add_argument('--pause', type=float, default=0.01, help='Пауза между категориями в секундах')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        categories: int = 0
+        goals: int = 0
+        for category_id in categories_to_rebalance(options['max_length']).iterator():
+            goals += rebalance_category(category_id)
+            categories += 1
+            time.sleep(options['pause'])
+
+        self.stdout.write(f'rebalanced categories: {categories}, goals: {goals}')
@@ -0,0 +1,318 @@
+import io
+import random
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Sequence
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from todolist.core.models import User
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from todolist.goals.partitioning import refresh_comment_stats
+from todolist.goals.ranks import spread_ranks
+
+WORDS = (
+    'plan', 'read', 'write', 'call', 'buy', 'fix', 'review', 'learn', 'train', 'visit', 'book', 'report',
+    'project', 'budget', 'garden', 'trip', 'course', 'release', 'meeting', 'design', 'health', 'family',
+    'weekly', 'urgent', 'notes', 'backlog', 'draft', 'invoice', 'english', 'python', 'car', 'flat',
+)
+STATUS_WEIGHTS = {
+    Goal.Status.to_do: 40, Goal.Status.in_progress: 20, Goal.Status.done: 25, Goal.Status.archived: 15,
+}
+PRIORITY_WEIGHTS = {
+    Goal.Priority.low: 25, Goal.Priority.medium: 45, Goal.Priority.high: 20, Goal.Priority.critical: 10,
+}
+
+
+def zipf_cum_weights(size: int, exponent: float) -> list[float]:
+    """Накопленные веса закона Ципфа: первый элемент выбирается чаще всех"""
+    return list(accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def copy_csv_value(value: Any) -> str:
+    """Значение для COPY в формате csv: строки в кавычках, NULL - пустое значение без кавычек.
+    csv.QUOTE_NONNUMERIC записывает None как "", а это пустая строка, а не NULL"""
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class TableWriter:
+    """Пишет строки модели пачками: COPY в Postgres, executemany в остальных базах.
+    Значения передаются как есть, без pre_save, поэтому даты created/updated сохраняются"""
+
+    def __init__(self, model: type[models.Model], batch_size: int) -> None:
+        self.model = model
+        self.batch_size = batch_size
+        self.fields: list[models.Field] = list(model._meta.concrete_fields)
+        self.defaults: dict[str, Any] = {field.attname: field.get_default() for field in self.fields}
+        self.rows: list[tuple] = []
+
+    def add(self, **values: Any) -> None:
+        self.rows.append(tuple(
+            field.get_db_prep_save(values.get(field.attname, self.defaults[field.attname]), connection)
+            for field in self.fields
+        ))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        table: str = connection.ops.quote_name(self.model._meta.db_table)
+        columns: str = ', '.join(connection.ops.quote_name(field.column) for field in self.fields)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                buffer = io.StringIO()
+                buffer.writelines(','.join(map(copy_csv_value, row)) + '\n' for row in self.rows)
+                buffer.seek(0)
+                cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+            else:
+                placeholders: str = ', '.join(['%s'] * len(self.fields))
+                cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', self.rows)
+        self.rows = []
+
+
+class Command(BaseCommand):
+    """Генерирует пользователей, доски, участников, категории, цели и комментарии для нагрузочного
+    тестирования. Размеры досок и активность пользователей распределены по закону Ципфа: небольшая
+    часть пользователей владеет и участвует во множестве досок, а в нескольких досках собрана
+    большая часть целей. id выдаются заранее, поэтому строки пишутся COPY без возврата id.
+    COPY обходит сигналы, поэтому команда сама повторяет то, что делает приложение: раздает целям
+    ключи порядка в категориях, а цели удаленных категорий и досок переводит в архив"""
+    help = 'Generate users, boards, goals and comments at production scale'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--boards', type=int, default=10_000)
+        parser.add_argument('--goals', type=int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=300_000)
+        parser.add_argument('--username-prefix', default='seed-')
+        parser.add_argument('--password', default='seed', help='Пароль всех пользователей, хэшируется один раз')
+        parser.add_argument('--skew', type=float, default=0.8, help='Показатель закона Ципфа')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--random-seed', type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.random = random.Random(options['random_seed'])
+        self.batch_size: int = options['batch_size']
+        self.skew: float = options['skew']
+        self.now: datetime = timezone.now()
+
+        with transaction.atomic():
+            users: list[int] = self._timed('users', self._users, options)
+            boards: list[dict] = self._timed('boards', self._boards, options['boards'], users)
+            goals: tuple[int, array, array, array, array] = self._timed(
+                'goals', self._goals, options['goals'], boards,
+            )
+            self._timed('comments', self._comments, options['comments'], goals, boards)
+            self._timed('comment stats', self._comment_stats, goals[0])
+
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                        no_style(), [User, Board, BoardParticipant, GoalCategory, Goal, GoalComment]):
+                    cursor.execute(sql)
+
+    def _timed(self, title: str, method: Any, *args: Any) -> Any:
+        started: float = time.perf_counter()
+        result = method(*args)
+        self.stdout.write(f'{title}: {time.perf_counter() - started:.1f}s')
+        return result
+
+    @staticmethod
+    def _next_id(model: type[models.Model]) -> int:
+        return (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+    def _title(self) -> str:
+        return ' '.join(self.random.sample(WORDS, self.random.randint(2, 6))).capitalize()
+
+    def _moment(self, days: int, after: datetime | None = None, before: datetime | None = None) -> datetime:
+        """Случайный момент за последние days дней, не раньше after и не позже before"""
+        start: datetime = after or self.now - timedelta(days=days)
+        end: datetime = before or self.now
+        return start + (end - start) * self.random.random()
+
+    def _users(self, options: dict) -> list[int]:
+        writer = TableWriter(User, self.batch_size)
+        password: str = make_password(options['password'])
+        first_id: int = self._next_id(User)
+        for user_id in range(first_id, first_id + options['users']):
+            joined: datetime = self._moment(days=730)
+            writer.add(
+                id=user_id,
+                username=f'{options["username_prefix"]}{user_id}',
+                password=password,
+                date_joined=joined,
+                updated=joined,
+            )
+        writer.flush()
+        user_ids: list[int] = list(range(first_id, first_id + options['users']))
+        # Активные пользователи не должны совпадать с первыми id
+        self.random.shuffle(user_ids)
+        return user_ids
+
+    def _boards(self, count: int, users: list[int]) -> list[dict]:
+        """Возвращает доски с участниками-редакторами и категориями: id, момент удаления (или now),
+        признак удаления. Категории удаленной доски удалены вместе с ней, как в BoardView.perform_destroy"""
+        board_writer = TableWriter(Board, self.batch_size)
+        participant_writer = TableWriter(BoardParticipant, self.batch_size)
+        category_writer = TableWriter(GoalCategory, self.batch_size)
+        user_weights: list[float] = zipf_cum_weights(len(users), self.skew)
+        next_category_id: int = self._next_id(GoalCategory)
+        next_participant_id: int = self._next_id(BoardParticipant)
+        first_id: int = self._next_id(Board)
+
+        boards: list[dict] = []
+        for board_id in range(first_id, first_id + count):
+            created: datetime = self._moment(days=365)
+            is_deleted: bool = self.random.random() < 0.05
+            updated: datetime = self._moment(days=365, after=created)
+            board_writer.add(id=board_id, title=self._title(), is_deleted=is_deleted,
+                             created=created, updated=updated)
+            # Удаленная доска менялась последний раз при удалении: после него в ней ничего не появляется
+            board_until: datetime = updated if is_deleted else self.now
+
+            members_count: int = min(int(self.random.paretovariate(1.5)), 30)
+            members: list[int] = list(dict.fromkeys(self.random.choices(users, cum_weights=user_weights,
+                                                                        k=members_count)))
+            roles: list[int] = [BoardParticipant.Role.owner] + [
+                self.random.choice((BoardParticipant.Role.writer, BoardParticipant.Role.reader))
+                for _ in members[1:]
+            ]
+            for user_id, role in zip(members, roles):
+                participant_writer.add(id=next_participant_id, board_id=board_id, user_id=user_id, role=role,
+                                       created=created, updated=created)
+                next_participant_id += 1
+
+            writers: list[int] = [user_id for user_id, role in zip(members, roles)
+                                  if role != BoardParticipant.Role.reader]
+            categories: list[tuple[int, datetime, bool]] = []
+            for _ in range(min(int(self.random.paretovariate(1.2)), 20)):
+                category_deleted: bool = is_deleted or self.random.random() < 0.03
+                category_until: datetime = board_until
+                if category_deleted and not is_deleted:
+                    category_until = self._moment(days=365, after=created)
+                category_writer.add(id=next_category_id, board_id=board_id, title=self._title(),
+                                    user_id=self.random.choice(writers), is_deleted=category_deleted,
+                                    created=created, updated=category_until if category_deleted else created)
+                categories.append((next_category_id, category_until, category_deleted))
+                next_category_id += 1
+            boards.append({'id': board_id, 'created': created, 'is_deleted': is_deleted, 'writers': writers,
+                           'members': members, 'categories': categories})
+
+        for writer in (board_writer, participant_writer, category_writer):
+            writer.flush()
+        return boards
+
+    def _goals(self, count: int, boards: list[dict]) -> tuple[int, array, array, array, array]:
+        """Возвращает первый id целей и для каждой цели индекс ее доски, автора, время создания
+        и время, после которого цель не менялась (удаление категории или доски, иначе now)"""
+        writer = TableWriter(Goal, self.batch_size)
+        order: list[int] = list(range(len(boards)))
+        self.random.shuffle(order)
+        board_weights: list[float] = zipf_cum_weights(len(order), self.skew)
+        statuses: Sequence[int] = list(STATUS_WEIGHTS)
+        status_weights: list[int] = list(accumulate(STATUS_WEIGHTS.values()))
+        priorities: Sequence[int] = list(PRIORITY_WEIGHTS)
+        priority_weights: list[int] = list(accumulate(PRIORITY_WEIGHTS.values()))
+        goal_boards, goal_users, goal_created, goal_until = array('l'), array('l'), array('d'), array('d')
+
+        # Доска и категория выбираются заранее: ключи порядка раздаются по числу целей категории
+        goal_categories: array = array('l')
+        for start in range(0, count, self.batch_size):
+            for board_index in self.random.choices(order, cum_weights=board_weights,
+                                                   k=min(self.batch_size, count - start)):
+                goal_boards.append(board_index)
+                goal_categories.append(self.random.randrange(len(boards[board_index]['categories'])))
+        category_sizes: Counter = Counter(
+            boards[board_index]['categories'][category_index][0]
+            for board_index, category_index in zip(goal_boards, goal_categories)
+        )
+        ranks: dict[int, list[str]] = {}
+
+        first_id: int = self._next_id(Goal)
+        for goal_id, board_index, category_index in zip(range(first_id, first_id + count), goal_boards,
+                                                        goal_categories):
+            board: dict = boards[board_index]
+            category_id, until, category_deleted = board['categories'][category_index]
+            user_id: int = self.random.choice(board['writers'])
+            created: datetime = self._moment(days=365, after=board['created'], before=until)
+            status: int = self.random.choices(statuses, cum_weights=status_weights)[0]
+            updated: datetime = self._moment(days=365, after=created, before=until)
+            board_deleted_status: int | None = None
+            if category_deleted and status != Goal.Status.archived:
+                # Удаление категории или доски переводит цели в архив, доска запоминает их статус
+                if board['is_deleted']:
+                    board_deleted_status = status
+                status, updated = Goal.Status.archived, until
+            if category_id not in ranks:
+                ranks[category_id] = spread_ranks(category_sizes[category_id])[::-1]
+            writer.add(
+                id=goal_id,
+                title=self._title(),
+                description=self._title() if self.random.random() < 0.5 else None,
+                category_id=category_id,
+                board_id=board['id'],
+                status=status,
+                board_deleted_status=board_deleted_status,
+                priority=self.random.choices(priorities, cum_weights=priority_weights)[0],
+                due_date=self.now + timedelta(days=self.random.uniform(-30, 60)) if self.random.random() < 0.6 else None,
+                user_id=user_id,
+                created=created,
+                updated=updated,
+                rank=ranks[category_id].pop(),
+            )
+            goal_users.append(user_id)
+            goal_created.append(created.timestamp())
+            goal_until.append(until.timestamp())
+        writer.flush()
+        return first_id, goal_boards, goal_users, goal_created, goal_until
+
+    def _comments(self, count: int, goals: tuple[int, array, array, array, array], boards: list[dict]) -> None:
+        first_goal_id, goal_boards, goal_users, goal_created, goal_until = goals
+        if not goal_boards:
+            return
+        writer = TableWriter(GoalComment, self.batch_size)
+        goal_weights: list[float] = zipf_cum_weights(len(goal_boards), self.skew)
+        first_id: int = self._next_id(GoalComment)
+        comment_id: int = first_id
+        while comment_id < first_id + count:
+            size: int = min(self.batch_size, first_id + count - comment_id)
+            for index in self.random.choices(range(len(goal_boards)), cum_weights=goal_weights, k=size):
+                goal_created_at = datetime.fromtimestamp(goal_created[index], tz=self.now.tzinfo)
+                goal_until_at = datetime.fromtimestamp(goal_until[index], tz=self.now.tzinfo)
+                created: datetime = self._moment(days=365, after=goal_created_at, before=goal_until_at)
+                members: list[int] = boards[goal_boards[index]]['members']
+                writer.add(
+                    id=comment_id,
+                    goal_id=first_goal_id + index,
+                    board_id=boards[goal_boards[index]]['id'],
+                    user_id=goal_users[index] if self.random.random() < 0.6 else self.random.choice(members),
+                    text=self._title(),
+                    created=created,
+                    updated=created,
+                )
+                comment_id += 1
+        writer.flush()
+
+    @staticmethod
+    def _comment_stats(first_goal_id: int) -> None:
+        """comments_count и last_comment новых целей: COPY пишет комментарии в обход сигналов"""
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                refresh_comment_stats(
+                    cursor, f'SELECT DISTINCT goal_id FROM {GoalComment._meta.db_table} WHERE goal_id >= %s',
+                    [first_goal_id],
+                )
+        else:
+            Goal.objects.filter(id__gte=first_goal_id, id__in=GoalComment.objects.values('goal_id')).refresh_comment_stats()
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from todolist.goals import partitioning
+
+# Столбцы на момент этой миграции: board_id добавляет 0010, уже в партиционированные таблицы
+GOAL_FOREIGN_KEYS = (('category_id', 'goals_goalcategory'), ('user_id', 'core_user'))
+COMMENT_FOREIGN_KEYS = (('user_id', 'core_user'),)
+
+
+def partition_tables(apps, schema_editor) -> None:
+    if partitioning.is_enabled(schema_editor.connection):
+        with schema_editor.connection.cursor() as cursor:
+            partitioning.partition_tables(cursor, GOAL_FOREIGN_KEYS, COMMENT_FOREIGN_KEYS)
+
+
+def unpartition_tables(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            partitioning.unpartition_tables(cursor, GOAL_FOREIGN_KEYS, COMMENT_FOREIGN_KEYS)
+
+
+class Migration(migrations.Migration):
+    """Партиционирование включается настройкой GOALS_PARTITIONING (только Postgres).
+    Для уже развернутой базы используйте manage.py goals_partitions enable"""
+
+    dependencies = [
+        ('goals', '0004_alter_goal_due_date_alter_goalcategory_board'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0005_partition_goals_and_comments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.BigIntegerField(unique=True, verbose_name='ID доски')),
+                ('title', models.CharField(max_length=255, verbose_name='Название')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата переноса в архив')),
+                ('payload', models.BinaryField(verbose_name='Данные')),
+            ],
+            options={
+                'verbose_name': 'Архивная доска',
+                'verbose_name_plural': 'Архивные доски',
+            },
+        ),
+        migrations.CreateModel(
+            name='GoalArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('goal_id', models.BigIntegerField(unique=True, verbose_name='ID цели')),
+                ('board_id', models.BigIntegerField(db_index=True, verbose_name='ID доски')),
+                ('title', models.CharField(max_length=255, verbose_name='Название')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата переноса в архив')),
+                ('payload', models.BinaryField(verbose_name='Данные')),
+            ],
+            options={
+                'verbose_name': 'Архивная цель',
+                'verbose_name_plural': 'Архивные цели',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0006_goalarchive_boardarchive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['title'], name='board_alive_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boardparticipant',
+            index=models.Index(fields=['user', 'board', 'role'], name='participant_user_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2, 3])), fields=['category', 'title'], name='goal_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'title'], name='category_alive_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcomment',
+            index=models.Index(fields=['goal', '-created'], name='comment_goal_created_idx'),
+        ),
+    ]
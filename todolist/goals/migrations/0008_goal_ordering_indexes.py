@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0007_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2, 3])), fields=['-priority', 'due_date', 'id'], name='goal_active_priority_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2, 3])), fields=['due_date', 'id'], name='goal_active_due_date_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_goal_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2])), fields=['status', 'due_date'], name='goal_pending_due_date_idx'),
+        ),
+    ]
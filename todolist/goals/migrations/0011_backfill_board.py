@@ -0,0 +1,34 @@
+from django.db import migrations, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 10_000
+
+
+def _backfill(model, source, link: str, using: str) -> None:
+    """Заполняет board_id диапазонами id, каждый диапазон - отдельная короткая транзакция"""
+    board_id = Subquery(source.objects.filter(id=OuterRef(link)).values('board_id')[:1])
+    last_id: int = model.objects.using(using).aggregate(last_id=Max('id'))['last_id'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=using):
+            model.objects.using(using).filter(
+                id__gte=start, id__lt=start + BATCH_SIZE, board__isnull=True,
+            ).update(board_id=board_id)
+
+
+def backfill_board(apps, schema_editor) -> None:
+    using: str = schema_editor.connection.alias
+    # Сначала цели: комментарии берут board_id у своей цели
+    _backfill(apps.get_model('goals', 'Goal'), apps.get_model('goals', 'GoalCategory'), 'category_id', using)
+    _backfill(apps.get_model('goals', 'GoalComment'), apps.get_model('goals', 'Goal'), 'goal_id', using)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0010_goal_board_goalcomment_board'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+    ]
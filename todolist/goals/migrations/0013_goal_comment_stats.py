@@ -0,0 +1,24 @@
+# Generated by Django 4.1.13 on 2026-10-19 16:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0012_board_not_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='goal',
+            name='last_comment',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='goals.goalcomment', verbose_name='Последний комментарий'),
+        ),
+    ]
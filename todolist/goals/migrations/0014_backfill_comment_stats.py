@@ -0,0 +1,34 @@
+from django.db import migrations, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 10_000
+
+
+def backfill_comment_stats(apps, schema_editor) -> None:
+    """Заполняет счетчики диапазонами id целей, каждый диапазон - отдельная короткая транзакция"""
+    using: str = schema_editor.connection.alias
+    Goal = apps.get_model('goals', 'Goal')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+    comments = GoalComment.objects.using(using).filter(goal_id=OuterRef('id')).order_by()
+    last_id: int = Goal.objects.using(using).aggregate(last_id=Max('id'))['last_id'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=using):
+            Goal.objects.using(using).filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+                comments_count=Coalesce(
+                    Subquery(comments.values('goal_id').annotate(count=Count('id')).values('count')), 0,
+                ),
+                last_comment_id=Subquery(comments.order_by('-created', '-id').values('id')[:1]),
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0013_goal_comment_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-19 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0014_backfill_comment_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='Порядок'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from itertools import groupby
+
+from django.db import migrations, transaction
+
+from todolist.goals.ranks import spread_ranks
+
+BATCH_SIZE = 1000
+
+
+def backfill_rank(apps, schema_editor) -> None:
+    """Исходный ручной порядок совпадает с порядком списка по умолчанию (по названию).
+    Пачки по BATCH_SIZE категорий, каждая пачка - отдельная короткая транзакция"""
+    using: str = schema_editor.connection.alias
+    Goal = apps.get_model('goals', 'Goal')
+    GoalCategory = apps.get_model('goals', 'GoalCategory')
+    category_ids: list[int] = list(GoalCategory.objects.using(using).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(category_ids), BATCH_SIZE):
+        with transaction.atomic(using=using):
+            goals = (
+                Goal.objects.using(using)
+                .filter(category_id__in=category_ids[start:start + BATCH_SIZE])
+                .order_by('category_id', 'title', 'id')
+                .only('id', 'category_id')
+            )
+            updated = []
+            for _, category_goals in groupby(goals, key=lambda goal: goal.category_id):
+                category_goals = list(category_goals)
+                for goal, rank in zip(category_goals, spread_ranks(len(category_goals))):
+                    goal.rank = rank
+                updated.extend(category_goals)
+            Goal.objects.using(using).bulk_update(updated, ['rank'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0015_goal_rank'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rank, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0016_backfill_goal_rank'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2, 3])), fields=['category', 'rank', 'id'], name='goal_active_category_rank_idx'),
+        ),
+    ]
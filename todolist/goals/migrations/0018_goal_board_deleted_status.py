@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+TO_DO = 1
+ARCHIVED = 4
+
+
+def mark_deleted_boards(apps, schema_editor) -> None:
+    """До этой миграции доска восстанавливалась со всеми архивными целями в статусе to_do.
+    Для уже удаленных досок прежний статус неизвестен, поэтому сохраняем это поведение"""
+    using: str = schema_editor.connection.alias
+    Board = apps.get_model('goals', 'Board')
+    BoardArchive = apps.get_model('goals', 'BoardArchive')
+    Goal = apps.get_model('goals', 'Goal')
+    GoalArchive = apps.get_model('goals', 'GoalArchive')
+    Goal.objects.using(using).filter(board__is_deleted=True, status=ARCHIVED).update(board_deleted_status=TO_DO)
+    GoalArchive.objects.using(using).filter(
+        models.Q(board_id__in=Board.objects.using(using).filter(is_deleted=True).values('id'))
+        | models.Q(board_id__in=BoardArchive.objects.using(using).values('board_id'))
+    ).update(board_deleted_status=TO_DO)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0017_goal_rank_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board_deleted_status',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')], null=True, verbose_name='Статус до удаления доски'),
+        ),
+        migrations.AddField(
+            model_name='goalarchive',
+            name='board_deleted_status',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')], null=True, verbose_name='Статус до удаления доски'),
+        ),
+        migrations.RunPython(mark_deleted_boards, migrations.RunPython.noop),
+    ]
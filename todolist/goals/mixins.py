@@ -0,0 +1,178 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Callable
+
+from django.db.models import Count, F, Max, OrderBy, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from todolist.core.models import User
+from todolist.core.serializers import ProfileSerializer
+from todolist.goals.fast import FastSerializer, get_fast_serializer
+
+
+def get_include(request: Request) -> set[str]:
+    """Дополнительные части ответа из ?include=a,b"""
+    return {item.strip() for item in request.query_params.get('include', '').split(',') if item.strip()}
+
+
+class ConditionalGetMixin:
+    """Добавляет ETag/Last-Modified и отвечает 304, если данные клиента актуальны"""
+
+    def get_etag(self, *validators: Any) -> str:
+        key: str = ':'.join(map(str, (
+            self.request.user.id,
+            self.request.accepted_media_type,
+            self.request.get_full_path(),
+            *validators,
+        )))
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def conditional_response(self, validators: tuple, last_modified: datetime | None,
+                             build: Callable[[], Response]) -> Any:
+        """Сериализатор запускается только если клиенту нужен новый ответ"""
+        etag: str = self.get_etag(*validators)
+        timestamp: int | None = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Валидаторы списка: max(updated) и количество строк отфильтрованного queryset одним запросом"""
+
+    def get_validator_aggregates(self) -> dict:
+        return {'last_modified': Max('updated'), 'count': Count('pk')}
+
+    def list(self, request, *args: Any, **kwargs: Any) -> Any:
+        aggregate: dict = self.filter_queryset(self.get_queryset()).aggregate(**self.get_validator_aggregates())
+        last_modified: datetime | None = max(
+            (value for value in aggregate.values() if isinstance(value, datetime)), default=None)
+        return self.conditional_response(
+            tuple(aggregate.values()),
+            last_modified,
+            lambda: super(ConditionalListMixin, self).list(request, *args, **kwargs),
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Валидаторы объекта: время его последнего обновления"""
+
+    def get_validators(self, instance: Any) -> tuple[tuple, datetime | None]:
+        return (instance.pk, instance.updated), instance.updated
+
+    def retrieve(self, request, *args: Any, **kwargs: Any) -> Any:
+        instance = self.get_object()
+        validators, last_modified = self.get_validators(instance)
+        return self.conditional_response(
+            validators,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+
+class AuthorValidatorsMixin:
+    """Ответ включает профиль автора (ProfileSerializer): время его изменения входит в валидаторы.
+    Стоит перед ConditionalListMixin или ConditionalRetrieveMixin"""
+
+    def get_validator_aggregates(self) -> dict:
+        return {**super().get_validator_aggregates(), 'user_modified': Max('user__updated')}
+
+    def get_validators(self, instance: Any) -> tuple[tuple, datetime | None]:
+        validators, last_modified = super().get_validators(instance)
+        user_modified: datetime = instance.user.updated
+        return (*validators, user_modified), max(filter(None, (last_modified, user_modified)))
+
+
+class SparseFieldsMixin:
+    """GET-параметры ?fields=a,b и ?omit=c: оставляют в ответе только нужные поля сериализатора
+    и откладывают (defer) чтение остальных колонок модели, например длинного description.
+    Колонки сортировки и updated (валидатор ConditionalGetMixin) читаются всегда"""
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+    sparse_required_fields = ('updated',)
+
+    def _query_param_set(self, name: str) -> set[str]:
+        return {item.strip() for item in self.request.query_params.get(name, '').split(',') if item.strip()}
+
+    def get_sparse_fields(self) -> frozenset[str] | None:
+        """Имена выводимых полей или None, если ответ не сокращается"""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields: frozenset[str] | None = None
+            fields, omit = self._query_param_set(self.fields_query_param), self._query_param_set(self.omit_query_param)
+            if self.request.method in permissions.SAFE_METHODS and (fields or omit):
+                available: set[str] = {
+                    name for name, field in self.get_serializer_class()().fields.items() if not field.write_only
+                }
+                if unknown := (fields | omit) - available:
+                    raise ValidationError({'fields': f'Unknown fields: {", ".join(sorted(unknown))}'})
+                self._sparse_fields = frozenset((fields or available) - omit)
+        return self._sparse_fields
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> serializers.BaseSerializer:
+        serializer = super().get_serializer(*args, **kwargs)
+        fields: frozenset[str] | None = self.get_sparse_fields()
+        if fields is not None:
+            target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            for name in set(target.fields) - fields:
+                target.fields.pop(name)
+        return serializer
+
+    def get_fast_list_serializer(self) -> FastSerializer:
+        return get_fast_serializer(self.get_serializer_class(), self.get_sparse_fields())
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        fields: frozenset[str] | None = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        serializer_fields: dict = self.get_serializer_class()().fields
+        needed: set[str] = {serializer_fields[name].source.split('.')[0] for name in fields}
+        needed.update(self.sparse_required_fields)
+        for item in queryset.query.order_by:
+            if isinstance(item, str):
+                needed.add(item.lstrip('-'))
+            elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+                needed.add(item.expression.name)
+        # Внешние ключи не откладываются: они нужны select_related и стоят одну колонку
+        deferred: list[str] = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation and field.name not in needed
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class SideloadUsersMixin:
+    """?include=users: строки содержат user_id, а профили авторов приходят один раз в словаре
+    users по id, загруженном одним запросом IN. Ответ без пагинации становится {"results", "users"}.
+    Стоит после CachedListMixin, чтобы в кэш попадал ответ вместе с users"""
+    sideload_serializer_class: type[serializers.Serializer]
+
+    def include_users(self) -> bool:
+        return 'users' in get_include(self.request)
+
+    def get_serializer_class(self) -> type[serializers.Serializer]:
+        if self.include_users():
+            return self.sideload_serializer_class
+        return super().get_serializer_class()
+
+    def list(self, request, *args: Any, **kwargs: Any) -> Response:
+        response: Response = super().list(request, *args, **kwargs)
+        if not self.include_users():
+            return response
+
+        data: dict = response.data if isinstance(response.data, dict) else {'results': response.data}
+        user_ids: set[int] = {row['user_id'] for row in data['results'] if row.get('user_id') is not None}
+        users = User.objects.filter(id__in=user_ids).order_by('id') if user_ids else User.objects.none()
+        # Ключи строками: так их отдает JSON, и кэшированный ответ не отличается от свежего
+        data['users'] = {str(user['id']): user for user in ProfileSerializer(users, many=True).data}
+        return Response(data)
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 
 from todolist.core.models import User
 
@@ -15,6 +16,9 @@ class Board(BaseModel):
     class Meta:
         verbose_name = 'Доска'
         verbose_name_plural = 'Доски'
+        indexes = [
+            models.Index(fields=['title'], name='board_alive_title_idx', condition=models.Q(is_deleted=False)),
+        ]
 
     title = models.CharField(verbose_name='Название', max_length=255)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
@@ -46,6 +50,10 @@ class BoardParticipant(BaseModel):
         unique_together = ('board', 'user')
         verbose_name = 'Участник'
         verbose_name_plural = 'Участники'
+        indexes = [
+            # Все проверки видимости ищут доски пользователя, unique_together начинается с board_id
+            models.Index(fields=['user', 'board', 'role'], name='participant_user_board_idx'),
+        ]
 
 
 class GoalCategory(BaseModel):
@@ -59,11 +67,33 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(fields=['board', 'title'], name='category_alive_board_idx', condition=models.Q(is_deleted=False)),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class GoalQuerySet(models.QuerySet):
+    def active(self) -> 'GoalQuerySet':
+        """ Неархивные цели. Условие IN по статусу позволяет Postgres читать только горячую
+        партицию goals_goal_active, если включено партиционирование. """
+        return self.filter(status__in=Goal.ACTIVE_STATUSES)
+
+    def refresh_comment_stats(self) -> int:
+        """ Пересчитывает comments_count и last_comment одним UPDATE с подзапросами
+        по индексу comment_goal_created_idx. """
+        comments = GoalComment.objects.filter(goal_id=models.OuterRef('id')).order_by()
+        return self.update(
+            comments_count=Coalesce(
+                models.Subquery(comments.values('goal_id').annotate(count=models.Count('id')).values('count')),
+                0,
+            ),
+            last_comment_id=models.Subquery(comments.order_by('-created', '-id').values('id')[:1]),
+        )
+
+
 class Goal(BaseModel):
     class Status(models.IntegerChoices):
         to_do = 1, 'К выполнению'
@@ -71,6 +101,8 @@ class Goal(BaseModel):
         done = 3, 'Выполнено'
         archived = 4, 'Архив'
 
+    ACTIVE_STATUSES = (Status.to_do, Status.in_progress, Status.done)
+
     class Priority(models.IntegerChoices):
         low = 1, 'Низкий'
         medium = 2, 'Средний'
@@ -97,10 +129,65 @@ class Goal(BaseModel):
     )
     due_date = models.DateTimeField(verbose_name='Дедлайн', null=True, blank=True)
     user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='goals')
+    # Копия category.board_id: проверка доступа соединяет цели сразу с участниками доски.
+    # Заполняется сигналом pre_save при создании и переносе цели в другую категорию
+    board = models.ForeignKey(Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='goals')
+    # Счетчик и последний комментарий для списка целей, пересчитываются сигналами комментариев.
+    # Внешний ключ без ограничения: у партиционированных комментариев первичный ключ (id, created)
+    comments_count = models.PositiveIntegerField(verbose_name='Количество комментариев', default=0)
+    last_comment = models.ForeignKey(
+        'GoalComment', verbose_name='Последний комментарий', on_delete=models.DO_NOTHING, related_name='+',
+        null=True, blank=True, db_constraint=False, db_index=False,
+    )
+    # Ручной порядок в категории (todolist.goals.ranks): задается при создании и переносе цели
+    rank = models.CharField(verbose_name='Порядок', max_length=255, blank=True, default='')
+    # Статус цели до удаления ее доски: при восстановлении доски возвращаются только такие цели
+    board_deleted_status = models.PositiveSmallIntegerField(
+        verbose_name='Статус до удаления доски', choices=Status.choices, null=True, blank=True,
+    )
+
+    objects = GoalQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        indexes = [
+            # Условие совпадает с GoalQuerySet.active(): status IN ACTIVE_STATUSES
+            models.Index(
+                fields=['category', 'title'],
+                name='goal_active_category_idx',
+                condition=models.Q(status__in=[1, 2, 3]),
+            ),
+            models.Index(
+                fields=['board', 'title'],
+                name='goal_active_board_idx',
+                condition=models.Q(status__in=[1, 2, 3]),
+            ),
+            # Сортировки списка по -priority,due_date (и обратной) и по due_date;
+            # id - последнее поле ключа keyset-пагинации
+            models.Index(
+                fields=['-priority', 'due_date', 'id'],
+                name='goal_active_priority_due_idx',
+                condition=models.Q(status__in=[1, 2, 3]),
+            ),
+            models.Index(
+                fields=['due_date', 'id'],
+                name='goal_active_due_date_idx',
+                condition=models.Q(status__in=[1, 2, 3]),
+            ),
+            # Ручной порядок целей категории: ?category=<id>&ordering=rank
+            models.Index(
+                fields=['category', 'rank', 'id'],
+                name='goal_active_category_rank_idx',
+                condition=models.Q(status__in=[1, 2, 3]),
+            ),
+            # Группы по сроку (todolist.goals.buckets): незавершенные цели по статусу и дедлайну
+            models.Index(
+                fields=['status', 'due_date'],
+                name='goal_pending_due_date_idx',
+                condition=models.Q(status__in=[1, 2]),
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -109,11 +196,54 @@ class Goal(BaseModel):
 class GoalComment(BaseModel):
     user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='comments')
     goal = models.ForeignKey(Goal, verbose_name='Цель', on_delete=models.CASCADE, related_name='comments')
+    # Копия goal.board_id, обновляется вместе с целью при ее переносе на другую доску
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='comments', db_index=False,
+    )
     text = models.TextField(verbose_name='Текст')
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['goal', '-created'], name='comment_goal_created_idx'),
+            models.Index(fields=['board', '-created'], name='comment_board_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.text
+
+
+class GoalArchive(models.Model):
+    """Холодное хранилище архивных целей: цель и ее комментарии в сжатом JSON"""
+    goal_id = models.BigIntegerField(verbose_name='ID цели', unique=True)
+    board_id = models.BigIntegerField(verbose_name='ID доски', db_index=True)
+    title = models.CharField(verbose_name='Название', max_length=255)
+    archived_at = models.DateTimeField(verbose_name='Дата переноса в архив', auto_now_add=True)
+    # Goal.board_deleted_status: цель ушла в архив вместе с доской и вернется с этим статусом
+    board_deleted_status = models.PositiveSmallIntegerField(
+        verbose_name='Статус до удаления доски', choices=Goal.Status.choices, null=True, blank=True,
+    )
+    payload = models.BinaryField(verbose_name='Данные')
+
+    class Meta:
+        verbose_name = 'Архивная цель'
+        verbose_name_plural = 'Архивные цели'
 
     def __str__(self):
-        return self.text
\ No newline at end of file
+        return self.title
+
+
+class BoardArchive(models.Model):
+    """Холодное хранилище удаленных досок: доска, участники и категории в сжатом JSON"""
+    board_id = models.BigIntegerField(verbose_name='ID доски', unique=True)
+    title = models.CharField(verbose_name='Название', max_length=255)
+    archived_at = models.DateTimeField(verbose_name='Дата переноса в архив', auto_now_add=True)
+    payload = models.BinaryField(verbose_name='Данные')
+
+    class Meta:
+        verbose_name = 'Архивная доска'
+        verbose_name_plural = 'Архивные доски'
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,141 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from django.db.models import F, Model, OrderBy, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination, _positive_int
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Постраничный вывод по ключу последней строки (keyset) с откатом на limit/offset.
+
+    Если в запросе есть page_size или cursor, следующая страница выбирается условием
+    "строки после последней строки предыдущей страницы" по полям сортировки вместо OFFSET.
+    Такой запрос читает по индексу ровно page_size строк на любой глубине списка.
+    Последним полем сортировки должен быть уникальный id (его добавляет GoalOrderingFilter).
+    NULL считается больше любого значения, как в ordering_expressions.
+    Без этих параметров поведение и формат ответа прежние (LimitOffsetPagination)"""
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    default_keyset_page_size = 50
+    max_page_size = 200
+
+    def is_keyset(self, request: Request) -> bool:
+        return self.page_size_query_param in request.query_params or self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> list | None:
+        self.keyset: bool = self.is_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size: int = self.get_page_size(request)
+        self.ordering: list[tuple[str, bool]] = self.get_ordering(queryset)
+        if self.ordering[-1][0] != 'id':
+            self.ordering.append(('id', False))
+            queryset = queryset.order_by(*queryset.query.order_by, 'id')
+
+        if queryset._fields and (missing := [name for name, _ in self.ordering if name not in queryset._fields]):
+            # Строки .values() из FastListMixin: значения курсора берутся из самой строки
+            queryset = queryset.values(*queryset._fields, *missing)
+
+        cursor: str | None = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after_condition(queryset.model, self.decode_cursor(cursor)))
+
+        rows: list = list(queryset[:self.page_size + 1])
+        self.has_next: bool = len(rows) > self.page_size
+        self.page: list = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True,
+                                 cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.default_keyset_page_size
+
+    @staticmethod
+    def get_ordering(queryset: QuerySet) -> list[tuple[str, bool]]:
+        """Поля сортировки запроса и признак сортировки по убыванию"""
+        ordering: list[tuple[str, bool]] = []
+        for item in queryset.query.order_by or queryset.model._meta.ordering:
+            if isinstance(item, OrderBy) and isinstance(item.expression, F):
+                ordering.append((item.expression.name, item.descending))
+            elif isinstance(item, str):
+                ordering.append((item.lstrip('-'), item.startswith('-')))
+            else:
+                raise NotFound('Keyset pagination does not support this ordering')
+        return ordering or [('id', False)]
+
+    def leading_bound(self, model: type[Model], values: list) -> Q | None:
+        """Избыточная граница по первому полю сортировки: a <= x для -a, a >= x для a.
+        Раскрытое через OR условие after_condition Postgres не превращает в границу просмотра
+        индекса, а с ней Index Scan начинается сразу с позиции курсора"""
+        name, descending = self.ordering[0]
+        value: Any = values[0]
+        if value is None:
+            # После NULL по возрастанию идут только NULL, по убыванию - все строки
+            return None if descending else Q(**{f'{name}__isnull': True})
+        if descending:
+            return Q(**{f'{name}__lte': value})
+        bound = Q(**{f'{name}__gte': value})
+        if model._meta.get_field(name).null:
+            bound |= Q(**{f'{name}__isnull': True})
+        return bound
+
+    def after_condition(self, model: type[Model], values: list) -> Q:
+        """(a, b, id) > (x, y, z) с учетом направления каждого поля и NULL в конце возрастающего порядка"""
+        bound: Q | None = self.leading_bound(model, values) if len(self.ordering) > 1 else None
+        condition: Q | None = None
+        for (name, descending), value in reversed(list(zip(self.ordering, values))):
+            nullable: bool = model._meta.get_field(name).null
+            if value is None:
+                after: Q | None = Q(**{f'{name}__isnull': False}) if descending else None
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if nullable and not descending:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+
+            if condition is not None:
+                tail: Q = equal & condition
+                condition = tail if after is None else after | tail
+            else:
+                condition = after if after is not None else Q(pk__in=[])
+        return condition if bound is None else bound & condition
+
+    def encode_cursor(self, row: Any) -> str:
+        values: list = [row[name] if isinstance(row, dict) else getattr(row, name) for name, _ in self.ordering]
+        payload: bytes = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value
+                                     for value in values]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor: str) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        return values
+
+    def get_next_link(self) -> str | None:
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url: str = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({'next': self.get_next_link(), 'results': data})
@@ -0,0 +1,203 @@
+"""Декларативное партиционирование Postgres для целей и комментариев.
+
+goals_goal разбивается по статусу (LIST): активные цели лежат в маленькой горячей
+партиции goals_goal_active, архивные - в goals_goal_archived. При смене статуса
+Postgres сам переносит строку между партициями, поэтому ORM ничего не замечает.
+
+goals_goalcomment разбивается по месяцам (RANGE по created) с партицией по умолчанию.
+Старые месяцы можно отсоединить командой goals_partitions.
+
+Первичный ключ партиционированной таблицы обязан включать ключ партиционирования,
+поэтому внешний ключ goals_goalcomment.goal_id -> goals_goal.id в этом режиме не
+создается: целостность поддерживает каскадное удаление Django.
+"""
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db.backends.utils import CursorWrapper
+
+GOAL_TABLE = 'goals_goal'
+COMMENT_TABLE = 'goals_goalcomment'
+COMMENT_DEFAULT_PARTITION = f'{COMMENT_TABLE}_default'
+
+GOAL_PARTITIONS = (
+    (f'{GOAL_TABLE}_active', 'FOR VALUES IN (1, 2, 3)'),
+    (f'{GOAL_TABLE}_archived', 'FOR VALUES IN (4)'),
+)
+# Внешние ключи текущей схемы. Миграции передают в partition_tables/unpartition_tables
+# собственные списки: столбцы на момент миграции
+GOAL_FOREIGN_KEYS = (('category_id', 'goals_goalcategory'), ('user_id', 'core_user'), ('board_id', 'goals_board'))
+COMMENT_FOREIGN_KEYS = (('user_id', 'core_user'), ('board_id', 'goals_board'))
+
+
+def is_enabled(connection) -> bool:
+    return settings.GOALS_PARTITIONING and connection.vendor == 'postgresql'
+
+
+def is_partitioned(cursor: CursorWrapper, table: str) -> bool:
+    cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s AND relkind IN ('r', 'p')", [table])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def comment_partition_name(month: date) -> str:
+    return f'{COMMENT_TABLE}_y{month.year:04d}m{month.month:02d}'
+
+
+def _drop_foreign_keys(cursor: CursorWrapper, table: str, referenced: str) -> None:
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE contype = 'f' AND conrelid = %s::regclass "
+        "AND confrelid = %s::regclass",
+        [table, referenced],
+    )
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+
+
+def _index_definitions(cursor: CursorWrapper, table: str) -> list[str]:
+    """CREATE INDEX всех индексов таблицы, кроме индексов первичного ключа и других ограничений"""
+    cursor.execute(
+        'SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass '
+        'AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid) '
+        'ORDER BY i.indexrelid',
+        [table],
+    )
+    # У партиционированной таблицы индекс определен ON ONLY: без индексов партиций
+    return [definition.replace(' ON ONLY ', ' ON ', 1) for (definition,) in cursor.fetchall()]
+
+
+def _rebuild(cursor: CursorWrapper, table: str, partition_by: str | None, primary_key: str,
+             partitions: tuple, foreign_keys: tuple) -> None:
+    """Пересоздает таблицу (партиционированной или обычной) и копирует в нее данные.
+    Индексы (из Meta.indexes и по внешним ключам) пересоздаются с прежними именами и условиями"""
+    sequence = f'{table}_id_seq'
+    indexes: list[str] = _index_definitions(cursor, table)
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+    cursor.execute(
+        f'CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        + (f' PARTITION BY {partition_by}' if partition_by else '')
+    )
+    # id копируется без identity/sequence старой таблицы, ниже создается собственная последовательность
+    cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
+    for name, bound in partitions:
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF {table} {bound}')
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+    cursor.execute(f'DROP TABLE {table}_old')
+
+    cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {sequence} OWNED BY {table}.id')
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    cursor.execute(f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)")
+    cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    for column, referenced in foreign_keys:
+        cursor.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fk FOREIGN KEY ({column}) '
+            f'REFERENCES {referenced} (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_tables(cursor: CursorWrapper, goal_foreign_keys: tuple = GOAL_FOREIGN_KEYS,
+                     comment_foreign_keys: tuple = COMMENT_FOREIGN_KEYS) -> None:
+    """Переводит цели и комментарии на партиционированное хранение"""
+    if is_partitioned(cursor, GOAL_TABLE):
+        return
+    _drop_foreign_keys(cursor, COMMENT_TABLE, GOAL_TABLE)
+    _rebuild(
+        cursor, GOAL_TABLE, 'LIST (status)', 'id, status', GOAL_PARTITIONS, goal_foreign_keys,
+    )
+
+    cursor.execute(f'SELECT MIN(created) FROM {COMMENT_TABLE}')
+    first: datetime | None = cursor.fetchone()[0]
+    _rebuild(
+        cursor, COMMENT_TABLE, 'RANGE (created)', 'id, created',
+        ((COMMENT_DEFAULT_PARTITION, 'DEFAULT'),), comment_foreign_keys,
+    )
+    month: date = _month_start(first.date() if first else date.today())
+    last: date = _month_start(date.today())
+    while month <= last:
+        create_comment_partition(cursor, month)
+        month = _next_month(month)
+
+
+def unpartition_tables(cursor: CursorWrapper, goal_foreign_keys: tuple = GOAL_FOREIGN_KEYS,
+                       comment_foreign_keys: tuple = COMMENT_FOREIGN_KEYS) -> None:
+    """Возвращает цели и комментарии в обычные таблицы"""
+    if not is_partitioned(cursor, GOAL_TABLE):
+        return
+    _rebuild(cursor, COMMENT_TABLE, None, 'id', (), comment_foreign_keys)
+    _rebuild(cursor, GOAL_TABLE, None, 'id', (), goal_foreign_keys)
+    cursor.execute(
+        f'ALTER TABLE {COMMENT_TABLE} ADD CONSTRAINT {COMMENT_TABLE}_goal_id_fk FOREIGN KEY (goal_id) '
+        f'REFERENCES {GOAL_TABLE} (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+
+
+def create_comment_partition(cursor: CursorWrapper, month: date) -> str:
+    """Создает партицию комментариев за месяц и переносит в нее строки из партиции по умолчанию"""
+    month = _month_start(month)
+    name: str = comment_partition_name(month)
+    cursor.execute('SELECT 1 FROM pg_class WHERE relname = %s', [name])
+    if cursor.fetchone():
+        return name
+
+    bounds: list[str] = [f'{month.isoformat()} 00:00:00+00', f'{_next_month(month).isoformat()} 00:00:00+00']
+    cursor.execute(f'ALTER TABLE {COMMENT_TABLE} DETACH PARTITION {COMMENT_DEFAULT_PARTITION}')
+    cursor.execute(f'CREATE TABLE {name} PARTITION OF {COMMENT_TABLE} FOR VALUES FROM (%s) TO (%s)', bounds)
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {COMMENT_DEFAULT_PARTITION} WHERE created >= %s AND created < %s RETURNING *) '
+        f'INSERT INTO {COMMENT_TABLE} SELECT * FROM moved',
+        bounds,
+    )
+    cursor.execute(f'ALTER TABLE {COMMENT_TABLE} ATTACH PARTITION {COMMENT_DEFAULT_PARTITION} DEFAULT')
+    return name
+
+
+def list_comment_partitions(cursor: CursorWrapper) -> list[tuple[str, date]]:
+    """Возвращает помесячные партиции комментариев и первый день их месяца"""
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = %s::regclass ORDER BY c.relname',
+        [COMMENT_TABLE],
+    )
+    prefix = f'{COMMENT_TABLE}_y'
+    return [
+        (name, date(int(name[len(prefix):len(prefix) + 4]), int(name[-2:]), 1))
+        for (name,) in cursor.fetchall()
+        if name.startswith(prefix)
+    ]
+
+
+def refresh_comment_stats(cursor: CursorWrapper, goal_ids_sql: str, params: list | tuple = ()) -> None:
+    """Пересчитывает comments_count и last_comment целей из goal_ids_sql одним UPDATE ... FROM
+    с агрегатом по комментариям. Цели без комментариев получают 0 и NULL"""
+    cursor.execute(
+        f'UPDATE {GOAL_TABLE} AS g SET comments_count = s.count, last_comment_id = s.last_id FROM ('
+        f'SELECT goal.id, COUNT(c.id) AS count, (ARRAY_AGG(c.id ORDER BY c.created DESC, c.id DESC))[1] AS last_id '
+        f'FROM ({goal_ids_sql}) AS goal (id) LEFT JOIN {COMMENT_TABLE} AS c ON c.goal_id = goal.id '
+        f'GROUP BY goal.id'
+        f') AS s WHERE g.id = s.id',
+        params,
+    )
+
+
+def detach_comment_partitions(cursor: CursorWrapper, before: date, drop: bool = False) -> list[str]:
+    """Отсоединяет (или удаляет) партиции комментариев, целиком лежащие раньше даты before.
+    Счетчики и последний комментарий целей пересчитываются без отсоединенных комментариев"""
+    detached: list[str] = []
+    for name, month in list_comment_partitions(cursor):
+        if _next_month(month) <= before:
+            cursor.execute(f'ALTER TABLE {COMMENT_TABLE} DETACH PARTITION {name}')
+            refresh_comment_stats(cursor, f'SELECT DISTINCT goal_id FROM {name}')
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            detached.append(name)
+    return detached
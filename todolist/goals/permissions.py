@@ -4,9 +4,37 @@ from objects import objects
 from rest_framework import permissions
 from rest_framework.templatetags.rest_framework import data
 
+from django.db.models import QuerySet
+
 from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
 
 
+def user_board_ids(user_id: int) -> QuerySet:
+    """Подзапрос id досок пользователя для фильтра board_id__in: по board_id целей и комментариев
+    он сводится к одному полусоединению с участниками по индексу participant_user_board_idx"""
+    return BoardParticipant.objects.filter(user_id=user_id).values('board_id')
+
+
+def get_board_roles(request: Any) -> dict[int, int]:
+    """Роли пользователя по id досок, загружаются одним запросом на HTTP-запрос.
+    Подзапросы /batch получают общий словарь внешнего запроса"""
+    http_request = getattr(request, '_request', request)
+    roles: dict[int, int] | None = getattr(http_request, 'board_roles', None)
+    if roles is None:
+        roles = http_request.board_roles = dict(
+            BoardParticipant.objects.filter(user_id=request.user.id).values_list('board_id', 'role')
+        )
+    return roles
+
+
+def has_board_role(request: Any, board_id: int, roles: tuple[int, ...]) -> bool:
+    """Участник доски может читать ее, для изменения нужна одна из ролей roles"""
+    role: int | None = get_board_roles(request).get(board_id)
+    if role is None:
+        return False
+    return request.method in permissions.SAFE_METHODS or role in roles
+
+
 class IsOwnerOrReadOnly(permissions.BasePermission):
 
     def has_object_permission(self, request: {data}, view: Any, obj: {objects}) -> bool:
@@ -17,29 +45,17 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
 
 class BoardPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request: {data}, view: Any, obj: Board) -> Any:
-        _filters: dict = {'user': request.user, 'board': obj}
-        if request.method not in permissions.SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
-
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return has_board_role(request, obj.id, (BoardParticipant.Role.owner,))
 
 
 class GoalCategoryPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request: {data}, view: Any, obj: GoalCategory) -> Any:
-        _filters: dict = {'user_id': request.user.id, 'board_id': obj.board_id}
-        if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return has_board_role(request, obj.board_id, (BoardParticipant.Role.owner, BoardParticipant.Role.writer))
 
 
 class GoalPermissions(permissions.IsAuthenticated):
     def has_object_permission(self, request: {data}, view: Any, obj: Goal) -> Any:
-        _filters: dict = {'user_id': request.user.id, 'board_id': obj.category.board_id}
-        if request.method not in permissions.SAFE_METHODS:
-            _filters['role__in'] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return has_board_role(request, obj.board_id, (BoardParticipant.Role.owner, BoardParticipant.Role.writer))
 
 
 class CommentsPermissions(permissions.IsAuthenticated):
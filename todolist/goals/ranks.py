@@ -0,0 +1,102 @@
+"""Ручной порядок целей внутри категории: ключи-дроби в виде строк.
+
+Ключ - цифры дроби 0.xyz в системе счисления по основанию 36 без нулей в конце. Строки таких
+ключей сравниваются так же, как дроби, поэтому между любыми двумя ключами есть третий:
+перемещение цели меняет одну строку, а соседей перенумеровывать не нужно. Цифры и строчные
+латинские буквы упорядочены одинаково в побайтовой сортировке и в сортировке локали Postgres.
+Ключи удлиняются при частых вставках в одно место, rebalance_category снова делает их короткими.
+"""
+from django.db import transaction
+from django.db.models import Max, Q, QuerySet
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from todolist.goals.cache import bump_board_versions
+from todolist.goals.models import Goal, GoalCategory
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """Ключ строго между before и after; None - начало или конец категории"""
+    before = before or ''
+    if after is not None and after <= before:
+        raise ValueError(f'Rank {before!r} is not less than {after!r}')
+    rank: str = ''
+    position: int = 0
+    while True:
+        low: int = DIGITS.index(before[position]) if position < len(before) else 0
+        high: int = DIGITS.index(after[position]) if after is not None and position < len(after) else BASE
+        if high - low > 1:
+            return rank + DIGITS[(low + high) // 2]
+        rank += DIGITS[low]
+        if low < high:
+            # Префикс уже меньше after: дальше граница сверху не нужна
+            after = None
+        position += 1
+
+
+def spread_ranks(count: int) -> list[str]:
+    """count ключей одинаковой длины, равномерно распределенных по всему диапазону"""
+    width: int = 1
+    while BASE ** width <= count:
+        width += 1
+    ranks: list[str] = []
+    for number in range(1, count + 1):
+        value: int = number * BASE ** width // (count + 1)
+        digits: list[str] = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def last_rank(category_id: int) -> str | None:
+    return Goal.objects.filter(category_id=category_id).aggregate(rank=Max('rank'))['rank']
+
+
+def categories_to_rebalance(max_length: int) -> QuerySet:
+    """id категорий с длинными ключами или с целями без ключа (записанными в обход модели)"""
+    return GoalCategory.objects.filter(id__in=Goal.objects.annotate(rank_length=Length('rank')).filter(
+        Q(rank='') | Q(rank_length__gt=max_length)
+    ).values('category_id')).order_by('id').values_list('id', flat=True)
+
+
+def rebalance_category(category_id: int) -> int:
+    """Заново раздает целям категории короткие ключи, сохраняя их порядок"""
+    with transaction.atomic():
+        goals: list[Goal] = list(
+            Goal.objects.select_for_update().filter(category_id=category_id)
+            .order_by('rank', 'id').only('id', 'board_id')
+        )
+        for goal, rank in zip(goals, spread_ranks(len(goals))):
+            goal.rank = rank
+        Goal.objects.bulk_update(goals, ['rank'], batch_size=1000)
+        bump_board_versions(*{goal.board_id for goal in goals})
+    return len(goals)
+
+
+def _neighbour_ranks(goal: Goal, after: Goal | None) -> tuple[str | None, str | None]:
+    siblings: QuerySet = Goal.objects.filter(category_id=goal.category_id).exclude(id=goal.id).order_by('rank', 'id')
+    if after is None:
+        return None, siblings.values_list('rank', flat=True).first()
+    return after.rank, siblings.filter(rank__gt=after.rank).values_list('rank', flat=True).first()
+
+
+def move_goal(goal: Goal, after: Goal | None) -> Goal:
+    """Ставит цель сразу после цели after той же категории (None - в начало) одним UPDATE"""
+    if Goal.objects.filter(category_id=goal.category_id, rank='').exists():
+        # Цели без ключа (записанные в обход модели) стоят в начале, а между ними места нет:
+        # сначала раздаем ключи всей категории, порядок по id при этом сохраняется
+        rebalance_category(goal.category_id)
+        if after is not None:
+            after.refresh_from_db(fields=['rank'])
+    rank: str = rank_between(*_neighbour_ranks(goal, after))
+    # updated меняется вместе с порядком, иначе ETag списка останется прежним
+    now = timezone.now()
+    Goal.objects.filter(id=goal.id).update(rank=rank, updated=now)
+    goal.rank, goal.updated = rank, now
+    bump_board_versions(goal.board_id)
+    return goal
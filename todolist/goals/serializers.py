@@ -4,7 +4,12 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 
 from todolist.core.models import User
 from todolist.core.serializers import ProfileSerializer
-from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from todolist.goals.cache import bump_board_versions
+from todolist.goals.events import publish_event
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalArchive, GoalCategory, GoalComment
+from todolist.metrics import TimedListSerializer, TimedSerializerMixin
+
+COMMENT_PREVIEW_LENGTH = 100
 
 
 class GoalCategoryCreateSerializer(serializers.ModelSerializer):
@@ -28,11 +33,12 @@ class GoalCategoryCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class GoalCategorySerializer(serializers.ModelSerializer):
+class GoalCategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = ProfileSerializer(read_only=True)
 
     class Meta:
         model = GoalCategory
+        list_serializer_class = TimedListSerializer
         fields = '__all__'
         read_only_fields = ('id', 'created', 'updated', 'user', 'board')
         extra_kwargs = {
@@ -40,6 +46,16 @@ class GoalCategorySerializer(serializers.ModelSerializer):
         }
 
 
+class GoalCategoryUserIdSerializer(GoalCategorySerializer):
+    """Категория с user_id вместо профиля автора: профили отдаются отдельно (?include=users)"""
+    user = None
+    user_id = serializers.IntegerField(read_only=True)
+
+    class Meta(GoalCategorySerializer.Meta):
+        fields = None
+        exclude = ('user',)
+
+
 class GoalCreateSerializer(serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(
         queryset=GoalCategory.objects.filter(is_deleted=False)
@@ -48,8 +64,8 @@ class GoalCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Goal
-        fields = '__all__'
-        read_only_fields = ('id', 'created', 'updated', 'user')
+        exclude = ('board', 'comments_count', 'last_comment', 'board_deleted_status')
+        read_only_fields = ('id', 'created', 'updated', 'user', 'rank')
 
     def validate_category(self, value: GoalCategory) -> GoalCategory:
         if not BoardParticipant.objects.filter(
@@ -61,11 +77,17 @@ class GoalCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class GoalSerializer(serializers.ModelSerializer):
+class GoalSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Goal
-        fields = '__all__'
-        read_only_fields = ('id', 'created', 'updated', 'user')
+        list_serializer_class = TimedListSerializer
+        exclude = ('board', 'comments_count', 'last_comment', 'board_deleted_status')
+        read_only_fields = ('id', 'created', 'updated', 'user', 'rank')
+        # Через extra_kwargs, а не объявленным полем: порядок полей в ответе остается прежним.
+        # Активные цели не переносятся в удаленные категории: список целей это не перепроверяет
+        extra_kwargs = {
+            'category': {'queryset': GoalCategory.objects.filter(is_deleted=False)},
+        }
 
     def validate_category(self, value: GoalCategory) -> GoalCategory:
         if self.context['request'].user.id != value.user_id:
@@ -73,17 +95,56 @@ class GoalSerializer(serializers.ModelSerializer):
         return value
 
 
+class GoalMoveSerializer(serializers.Serializer):
+    """after - цель той же категории, после которой встает перемещаемая цель; null - в начало"""
+    after = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.active(), allow_null=True)
+
+    def validate_after(self, value: Goal | None) -> Goal | None:
+        goal: Goal = self.context['goal']
+        if value is not None and (value.category_id != goal.category_id or value.id == goal.id):
+            raise ValidationError('Goal must be another goal of the same category')
+        return value
+
+
+class CommentPreviewField(serializers.CharField):
+    """Начало текста комментария не длиннее COMMENT_PREVIEW_LENGTH символов"""
+
+    def to_representation(self, value: str) -> str:
+        text: str = super().to_representation(value)
+        if len(text) <= COMMENT_PREVIEW_LENGTH:
+            return text
+        return text[:COMMENT_PREVIEW_LENGTH - 1] + '…'
+
+
+class LastCommentSerializer(serializers.ModelSerializer):
+    text = CommentPreviewField(read_only=True)
+
+    class Meta:
+        model = GoalComment
+        fields = ('id', 'user', 'text', 'created')
+        read_only_fields = fields
+
+
+class GoalWithCommentsSerializer(GoalSerializer):
+    """Цель со счетчиком и последним комментарием: список целей с ?include=comments"""
+    last_comment = LastCommentSerializer(read_only=True)
+
+    class Meta(GoalSerializer.Meta):
+        exclude = ('board', 'board_deleted_status')
+        read_only_fields = (*GoalSerializer.Meta.read_only_fields, 'comments_count')
+
+
 class GoalCommentCreateSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated', 'user')
 
     def validate_goal(self, value: Goal)  -> Goal:
         if not BoardParticipant.objects.filter(
-                board=value.category.board_id,
+                board=value.board_id,
                 role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
                 user_id=self.context['request'].user.id
         ):
@@ -91,15 +152,25 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class GoalCommentSerializer(serializers.ModelSerializer):
+class GoalCommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = ProfileSerializer(read_only=True)
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        list_serializer_class = TimedListSerializer
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated', 'user', 'goal')
 
 
+class GoalCommentUserIdSerializer(GoalCommentSerializer):
+    """Комментарий с user_id вместо профиля автора (?include=users)"""
+    user = None
+    user_id = serializers.IntegerField(read_only=True)
+
+    class Meta(GoalCommentSerializer.Meta):
+        exclude = ('board', 'user')
+
+
 class BoardCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
@@ -122,7 +193,7 @@ class BoardParticipantSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created', 'updated', 'board')
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     participants = BoardParticipantSerializer(many=True)
 
     class Meta:
@@ -141,15 +212,28 @@ class BoardSerializer(serializers.ModelSerializer):
                 )
                 for participant in validated_data.pop('participants', [])
             ])
+            # bulk_create не отправляет сигналы, поэтому инвалидируем списки доски явно
+            bump_board_versions(instance.id)
 
             if title := validated_data.get('title'):
                 instance.title = title
-                instance.save(update_fields=('title',))
+                instance.save(update_fields=('title', 'updated'))
+
+            publish_event(instance.id, 'board', 'updated', instance.id)
 
         return instance
 
 
-class BoardListSerializer(serializers.ModelSerializer):
+class BoardListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Board
-        fields = '__all__'
\ No newline at end of file
+        list_serializer_class = TimedListSerializer
+        fields = '__all__'
+
+
+class GoalArchiveSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = GoalArchive
+        list_serializer_class = TimedListSerializer
+        fields = ('goal_id', 'board_id', 'title', 'archived_at')
+        read_only_fields = fields
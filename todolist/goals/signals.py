@@ -0,0 +1,77 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from todolist.core.models import User
+from todolist.core.serializers import ProfileSerializer
+from todolist.goals.cache import bump_board_versions
+from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from todolist.goals.ranks import last_rank, rank_between
+
+
+@receiver(pre_save, sender=Goal)
+def sync_goal_board(sender: type, instance: Goal, update_fields: frozenset | None, **kwargs: Any) -> None:
+    """board_id цели повторяет доску ее категории, новая или перенесенная цель встает в конец категории.
+    Прежние категория и доска читаются одним запросом только при сохранении, которое может их поменять:
+    чтение целей ничего лишнего не делает"""
+    previous: dict | None = None
+    if not instance._state.adding and (update_fields is None or 'category' in update_fields):
+        previous = Goal.objects.filter(id=instance.id).values('category_id', 'board_id').first()
+    moved: bool = previous is not None and previous['category_id'] != instance.category_id
+    # Прежнюю доску тоже нужно инвалидировать, goal_changed заберет ее после сохранения
+    instance._previous_board_id = previous['board_id'] if previous else None
+    if instance.board_id is None or moved:
+        instance.board_id = instance.category.board_id
+    if not instance.rank or moved:
+        instance.rank = rank_between(last_rank(instance.category_id), None)
+
+
+@receiver(pre_save, sender=GoalComment)
+def sync_comment_board(sender: type, instance: GoalComment, **kwargs: Any) -> None:
+    if instance.board_id is None:
+        instance.board_id = instance.goal.board_id
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_changed(sender: type, instance: Board, **kwargs: Any) -> None:
+    bump_board_versions(instance.id)
+
+
+@receiver(post_save, sender=BoardParticipant)
+@receiver(post_delete, sender=BoardParticipant)
+@receiver(post_save, sender=GoalCategory)
+@receiver(post_delete, sender=GoalCategory)
+def board_child_changed(sender: type, instance: BoardParticipant | GoalCategory, **kwargs: Any) -> None:
+    bump_board_versions(instance.board_id)
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+def goal_changed(sender: type, instance: Goal, signal: Any, **kwargs: Any) -> None:
+    board_ids: list[int] = [instance.board_id]
+    previous_board_id: int | None = instance.__dict__.pop('_previous_board_id', None)
+    if previous_board_id not in (None, instance.board_id):
+        board_ids.append(previous_board_id)
+        if signal is post_save:
+            # Цель перенесли на другую доску: комментарии переезжают вместе с ней
+            GoalComment.objects.filter(goal_id=instance.id).update(board_id=instance.board_id)
+    bump_board_versions(*board_ids)
+
+
+@receiver(post_save, sender=GoalComment)
+@receiver(post_delete, sender=GoalComment)
+def comment_changed(sender: type, instance: GoalComment, **kwargs: Any) -> None:
+    # Создание и удаление комментария; правка текста счетчики не меняет
+    if kwargs.get('created', True):
+        Goal.objects.filter(id=instance.goal_id).refresh_comment_stats()
+    bump_board_versions(instance.board_id)
+
+
+@receiver(post_save, sender=User)
+def profile_changed(sender: type, instance: User, update_fields: frozenset | None, **kwargs: Any) -> None:
+    """Профиль встроен в закэшированные списки досок пользователя; вход (last_login) и смена пароля их не меняют"""
+    if update_fields is not None and not update_fields & set(ProfileSerializer.Meta.fields):
+        return
+    bump_board_versions(*BoardParticipant.objects.filter(user_id=instance.id).values_list('board_id', flat=True))
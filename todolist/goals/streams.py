@@ -0,0 +1,98 @@
+import asyncio
+import json
+import re
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+
+from todolist.goals.events import board_channel, get_broker
+from todolist.goals.models import BoardParticipant
+
+BOARD_EVENTS_PATH = re.compile(r'^/goals/board/(?P<pk>\d+)/events/?$')
+HEARTBEAT_INTERVAL = 15
+
+
+@sync_to_async
+def _is_board_participant(headers: list[tuple[bytes, bytes]], board_id: int) -> bool:
+    """Находит пользователя по сессионной cookie и проверяет его участие в доске"""
+    cookie = SimpleCookie()
+    for name, value in headers:
+        if name == b'cookie':
+            cookie.load(value.decode('latin1'))
+    session_key = cookie.get(settings.SESSION_COOKIE_NAME)
+    engine = import_module(settings.SESSION_ENGINE)
+    session = engine.SessionStore(session_key.value if session_key else None)
+    user = get_user(SimpleNamespace(session=session))
+    if not user.is_authenticated:
+        return False
+    return BoardParticipant.objects.filter(
+        board_id=board_id, user_id=user.id, board__is_deleted=False
+    ).exists()
+
+
+class BoardEventsApp:
+    """ASGI-приложение, отдающее события доски через Server-Sent Events.
+    Все остальные запросы передаются в Django"""
+
+    def __init__(self, application: Callable) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            if match := BOARD_EVENTS_PATH.match(scope['path']):
+                return await self.stream(int(match.group('pk')), scope, receive, send)
+        return await self.application(scope, receive, send)
+
+    @staticmethod
+    async def _reject(send: Callable) -> None:
+        await send({'type': 'http.response.start', 'status': 403,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"detail":"Forbidden"}'})
+
+    async def stream(self, board_id: int, scope: dict, receive: Callable, send: Callable) -> None:
+        if not await _is_board_participant(scope.get('headers', []), board_id):
+            return await self._reject(send)
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+
+        broker = get_broker()
+        channel = board_channel(board_id)
+        subscription = broker.subscribe(channel)
+        disconnect: asyncio.Task = asyncio.ensure_future(receive())
+        try:
+            while True:
+                message_task: asyncio.Task = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {message_task, disconnect},
+                    timeout=HEARTBEAT_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnect in done:
+                    message_task.cancel()
+                    break
+                if message_task in done:
+                    body = self.format_event(message_task.result())
+                else:
+                    message_task.cancel()
+                    body = b': ping\n\n'
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+        finally:
+            broker.unsubscribe(channel, subscription)
+            disconnect.cancel()
+
+    @staticmethod
+    def format_event(message: dict[str, Any]) -> bytes:
+        return f'event: {message["entity"]}\ndata: {json.dumps(message)}\n\n'.encode()
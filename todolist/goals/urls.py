@@ -13,9 +13,16 @@ urlpatterns = [
 
     path('goal/create', views.GoalCreateView.as_view(), name='create-goal'),
     path('goal/list', views.GoalListView.as_view(), name='list-goals'),
+    path('goal/bucket_counts', views.GoalBucketCountsView.as_view(), name='goal-bucket-counts'),
+    path('goal/bucket/<str:bucket>', views.GoalBucketListView.as_view(), name='list-goals-bucket'),
     path('goal/<pk>', views.GoalView.as_view(), name='retrieve-update-destroy-goal'),
+    path('goal/<pk>/move', views.GoalMoveView.as_view(), name='move-goal'),
 
     path('goal_comment/create', views.GoalCommentCreateView.as_view(), name='create-comment'),
     path('goal_comment/list', views.GoalCommentListView.as_view(), name='list-comment'),
     path('goal_comment/<pk>', views.GoalCommentView.as_view(), name='retrieve-update-destroy-comment'),
+
+    path('archive/goal/list', views.GoalArchiveListView.as_view(), name='list-archived-goals'),
+    path('archive/goal/<int:pk>/restore', views.GoalArchiveRestoreView.as_view(), name='restore-goal'),
+    path('archive/board/<int:pk>/restore', views.BoardArchiveRestoreView.as_view(), name='restore-board'),
 ]
\ No newline at end of file
@@ -1,14 +1,25 @@
 from typing import Any
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from todolist.goals.filters import GoalDateFilter
-from rest_framework import filters, generics, permissions
-from todolist.goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
-from todolist.goals.permissions import BoardPermissions, CommentsPermissions, GoalCategoryPermissions, GoalPermissions, IsOwnerOrReadOnly
-from todolist.goals.serializers import (BoardCreateSerializer, BoardListSerializer, BoardSerializer, GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCommentCreateSerializer, GoalCommentSerializer,
-    GoalCreateSerializer, GoalSerializer)
+from todolist.goals.filters import GoalDateFilter, GoalOrderingFilter
+from rest_framework import filters, generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from todolist.goals.archive import archived_owner_ids, restore_board, restore_goal
+from todolist.goals.buckets import Bucket, bucket_condition, get_user_bucket_counts
+from todolist.goals.cache import CachedListMixin, bump_board_versions
+from todolist.goals.events import publish_event
+from todolist.goals.fast import FastListMixin
+from todolist.goals.mixins import AuthorValidatorsMixin, ConditionalListMixin, ConditionalRetrieveMixin, SideloadUsersMixin, SparseFieldsMixin, get_include
+from todolist.goals.models import Board, BoardArchive, BoardParticipant, Goal, GoalArchive, GoalCategory, GoalComment
+from todolist.goals.pagination import KeysetPagination
+from todolist.goals.ranks import move_goal
+from todolist.goals.permissions import BoardPermissions, CommentsPermissions, GoalCategoryPermissions, GoalPermissions, IsOwnerOrReadOnly, user_board_ids
+from todolist.goals.serializers import (BoardCreateSerializer, BoardListSerializer, BoardSerializer, GoalArchiveSerializer, GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCategoryUserIdSerializer,
+    GoalCommentCreateSerializer, GoalCommentSerializer, GoalCommentUserIdSerializer, GoalCreateSerializer, GoalMoveSerializer, GoalSerializer, GoalWithCommentsSerializer)
 
 
 class BoardCreateView(generics.CreateAPIView):
@@ -20,7 +31,7 @@ class BoardCreateView(generics.CreateAPIView):
         BoardParticipant.objects.create(user=self.request.user, board=serializer.save())
 
 
-class BoardListView(generics.ListAPIView):
+class BoardListView(SparseFieldsMixin, ConditionalListMixin, CachedListMixin, generics.ListAPIView):
     model = Board
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BoardListSerializer
@@ -35,7 +46,7 @@ class BoardListView(generics.ListAPIView):
         )
 
 
-class BoardView(generics.RetrieveUpdateDestroyAPIView):
+class BoardView(SparseFieldsMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     model = Board
     permission_classes = [BoardPermissions]
     serializer_class = BoardSerializer
@@ -43,23 +54,40 @@ class BoardView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self) -> Any:
         return Board.objects.filter(is_deleted=False)
 
+    def get_validators(self, instance: Board) -> tuple[tuple, Any]:
+        """ Ответ включает участников, поэтому учитываем и их изменения. """
+        participants: dict = instance.participants.aggregate(
+            last_modified=Max('updated'), user_modified=Max('user__updated'), count=Count('pk'))
+        last_modified = max(filter(None, (instance.updated, participants['last_modified'], participants['user_modified'])))
+        return (instance.pk, instance.updated, *participants.values()), last_modified
+
     def perform_destroy(self, instance: Board) -> Board:
         with transaction.atomic():
             instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+            instance.save(update_fields=('is_deleted', 'updated'))
+            instance.categories.update(is_deleted=True, updated=timezone.now())
+            # Уже архивные цели остаются без статуса до удаления: с доской они не восстанавливаются
+            Goal.objects.filter(board=instance).exclude(status=Goal.Status.archived).update(
+                board_deleted_status=F('status'), status=Goal.Status.archived, updated=timezone.now())
+            bump_board_versions(instance.id)
+            publish_event(instance.id, 'board', 'deleted', instance.id)
         return instance
 
 class GoalCategoryCreateView(generics.CreateAPIView):
     permission_classes = [GoalCategoryPermissions]
     serializer_class = GoalCategoryCreateSerializer
 
+    def perform_create(self, serializer) -> None:
+        category: GoalCategory = serializer.save()
+        publish_event(category.board_id, 'category', 'created', category.id)
+
 
-class GoalCategoryListView(generics.ListAPIView):
+class GoalCategoryListView(SparseFieldsMixin, AuthorValidatorsMixin, ConditionalListMixin, CachedListMixin, SideloadUsersMixin,
+                           FastListMixin, generics.ListAPIView):
     model = GoalCategory
     permission_classes = [GoalCategoryPermissions]
     serializer_class = GoalCategorySerializer
+    sideload_serializer_class = GoalCategoryUserIdSerializer
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
     filterset_fields = ['board']
     ordering_fields = ['title', 'created']
@@ -73,7 +101,7 @@ class GoalCategoryListView(generics.ListAPIView):
         )
 
 
-class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCategoryView(SparseFieldsMixin, AuthorValidatorsMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     model = GoalCategory
     serializer_class = GoalCategorySerializer
     permission_classes = [GoalCategoryPermissions, IsOwnerOrReadOnly]
@@ -84,11 +112,17 @@ class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
             is_deleted=False
         )
 
+    def perform_update(self, serializer) -> None:
+        category: GoalCategory = serializer.save()
+        publish_event(category.board_id, 'category', 'updated', category.id)
+
     def perform_destroy(self, instance: GoalCategory) -> GoalCategory:
         with transaction.atomic():
             instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
+            instance.save(update_fields=('is_deleted', 'updated'))
+            instance.goals.update(status=Goal.Status.archived, updated=timezone.now())
+            bump_board_versions(instance.board_id)
+            publish_event(instance.board_id, 'category', 'deleted', instance.id)
         return instance
 
 
@@ -96,56 +130,175 @@ class GoalCreateView(generics.CreateAPIView):
     serializer_class = GoalCreateSerializer
     permission_classes = [GoalPermissions]
 
+    def perform_create(self, serializer) -> None:
+        goal: Goal = serializer.save()
+        publish_event(goal.board_id, 'goal', 'created', goal.id)
+
 
-class GoalListView(generics.ListAPIView):
+class GoalListView(SparseFieldsMixin, ConditionalListMixin, CachedListMixin, FastListMixin, generics.ListAPIView):
     model = Goal
     permission_classes = [GoalPermissions]
     serializer_class = GoalSerializer
     filterset_class = GoalDateFilter
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
-    ordering_fields = ['title', 'created']
+    filter_backends = [DjangoFilterBackend, GoalOrderingFilter, filters.SearchFilter]
+    ordering_fields = ['title', 'created', 'priority', 'due_date', 'status', 'rank']
+    pagination_class = KeysetPagination
     ordering = ['title']
     search_fields = ['title', 'description']
 
+    def include_comments(self) -> bool:
+        return 'comments' in get_include(self.request)
+
+    def get_serializer_class(self) -> Any:
+        return GoalWithCommentsSerializer if self.include_comments() else GoalSerializer
+
     def get_queryset(self) -> Any:
-        return Goal.objects.filter(
-            Q(category__board__participants__user_id=self.request.user.id) & ~Q(status=Goal.Status.archived) & Q(
-                category__is_deleted=False)
-        )
+        queryset = Goal.objects.active().filter(board_id__in=user_board_ids(self.request.user.id))
+        if self.include_comments():
+            # Последний комментарий приходит в том же запросе через LEFT JOIN
+            queryset = queryset.select_related('last_comment')
+        return queryset
+
+    def get_validator_aggregates(self) -> dict:
+        aggregates: dict = super().get_validator_aggregates()
+        if self.include_comments():
+            # Новый или удаленный комментарий не меняет updated цели
+            aggregates.update(comments=Sum('comments_count'), last_comment=Max('last_comment__updated'))
+        return aggregates
+
+
+class GoalBucketListView(GoalListView):
+    """Цели одной группы по сроку: overdue, due_this_week или no_due_date"""
+    ordering = ['due_date']
 
+    def get_queryset(self) -> Any:
+        if self.kwargs['bucket'] not in Bucket.values:
+            raise NotFound
+        return super().get_queryset().filter(bucket_condition(self.kwargs['bucket']))
+
+
+class GoalBucketCountsView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
 
-class GoalView(generics.RetrieveUpdateAPIView):
+    def get(self, request, *args: Any, **kwargs: Any) -> Response:
+        return Response(get_user_bucket_counts(request.user.id))
+
+
+class GoalView(SparseFieldsMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateAPIView):
     model = Goal
     permission_classes = [GoalPermissions, IsOwnerOrReadOnly]
     serializer_class = GoalSerializer
 
     def get_queryset(self) -> Any:
-        return Goal.objects.filter(~Q(status=Goal.Status.archived) & Q(category__is_deleted=False))
+        return Goal.objects.active().filter(category__is_deleted=False)
+
+    def perform_update(self, serializer) -> None:
+        goal: Goal = serializer.save()
+        publish_event(goal.board_id, 'goal', 'updated', goal.id)
+
+
+class GoalMoveView(generics.GenericAPIView):
+    """ Ручной порядок: POST {"after": <id цели или null>} ставит цель после указанной цели категории. """
+    permission_classes = [GoalPermissions, IsOwnerOrReadOnly]
+    serializer_class = GoalSerializer
+
+    def get_queryset(self) -> Any:
+        return Goal.objects.active().filter(category__is_deleted=False)
+
+    def post(self, request, *args: Any, **kwargs: Any) -> Response:
+        goal: Goal = self.get_object()
+        serializer = GoalMoveSerializer(data=request.data, context={'goal': goal})
+        serializer.is_valid(raise_exception=True)
+        move_goal(goal, serializer.validated_data['after'])
+        publish_event(goal.board_id, 'goal', 'updated', goal.id)
+        return Response(self.get_serializer(goal).data)
 
 
 class GoalCommentCreateView(generics.CreateAPIView):
     serializer_class = GoalCommentCreateSerializer
     permission_classes = [CommentsPermissions]
 
+    def perform_create(self, serializer) -> None:
+        comment: GoalComment = serializer.save()
+        publish_event(comment.board_id, 'comment', 'created', comment.id)
+
 
-class GoalCommentListView(generics.ListAPIView):
+class GoalCommentListView(SparseFieldsMixin, AuthorValidatorsMixin, ConditionalListMixin, SideloadUsersMixin, FastListMixin,
+                          generics.ListAPIView):
     model = GoalComment
     permission_classes = [CommentsPermissions]
     serializer_class = GoalCommentSerializer
+    sideload_serializer_class = GoalCommentUserIdSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
 
     def get_queryset(self) -> Any:
-        return GoalComment.objects.filter(
-            goal__category__board__participants__user_id=self.request.user.id,
-        )
+        return GoalComment.objects.filter(board_id__in=user_board_ids(self.request.user.id))
 
 
-class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCommentView(SparseFieldsMixin, AuthorValidatorsMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     model = GoalComment
     permission_classes = [CommentsPermissions, IsOwnerOrReadOnly]
     serializer_class = GoalCommentSerializer
 
     def get_queryset(self) -> Any:
         return GoalComment.objects.filter(user_id=self.request.user.id)
+
+    def perform_update(self, serializer) -> None:
+        comment: GoalComment = serializer.save()
+        publish_event(comment.board_id, 'comment', 'updated', comment.id)
+
+    def perform_destroy(self, instance: GoalComment) -> None:
+        board_id: int = instance.board_id
+        comment_id: int = instance.id
+        instance.delete()
+        publish_event(board_id, 'comment', 'deleted', comment_id)
+
+
+class GoalArchiveListView(generics.ListAPIView):
+    model = GoalArchive
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalArchiveSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['board_id']
+    ordering_fields = ['title', 'archived_at']
+    ordering = ['-archived_at']
+
+    def get_queryset(self) -> Any:
+        return GoalArchive.objects.filter(board_id__in=user_board_ids(self.request.user.id)).defer('payload')
+
+
+class GoalArchiveRestoreView(generics.GenericAPIView):
+    """ Возвращает архивную цель в работу (со статусом "К выполнению"). """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalSerializer
+
+    def get_queryset(self) -> Any:
+        return GoalArchive.objects.filter(
+            board_id__in=BoardParticipant.objects.filter(
+                user_id=self.request.user.id,
+                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
+                board__is_deleted=False,
+            ).values('board_id'),
+        )
+
+    def post(self, request, *args: Any, **kwargs: Any) -> Response:
+        archive: GoalArchive = generics.get_object_or_404(self.get_queryset(), goal_id=kwargs['pk'])
+        try:
+            goal: Goal = restore_goal(archive)
+        except GoalCategory.DoesNotExist:
+            raise ValidationError({'category': 'Category is deleted'})
+        return Response(self.get_serializer(goal).data)
+
+
+class BoardArchiveRestoreView(generics.GenericAPIView):
+    """ Восстанавливает удаленную доску вместе с категориями и целями. Доступно бывшему владельцу. """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BoardSerializer
+
+    def post(self, request, *args: Any, **kwargs: Any) -> Response:
+        archive: BoardArchive = generics.get_object_or_404(BoardArchive.objects.all(), board_id=kwargs['pk'])
+        if request.user.id not in archived_owner_ids(archive):
+            raise NotFound
+        return Response(self.get_serializer(restore_board(archive)).data, status=status.HTTP_200_OK)
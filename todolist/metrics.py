@@ -0,0 +1,289 @@
+"""Метрики запросов в текстовом формате Prometheus.
+
+MetricsMiddleware считает для каждого view гистограммы задержки, числа и времени SQL-запросов
+и времени сериализации. Запросы дольше METRICS_SLOW_REQUEST_SECONDS или с числом SQL-запросов
+не меньше METRICS_SLOW_REQUEST_QUERIES пишутся в лог вместе с самым долгим SQL.
+
+gunicorn запускает несколько процессов с собственными счетчиками. Если задан METRICS_DIR,
+каждый процесс не чаще раза в METRICS_FLUSH_SECONDS сохраняет свой снимок в файл,
+а эндпоинт метрик складывает снимки всех процессов.
+"""
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+REQUEST_DURATION = 'todolist_http_request_duration_seconds'
+REQUESTS_TOTAL = 'todolist_http_requests_total'
+DB_QUERIES = 'todolist_http_request_db_queries'
+DB_DURATION = 'todolist_http_request_db_duration_seconds'
+SERIALIZER_DURATION = 'todolist_http_request_serializer_duration_seconds'
+SLOW_REQUESTS_TOTAL = 'todolist_http_slow_requests_total'
+STATEMENT_TIMEOUTS_TOTAL = 'todolist_db_statement_timeouts_total'
+SINGLE_FLIGHT_SHARED_TOTAL = 'todolist_single_flight_shared_total'
+
+METRICS_HELP = {
+    REQUEST_DURATION: 'Request latency by view',
+    REQUESTS_TOTAL: 'Requests by view and response status',
+    DB_QUERIES: 'SQL queries per request',
+    DB_DURATION: 'Time spent in SQL per request',
+    SERIALIZER_DURATION: 'Time spent in serializers per request',
+    SLOW_REQUESTS_TOTAL: 'Requests over the slow request thresholds',
+    STATEMENT_TIMEOUTS_TOTAL: 'SQL queries canceled by statement_timeout',
+    SINGLE_FLIGHT_SHARED_TOTAL: 'Requests served by a concurrent identical computation',
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # Последняя ячейка - значения больше верхней границы (+Inf)
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flushed_at: float = 0.0
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.counters: dict[tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, labels: Labels, value: float, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        with self._lock:
+            histogram: Histogram | None = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'histograms': [
+                    [name, labels, histogram.buckets, histogram.counts[:], histogram.sum]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        for name, labels, buckets, counts, total in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            histogram: Histogram = self.histograms.setdefault(key, Histogram(tuple(buckets)))
+            histogram.counts = [current + added for current, added in zip(histogram.counts, counts)]
+            histogram.sum += total
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def flush(self, force: bool = False) -> None:
+        """Сохраняет снимок процесса в METRICS_DIR, если с прошлого сохранения прошло достаточно времени"""
+        if not settings.METRICS_DIR:
+            return
+        now: float = time.monotonic()
+        with self._lock:
+            if not force and now - self._flushed_at < settings.METRICS_FLUSH_SECONDS:
+                return
+            self._flushed_at = now
+        path = Path(settings.METRICS_DIR) / f'{os.getpid()}.json'
+        temporary: Path = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        temporary.replace(path)
+
+
+registry = Registry()
+
+
+def collect() -> Registry:
+    """Возвращает метрики текущего процесса или, при заданном METRICS_DIR, сумму снимков всех процессов"""
+    if not settings.METRICS_DIR:
+        return registry
+    registry.flush(force=True)
+    merged = Registry()
+    for path in Path(settings.METRICS_DIR).glob('*.json'):
+        try:
+            merged.merge(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning('Skipping unreadable metrics snapshot %s', path)
+    return merged
+
+
+def _format_value(value: float) -> str:
+    return f'{value:g}' if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def render(source: Registry) -> str:
+    lines: list[str] = []
+    described: set[str] = set()
+
+    def describe(name: str, metric_type: str) -> None:
+        if name not in described:
+            described.add(name)
+            lines.append(f'# HELP {name} {METRICS_HELP.get(name, name)}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+    for (name, labels), histogram in sorted(source.histograms.items()):
+        describe(name, 'histogram')
+        cumulative: int = 0
+        for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+            cumulative += count
+            le: str = bound if isinstance(bound, str) else _format_value(float(bound))
+            lines.append(f'{name}_bucket{_format_labels((*labels, ("le", le)))} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}')
+        lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+
+    for (name, labels), value in sorted(source.counters.items()):
+        describe(name, 'counter')
+        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def is_metrics_request_allowed(request: HttpRequest) -> bool:
+    if settings.METRICS_TOKEN:
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}')
+    # Без токена метрики отдаются только внутри сети: nginx проставляет X-Real-IP всем внешним запросам
+    return 'X-Real-IP' not in request.headers
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serializer_seconds: float = 0.0
+    slowest_sql: str = ''
+    slowest_seconds: float = 0.0
+
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+
+@contextmanager
+def serializer_timer() -> Iterator[None]:
+    """Добавляет время выполнения блока ко времени сериализации текущего запроса"""
+    stats: RequestStats | None = _current_stats.get()
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serializer_seconds += time.perf_counter() - started
+
+
+class TimedSerializerMixin:
+    """Учитывает построение serializer.data во времени сериализации запроса"""
+
+    @property
+    def data(self) -> Any:
+        with serializer_timer():
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """Для many=True: указывается в Meta.list_serializer_class"""
+
+
+class QueryTimer:
+    """Обертка connection.execute_wrapper, считающая SQL-запросы одного HTTP-запроса"""
+
+    def __init__(self, stats: RequestStats) -> None:
+        self.stats = stats
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed: float = time.perf_counter() - started
+            self.stats.queries += 1
+            self.stats.db_seconds += elapsed
+            if elapsed > self.stats.slowest_seconds:
+                self.stats.slowest_seconds = elapsed
+                self.stats.slowest_sql = sql
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.measure(request, self.get_response)
+
+    @classmethod
+    def measure(cls, request: HttpRequest, get_response: Callable[[HttpRequest], HttpResponse]) -> HttpResponse:
+        """Выполняет get_response(request) и записывает его метрики; подзапросы пакета (todolist.batch)
+        проходят мимо middleware и записываются отдельно этим же методом"""
+        if not settings.METRICS_ENABLED:
+            return get_response(request)
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started: float = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryTimer(stats)))
+                response: HttpResponse = get_response(request)
+        finally:
+            _current_stats.reset(token)
+
+        cls.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def record(request: HttpRequest, response: HttpResponse, stats: RequestStats, duration: float) -> None:
+        # Имя маршрута, а не путь: у путей с id неограниченное число значений
+        view: str = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        view_labels: Labels = (('view', view),)
+        registry.observe(REQUEST_DURATION, (*view_labels, ('method', request.method)), duration)
+        registry.inc(REQUESTS_TOTAL, (*view_labels, ('method', request.method), ('status', str(response.status_code))))
+        registry.observe(DB_QUERIES, view_labels, stats.queries, QUERY_COUNT_BUCKETS)
+        registry.observe(DB_DURATION, view_labels, stats.db_seconds)
+        registry.observe(SERIALIZER_DURATION, view_labels, stats.serializer_seconds)
+
+        if duration >= settings.METRICS_SLOW_REQUEST_SECONDS or stats.queries >= settings.METRICS_SLOW_REQUEST_QUERIES:
+            registry.inc(SLOW_REQUESTS_TOTAL, view_labels)
+            logger.warning(
+                'Slow request %s %s (%s): %.3fs, %d queries in %.3fs, serializer %.3fs; slowest query %.3fs: %s',
+                request.method, request.get_full_path(), view, duration, stats.queries, stats.db_seconds,
+                stats.serializer_seconds, stats.slowest_seconds, stats.slowest_sql,
+            )
+        registry.flush()
@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from typing import Any
 
 from envparse import env
@@ -41,11 +42,14 @@ if DEBUG:
     INSTALLED_APPS += ['django_extensions', ]
 
 MIDDLEWARE = [
+    'todolist.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'todolist.db.ReplicaMiddleware',
+    'todolist.db.StatementTimeoutMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'social_django.middleware.SocialAuthExceptionMiddleware',
@@ -82,6 +86,22 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения: DB_REPLICA_HOSTS=replica-1,replica-2. В тестах они смотрят в основную базу
+DATABASE_REPLICAS: list[str] = []
+for number, host in enumerate(env.list('DB_REPLICA_HOSTS', default=[]), start=1):
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{number}')
+DATABASE_ROUTERS = ['todolist.db.ReplicaRouter']
+# Сколько секунд после изменяющего запроса пользователь читает из основной базы, а не с реплик
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+# Ограничение времени SQL-запроса в миллисекундах (только Postgres, 0 - без ограничения):
+# для view по имени маршрута, для остальных view и для бота
+DB_STATEMENT_TIMEOUTS = {
+    'list-goals': env.int('DB_STATEMENT_TIMEOUT_LIST_GOALS', default=3000),
+}
+DB_STATEMENT_TIMEOUT = env.int('DB_STATEMENT_TIMEOUT', default=10000)
+BOT_STATEMENT_TIMEOUT = env.int('BOT_STATEMENT_TIMEOUT', default=5000)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -97,6 +117,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Первый хэшер используется для новых паролей, остальные - для проверки старых хэшей
+PASSWORD_HASHERS = [
+    'todolist.core.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Число итераций PBKDF2 (0 - значение Django). Хэши с другим числом итераций пересчитываются при входе
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', default=0)
+# Размер пула потоков для хэширования паролей в каждом процессе (0 - хэширование в потоке запроса)
+PASSWORD_HASHING_THREADS = env.int('PASSWORD_HASHING_THREADS', default=2)
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -132,8 +165,94 @@ SOCIAL_AUTH_NEW_USER_REDIRECT_URL = '/logged-in/'
 SOCIAL_AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'todolist.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
+    # Лимиты попыток входа и смены пароля, проверяются до хэширования пароля. Счетчики лежат в кэше:
+    # без REDIS_URL (locmem) лимит действует на каждый процесс gunicorn отдельно
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': env.str('THROTTLE_LOGIN_IP', default='30/min'),
+        'login_username': env.str('THROTTLE_LOGIN_USERNAME', default='10/min'),
+        'password_change_ip': env.str('THROTTLE_PASSWORD_CHANGE_IP', default='30/min'),
+        'password_change_user': env.str('THROTTLE_PASSWORD_CHANGE_USER', default='5/min'),
+    },
+    # Перед приложением стоит nginx: IP клиента берется из X-Forwarded-For
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=1),
 }
+# MessagePack для клиентов с Accept/Content-Type: application/msgpack, если установлен пакет msgpack
+if find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] += ('todolist.renderers.MessagePackRenderer',)
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'todolist.parsers.MessagePackParser',
+    )
 BOT_TOKEN = env.str('BOT_TOKEN')
+
+if REDIS_URL := env.str('REDIS_URL', default=''):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# С общим кэшем (REDIS_URL) сессии читаются из кэша, а пишутся и в кэш, и в базу: при промахе
+# кэша (перезапуск Redis) сессия читается из базы. В locmem другие процессы не видят ни изменений,
+# ни выхода из сессии, поэтому без Redis сессии хранятся только в базе.
+# Истекшие сессии удаляет clear_expired_sessions
+SESSION_ENGINE = env.str(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.cached_db' if REDIS_URL else 'django.contrib.sessions.backends.db',
+)
+
+# Время жизни кэша списков досок, категорий и целей в секундах (0 - кэш выключен)
+GOALS_LIST_CACHE_TIMEOUT = env.int('GOALS_LIST_CACHE_TIMEOUT', default=0)
+# Сколько секунд одинаковые одновременные запросы списков ждут общего результата вместо
+# собственного запроса к базе (0 - не объединять). Работает при включенном кэше списков
+GOALS_SINGLE_FLIGHT_WAIT_SECONDS = env.float('GOALS_SINGLE_FLIGHT_WAIT_SECONDS', default=5.0)
+
+# Максимальное число подзапросов в одном запросе /batch
+BATCH_MAX_REQUESTS = env.int('BATCH_MAX_REQUESTS', default=20)
+
+# Время жизни кэша счетчиков просроченных и срочных целей пользователя в секундах (0 - без кэша)
+GOALS_BUCKET_COUNTS_TIMEOUT = env.int('GOALS_BUCKET_COUNTS_TIMEOUT', default=0)
+
+# Быстрая read-only сериализация списков целей, категорий и комментариев из .values()
+GOALS_FAST_SERIALIZATION = env.bool('GOALS_FAST_SERIALIZATION', default=False)
+
+# Партиционирование goals_goal по статусу и goals_goalcomment по месяцам (только Postgres)
+GOALS_PARTITIONING = env.bool('GOALS_PARTITIONING', default=False)
+
+# Через сколько дней архивные цели и удаленные доски переносятся в холодное хранилище
+GOALS_ARCHIVE_RETENTION_DAYS = env.int('GOALS_ARCHIVE_RETENTION_DAYS', default=90)
+
+# Длина ключа ручного порядка целей, после которой rebalance_goal_ranks перераздает ключи категории
+GOALS_RANK_MAX_LENGTH = env.int('GOALS_RANK_MAX_LENGTH', default=12)
+
+# Брокер событий досок для SSE-канала /goals/board/<id>/events. Канал обслуживает ASGI-сервис events
+# (todolist.asgi), а события публикуют процессы API и бот: без Redis они не дойдут до подписчиков
+GOALS_EVENTS_BROKER = env.str(
+    'GOALS_EVENTS_BROKER',
+    default='todolist.goals.events.RedisBroker' if REDIS_URL else 'todolist.goals.events.MemoryBroker',
+)
+
+# Метрики запросов для Prometheus (/metrics) и лог медленных запросов
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+METRICS_SLOW_REQUEST_SECONDS = env.float('METRICS_SLOW_REQUEST_SECONDS', default=1.0)
+METRICS_SLOW_REQUEST_QUERIES = env.int('METRICS_SLOW_REQUEST_QUERIES', default=50)
+# Каталог для снимков метрик процессов gunicorn; очищается при старте контейнера
+METRICS_DIR = env.str('METRICS_DIR', default='')
+METRICS_FLUSH_SECONDS = env.float('METRICS_FLUSH_SECONDS', default=10.0)
@@ -1,17 +1,29 @@
 from django.conf import settings
 from django.contrib import admin
+from django.http import HttpResponse, HttpResponseForbidden
 from django.urls import path, include
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from todolist.batch import BatchView
+from todolist.metrics import collect, is_metrics_request_allowed, render
+
 
 @api_view(['GET'])
 def health_check(request):
     return Response({'status': 'OK'})
 
 
+def metrics(request):
+    if not is_metrics_request_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
+    path('batch', BatchView.as_view(), name='batch'),
     path('core/', include('todolist.core.urls')),
     path('goals/', include('todolist.goals.urls')),
     path('bot/', include('todolist.bot.urls')),